@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
 import traceback
 from typing import TYPE_CHECKING
@@ -22,6 +23,11 @@ from reconcile.change_owners.changes import (
     fetch_bundle_changes,
     get_priority_for_changes,
 )
+from reconcile.change_owners.context_cache import (
+    ContextResolver,
+    bundle_changes_digest,
+    change_types_version,
+)
 from reconcile.change_owners.decision import (
     ChangeDecision,
     ChangeResponsibles,
@@ -49,10 +55,15 @@ from reconcile.utils.mr.labels import (
 )
 from reconcile.utils.output import format_table
 from reconcile.utils.semver_helper import make_semver
+from reconcile.utils.state import init_state
 
 if TYPE_CHECKING:
     from gitlab.v4.objects import ProjectMergeRequest
 
+    from reconcile.gql_definitions.change_owners.queries.change_types import (
+        ChangeTypeV1,
+    )
+
 QONTRACT_INTEGRATION = "change-owners"
 QONTRACT_INTEGRATION_VERSION = make_semver(0, 1, 0)
 
@@ -65,11 +76,13 @@ def cover_changes(
     changes: list[BundleFileChange],
     change_type_processors: list[ChangeTypeProcessor],
     comparision_gql_api: gql.GqlApi,
+    context_resolver: ContextResolver | None = None,
 ) -> None:
     """
     Coordinating function that can reach out to different `cover_*` functions
     leveraging different approver contexts.
     """
+    context_resolver = context_resolver or ContextResolver(change_type_processors)
 
     # self service roles coverage
     roles = fetch_self_service_roles(comparision_gql_api)
@@ -77,6 +90,7 @@ def cover_changes(
         bundle_changes=changes,
         change_type_processors=change_type_processors,
         roles=roles,
+        context_resolver=context_resolver,
     )
 
     # implicit ownership coverage
@@ -86,18 +100,60 @@ def cover_changes(
             ct for ct in change_type_processors if ct.implicit_ownership
         ],
         approver_resolver=GqlApproverResolver([comparision_gql_api, gql.get_api()]),
+        context_resolver=context_resolver,
     )
 
 
+def fetch_change_types(gql_api: gql.GqlApi) -> list[ChangeTypeV1]:
+    return change_types.query(gql_api.query).change_types or []
+
+
 def fetch_change_type_processors(
-    gql_api: gql.GqlApi, file_diff_resolver: FileDiffResolver
+    gql_api: gql.GqlApi,
+    file_diff_resolver: FileDiffResolver,
+    change_type_list: list[ChangeTypeV1] | None = None,
 ) -> list[ChangeTypeProcessor]:
-    change_type_list = change_types.query(gql_api.query).change_types or []
+    if change_type_list is None:
+        change_type_list = fetch_change_types(gql_api)
     return list(
         init_change_type_processors(change_type_list, file_diff_resolver).values()
     )
 
 
+def context_cache_enabled() -> bool:
+    return os.environ.get("CHANGE_OWNERS_CONTEXT_CACHE", "").lower() in {
+        "true",
+        "yes",
+    }
+
+
+def init_context_resolver(
+    change_type_processors: list[ChangeTypeProcessor],
+    change_type_list: list[ChangeTypeV1],
+    changes: list[BundleFileChange],
+    comparison_sha: str,
+) -> ContextResolver:
+    """
+    Build a ContextResolver that caches resolved contexts in the integration
+    state, if CHANGE_OWNERS_CONTEXT_CACHE is enabled.
+    """
+    if not context_cache_enabled():
+        return ContextResolver(change_type_processors)
+    try:
+        state = init_state(integration=QONTRACT_INTEGRATION)
+    except Exception as e:
+        logging.warning(f"change-type context cache is not available: {e}")
+        return ContextResolver(change_type_processors)
+    context_resolver = ContextResolver(
+        change_type_processors,
+        state=state,
+        change_types_version=change_types_version(change_type_list),
+        bundle_digest=bundle_changes_digest(comparison_sha, changes),
+    )
+    context_resolver.preload(changes)
+    return context_resolver
+
+
 CHANGE_TYPE_PROCESSING_MODE_LIMITED = "limited"
 CHANGE_TYPE_PROCESSING_MODE_AUTHORITATIVE = "authoritative"
 
@@ -411,8 +467,9 @@ def run(
         f"(sha={comparison_sha}, commit_id={comparison_gql_api.commit}, "
         f"build_time {comparison_gql_api.commit_timestamp_utc})"
     )
+    change_type_list = fetch_change_types(comparison_gql_api)
     change_type_processors = fetch_change_type_processors(
-        comparison_gql_api, file_diff_resolver
+        comparison_gql_api, file_diff_resolver, change_type_list
     )
 
     # an error while trying to cover changes will not fail the integration
@@ -427,11 +484,17 @@ def run(
             f"with {sum(c.raw_diff_count() for c in changes)} differences "
             f"and {len([c for c in changes if c.metadata_only_change])} metadata-only changes"
         )
+        context_resolver = init_context_resolver(
+            change_type_processors, change_type_list, changes, comparison_sha
+        )
         cover_changes(
             changes,
             change_type_processors,
             comparison_gql_api,
+            context_resolver,
         )
+        context_resolver.persist()
+        context_resolver.log_summary()
         self_serviceable = (
             len(changes) > 0
             and all(c.all_changes_covered() for c in changes)
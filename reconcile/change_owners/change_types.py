@@ -44,6 +44,7 @@ from reconcile.gql_definitions.change_owners.queries.change_types import (
     ChangeTypeV1,
 )
 from reconcile.utils.jsonpath import (
+    jsonpath_key,
     parse_jsonpath,
     remove_prefix_from_path,
     sortable_jsonpath_string_repr,
@@ -152,13 +153,13 @@ class DiffCoverage:
         return uncovered_data == {}
 
     def changed_path_covered_by_path(self, path: jsonpath_ng.JSONPath) -> bool:
-        return str(self.diff.path).startswith(str(path)) or path == jsonpath_ng.Root()
+        path_key = jsonpath_key(path)
+        return jsonpath_key(self.diff.path)[: len(path_key)] == path_key
 
     def path_under_changed_path(self, path: jsonpath_ng.JSONPath) -> bool:
-        return (
-            str(path).startswith(str(self.diff.path))
-            or str(self.diff.path) == JSON_PATH_ROOT
-        ) and str(path) != str(self.diff.path)
+        path_key = jsonpath_key(path)
+        diff_key = jsonpath_key(self.diff.path)
+        return len(path_key) > len(diff_key) and path_key[: len(diff_key)] == diff_key
 
     def split(
         self, path: jsonpath_ng.JSONPath, ctx: ChangeTypeContext
@@ -184,7 +185,7 @@ class DiffCoverage:
             # consolidate existing splits. maybe they should go under the newly created one?
             consolidated_splits = [split_sub_coverage]
             for s in self._split_into:
-                if split_sub_coverage.path_under_changed_path(s.diff.path_str()):
+                if split_sub_coverage.path_under_changed_path(s.diff.path):
                     s.parent = split_sub_coverage
                     split_sub_coverage._split_into.append(s)
                 else:
@@ -500,6 +501,10 @@ class ChangeTypeProcessor:
     def change_detectors(self) -> Sequence[ChangeDetector]:
         return self._change_detectors
 
+    @property
+    def context_expansions(self) -> Sequence[ContextExpansion]:
+        return self._context_expansions
+
     def find_context_file_refs(
         self,
         change: FileChange,
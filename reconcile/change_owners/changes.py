@@ -30,7 +30,10 @@ from reconcile.change_owners.diff import (
     extract_diffs,
 )
 from reconcile.utils import gql
-from reconcile.utils.jsonpath import parse_jsonpath
+from reconcile.utils.jsonpath import (
+    JSONPathTrie,
+    parse_jsonpath,
+)
 
 METADATA_CHANGE_PATH = "_metadata_"
 """
@@ -56,6 +59,9 @@ class BundleFileChange:
     new_backrefs: set[FileRef] = field(default_factory=set)
     metadata_only_change: bool = False
     _diff_coverage: dict[str, DiffCoverage] = field(init=False, default_factory=dict)
+    _diff_indexes: dict[
+        tuple[DiffType, ...], JSONPathTrie[tuple[int, DiffCoverage]]
+    ] = field(init=False, default_factory=dict, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         self._diff_coverage = {d.path_str(): DiffCoverage(d, []) for d in self.diffs}
@@ -127,7 +133,7 @@ class BundleFileChange:
         # observe the new state for added fields or list items or entire object sutrees
         covered_diffs.update(
             self._cover_changes_for_diffs(
-                self._filter_diffs([DiffType.ADDED, DiffType.CHANGED]),
+                self._diff_index((DiffType.ADDED, DiffType.CHANGED)),
                 self.new,
                 change_type_context,
             )
@@ -135,30 +141,49 @@ class BundleFileChange:
         # look at the old state for removed fields or list items or object subtrees
         covered_diffs.update(
             self._cover_changes_for_diffs(
-                self._filter_diffs([DiffType.REMOVED]), self.old, change_type_context
+                self._diff_index((DiffType.REMOVED,)), self.old, change_type_context
             )
         )
 
         return covered_diffs
 
+    def _diff_index(
+        self, diff_types: tuple[DiffType, ...]
+    ) -> JSONPathTrie[tuple[int, DiffCoverage]]:
+        """
+        The diffs of the given types indexed by their path, along with their
+        position, so allowed paths can be matched against all diffs at once.
+        """
+        if diff_types not in self._diff_indexes:
+            index: JSONPathTrie[tuple[int, DiffCoverage]] = JSONPathTrie()
+            for position, dc in enumerate(self._filter_diffs(list(diff_types))):
+                index.add(dc.diff.path, (position, dc))
+            self._diff_indexes[diff_types] = index
+        return self._diff_indexes[diff_types]
+
     def _cover_changes_for_diffs(
         self,
-        diffs: list[DiffCoverage],
+        diff_index: JSONPathTrie[tuple[int, DiffCoverage]],
         file_content: Any,
         change_type_context: ChangeTypeContext,
     ) -> dict[str, Diff]:
         covered_diffs = {}
-        if diffs:
+        if diff_index:
             for (
                 allowed_path
             ) in change_type_context.change_type_processor.allowed_changed_paths(
                 self.fileref, file_content, change_type_context
             ):
-                for dc in diffs:
-                    if dc.changed_path_covered_by_path(allowed_path):
+                # diffs at or under the allowed path are covered, diffs above
+                # it are covered partially. both are processed in diff order
+                covered = dict(diff_index.at_or_under(allowed_path))
+                partially_covered = dict(diff_index.above(allowed_path))
+                for position in sorted(covered.keys() | partially_covered.keys()):
+                    if dc := covered.get(position):
                         covered_diffs[dc.diff.path_str()] = dc.diff
                         dc.coverage.append(change_type_context)
-                    elif dc.path_under_changed_path(allowed_path):
+                    else:
+                        dc = partially_covered[position]
                         # the self-service path allowed by the change-type is covering
                         # only parts of the diff. we will split the diff into a
                         # smaller part, that can be covered by the change-type.
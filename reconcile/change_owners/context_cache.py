@@ -0,0 +1,300 @@
+"""
+Caching and timing of change-type context resolution.
+
+Finding the contexts of a changed file, i.e. the files that own a change and
+the files that hold the approvers, has to be done for every changed file and
+every change-type and is the expensive part of a change-owners run. The
+results are stored in the integration state, keyed by the changed file, its
+old and new content sha and a version of the change-type definitions. Re-runs
+for the same MR (e.g. after a rebase or an unrelated push) only resolve the
+contexts of files whose content changed.
+
+Change-types that look at other files to resolve contexts (context expansion
+and backrefs) depend on more than the changed file. Their results are reused
+only if the comparison bundle and all changed files of the MR are the same as
+in the run that stored them.
+
+Roles and approvers are not cached, they are always taken from the
+comparison bundle of the current run.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import operator
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from sretoolbox.utils import threaded
+
+from reconcile.change_owners.bundle import (
+    BundleFileType,
+    FileRef,
+)
+from reconcile.change_owners.change_types import (
+    ChangeTypeProcessor,
+    FileChange,
+    ForwardrefOwnershipContext,
+    ResolvedContext,
+)
+from reconcile.status import RunningState
+from reconcile.utils.json import json_dumps
+from reconcile.utils.metrics import change_owners_change_type_duration
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+    from reconcile.change_owners.changes import BundleFileChange
+    from reconcile.gql_definitions.change_owners.queries.change_types import (
+        ChangeTypeV1,
+    )
+    from reconcile.utils.state import State
+
+CONTEXT_CACHE_PREFIX = "context-resolution"
+CONTEXT_CACHE_THREAD_POOL_SIZE = 10
+
+
+def change_types_version(change_types: Iterable[ChangeTypeV1]) -> str:
+    """
+    A digest of the change-type definitions. Cached contexts are invalidated
+    whenever a change-type is added, removed or changed.
+    """
+    data = sorted(
+        (ct.model_dump(mode="json", by_alias=True) for ct in change_types),
+        key=operator.itemgetter("name"),
+    )
+    return hashlib.sha256(json_dumps(data).encode("utf-8")).hexdigest()
+
+
+def bundle_changes_digest(
+    comparison_sha: str, bundle_changes: Iterable[BundleFileChange]
+) -> str:
+    """
+    A digest of the comparison bundle and all changed files of an MR.
+    """
+    data = sorted(
+        (
+            bc.fileref.file_type.value,
+            bc.fileref.path,
+            bc.old_content_sha,
+            bc.new_content_sha,
+        )
+        for bc in bundle_changes
+    )
+    return hashlib.sha256(
+        json_dumps([comparison_sha, data]).encode("utf-8")
+    ).hexdigest()
+
+
+def is_file_local(ctp: ChangeTypeProcessor) -> bool:
+    """
+    True if the contexts found by the change-type only depend on the content
+    of the changed file.
+    """
+    return not ctp.context_expansions and all(
+        d.context is None or isinstance(d.context, ForwardrefOwnershipContext)
+        for d in ctp.change_detectors
+    )
+
+
+def _file_ref_to_dict(ref: FileRef) -> dict[str, Any]:
+    return {
+        "file_type": ref.file_type.value,
+        "path": ref.path,
+        "schema": ref.schema,
+        "json_path": ref.json_path,
+    }
+
+
+def _file_ref_from_dict(data: dict[str, Any]) -> FileRef:
+    return FileRef(
+        file_type=BundleFileType(data["file_type"]),
+        path=data["path"],
+        schema=data["schema"],
+        json_path=data["json_path"],
+    )
+
+
+class ContextResolver:
+    """
+    Resolves the contexts of changed files for change-types, records how long
+    every change-type takes and optionally caches the results in a State.
+    """
+
+    def __init__(
+        self,
+        change_type_processors: Iterable[ChangeTypeProcessor],
+        state: State | None = None,
+        change_types_version: str = "",
+        bundle_digest: str = "",
+    ) -> None:
+        self._processors = {ctp.name: ctp for ctp in change_type_processors}
+        self._state = state
+        self._change_types_version = change_types_version
+        self._bundle_digest = bundle_digest
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty: set[str] = set()
+        self.durations: dict[str, float] = defaultdict(float)
+        self.hits = 0
+        self.misses = 0
+
+    @contextlib.contextmanager
+    def timed(self, change_type: str, phase: str) -> Generator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.durations[change_type] += elapsed
+            change_owners_change_type_duration.labels(
+                integration=RunningState().integration,
+                change_type=change_type,
+                phase=phase,
+            ).observe(elapsed)
+
+    def _key(self, bc: BundleFileChange) -> str | None:
+        # changes synthesized from backrefs carry no content shas and
+        # can't be identified across runs
+        if self._state is None or not (bc.old_content_sha or bc.new_content_sha):
+            return None
+        digest = hashlib.sha256(
+            json_dumps([
+                bc.fileref.file_type.value,
+                bc.fileref.path,
+                bc.old_content_sha,
+                bc.new_content_sha,
+                self._change_types_version,
+            ]).encode("utf-8")
+        ).hexdigest()
+        return f"{CONTEXT_CACHE_PREFIX}/{digest}"
+
+    def preload(self, bundle_changes: Iterable[BundleFileChange]) -> None:
+        """
+        Fetch the cached contexts of all bundle changes at once.
+        """
+        if self._state is None:
+            return
+        keys = {key for bc in bundle_changes if (key := self._key(bc))}
+        try:
+            self._entries.update(
+                self._state.get_many(keys, CONTEXT_CACHE_THREAD_POOL_SIZE)
+            )
+        except Exception as e:
+            # the cache is best effort, resolve everything
+            logging.debug(f"unable to load cached change-type contexts: {e}")
+
+    def _cached_contexts(
+        self, entry: dict[str, Any], scope: str, name: str
+    ) -> list[ResolvedContext] | None:
+        if scope == "local":
+            cached = entry.get("local", {}).get(name)
+        elif entry.get("bundle", {}).get("digest") == self._bundle_digest:
+            cached = entry["bundle"]["contexts"].get(name)
+        else:
+            cached = None
+        if cached is None:
+            return None
+        contexts = []
+        for c in cached:
+            if (change_type := self._processors.get(c["change_type"])) is None:
+                return None
+            contexts.append(
+                ResolvedContext(
+                    owned_file_ref=_file_ref_from_dict(c["owned_file_ref"]),
+                    context_file_ref=_file_ref_from_dict(c["context_file_ref"]),
+                    change_type=change_type,
+                )
+            )
+        return contexts
+
+    def _store_contexts(
+        self,
+        entry: dict[str, Any],
+        scope: str,
+        name: str,
+        contexts: list[ResolvedContext],
+    ) -> None:
+        data = [
+            {
+                "owned_file_ref": _file_ref_to_dict(c.owned_file_ref),
+                "context_file_ref": _file_ref_to_dict(c.context_file_ref),
+                "change_type": c.change_type.name,
+            }
+            for c in contexts
+        ]
+        if scope == "local":
+            entry.setdefault("local", {})[name] = data
+            return
+        if entry.get("bundle", {}).get("digest") != self._bundle_digest:
+            entry["bundle"] = {"digest": self._bundle_digest, "contexts": {}}
+        entry["bundle"]["contexts"][name] = data
+
+    def find_context_file_refs(
+        self,
+        bc: BundleFileChange,
+        ctp: ChangeTypeProcessor,
+        with_backrefs: bool = True,
+    ) -> list[ResolvedContext]:
+        """
+        Cached and timed version of `ChangeTypeProcessor.find_context_file_refs`
+        for a bundle change.
+        """
+        local = is_file_local(ctp)
+        scope = "local" if local else "bundle"
+        # backrefs are irrelevant for file local change-types
+        name = ctp.name if local or with_backrefs else f"{ctp.name}/no-backrefs"
+        key = self._key(bc)
+        if key:
+            entry = self._entries.setdefault(key, {})
+            if (contexts := self._cached_contexts(entry, scope, name)) is not None:
+                self.hits += 1
+                return contexts
+            self.misses += 1
+
+        with self.timed(ctp.name, "context"):
+            contexts = ctp.find_context_file_refs(
+                change=FileChange(
+                    file_ref=bc.fileref,
+                    old=bc.old,
+                    new=bc.new,
+                    old_backrefs=bc.old_backrefs if with_backrefs else set(),
+                    new_backrefs=bc.new_backrefs if with_backrefs else set(),
+                ),
+                expansion_trail=set(),
+            )
+
+        if key:
+            self._store_contexts(entry, scope, name, contexts)
+            self._dirty.add(key)
+        return contexts
+
+    def persist(self) -> None:
+        """
+        Write the contexts resolved during this run to the state.
+        """
+        if self._state is None or not self._dirty:
+            return
+        state = self._state
+
+        def _persist(key: str) -> None:
+            try:
+                state.add(key, self._entries[key], force=True)
+            except Exception as e:
+                logging.debug(f"unable to cache change-type contexts {key}: {e}")
+
+        threaded.run(_persist, sorted(self._dirty), CONTEXT_CACHE_THREAD_POOL_SIZE)
+        self._dirty.clear()
+
+    def log_summary(self, top: int = 5) -> None:
+        if self._state is not None:
+            logging.info(
+                f"change-type context cache: {self.hits} hits, {self.misses} misses"
+            )
+        slowest = sorted(
+            self.durations.items(), key=operator.itemgetter(1), reverse=True
+        )
+        for name, seconds in slowest[:top]:
+            logging.info(f"change-type {name} took {seconds:.2f}s")
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import copy
+import hashlib
+import operator
 from dataclasses import dataclass
 from enum import Enum
 from functools import reduce
@@ -88,7 +90,7 @@ IDENTIFIER_FIELD_NAME = "__identifier"
 REF_FIELD_NAME = "$ref"
 
 
-def _extract_identifier_from_object(obj: Any) -> str | None:
+def extract_identifier_from_object(obj: Any) -> str | None:
     if isinstance(obj, dict):
         if IDENTIFIER_FIELD_NAME in obj:
             return obj.get(IDENTIFIER_FIELD_NAME)
@@ -122,8 +124,8 @@ def compare_object_ctx_identifier(
     of matching properties and values. this situation is signaled back to
     deepdiff by raising the CannotCompare exception.
     """
-    x_id = _extract_identifier_from_object(x)
-    y_id = _extract_identifier_from_object(y)
+    x_id = extract_identifier_from_object(x)
+    y_id = extract_identifier_from_object(y)
     if x_id and y_id:
         # if both have an identifier, they are the same if the identifiers are the same
         return x_id == y_id
@@ -135,7 +137,342 @@ def compare_object_ctx_identifier(
     raise CannotCompare() from None
 
 
+LIST_ITEM_MATCH_KEYS = ("name", "path")
+"""
+Fields that identify list items without an identifier, if their value is
+unique among the changed items of a list.
+"""
+
+LIST_ITEM_SIMILARITY_THRESHOLD = 0.5
+"""
+The minimum share of equal fields (or items) two containers in a list must
+have to be considered the same item with changes.
+"""
+
+
+STRUCTURAL_HASH_SIZE = 16
+
+
+def _digest(*parts: bytes) -> bytes:
+    return hashlib.blake2b(b"".join(parts), digest_size=STRUCTURAL_HASH_SIZE).digest()
+
+
+class StructuralHasher:
+    """
+    Computes order insensitive hashes of JSON like data. Two values have the
+    same hash if they are equal, ignoring the order of list items, which
+    matches the semantics used to detect diffs in files and desired states.
+
+    The hashes are cryptographic digests, equal hashes are treated as equal
+    values without comparing the values themselves.
+
+    The hashes of dicts and lists are memoized by object identity, so hashing a
+    state once makes the hashes of all its subtrees available for free. The
+    hashed data must not be modified while the hasher is in use.
+    """
+
+    def __init__(self) -> None:
+        # the hashed values are kept alive so their ids can't be reused
+        self._memo: dict[int, tuple[Any, bytes]] = {}
+        # keys and many values repeat across the items of a state
+        self._strings: dict[str, bytes] = {}
+
+    def hash(self, value: Any) -> bytes:
+        # exact type checks, this is called for every node of both states
+        value_type = type(value)
+        if value_type is str:
+            if (digest := self._strings.get(value)) is None:
+                digest = self._strings[value] = _digest(
+                    b"s", value.encode("utf-8", "surrogatepass")
+                )
+            return digest
+        if value_type is dict or value_type is list:
+            if (memo := self._memo.get(id(value))) is None:
+                memo = self._memo[id(value)] = (value, self._container_hash(value))
+            return memo[1]
+        if isinstance(value, dict | list | tuple | set | frozenset):
+            return self._container_hash(value)
+        return _digest(value_type.__name__.encode(), b":", repr(value).encode("utf-8"))
+
+    def _container_hash(self, value: Any) -> bytes:
+        if isinstance(value, dict):
+            return _digest(
+                b"d",
+                *sorted(self.hash(k) + self.hash(v) for k, v in value.items()),
+            )
+        return _digest(b"l", *sorted(self.hash(i) for i in value))
+
+
+def _path_child(
+    path: jsonpath_ng.JSONPath | None, key: str | int
+) -> jsonpath_ng.JSONPath:
+    part = jsonpath_ng.Index(key) if isinstance(key, int) else jsonpath_ng.Fields(key)
+    return part if path is None else path.child(part)
+
+
+class _StructuralDiffer:
+    """
+    Detects the differences between two versions of a file and reports them
+    as `Diff` objects with jsonpath paths.
+
+    The order of list items is ignored. Changed list items are matched up
+    to report changes within them:
+
+    - items with an identifier (see `extract_identifier_from_object`) are
+      only matched by it
+    - items without an identifier are matched by one of the
+      `LIST_ITEM_MATCH_KEYS` or by similarity
+    - remaining items at the same position are reported as changed, all
+      others as added or removed
+
+    Changes within matched items are reported with the index of the item in
+    the old version of the list.
+
+    Scalar items are never matched by their value. This differs from
+    `extract_diffs_with_deepdiff`, where DeepDiff pairs numbers that are
+    close to each other: for `[1, 2, 3]` -> `[3, 2, 4]` DeepDiff reports
+    `[0]` as changed, while this reports `[0]` as removed and `[2]` as added.
+    """
+
+    def __init__(self) -> None:
+        self.hasher = StructuralHasher()
+        self.changed: list[Diff] = []
+        self.fields_added: list[Diff] = []
+        self.fields_removed: list[Diff] = []
+        self.items_added: list[Diff] = []
+        self.items_removed: list[Diff] = []
+
+    def diffs(self) -> list[Diff]:
+        return (
+            self.changed
+            + self.fields_added
+            + self.fields_removed
+            + self.items_added
+            + self.items_removed
+        )
+
+    def diff(self, old: Any, new: Any, path: jsonpath_ng.JSONPath | None) -> None:
+        if self.hasher.hash(old) == self.hasher.hash(new):
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            self._diff_dicts(old, new, path)
+        elif isinstance(old, list) and isinstance(new, list):
+            self._diff_lists(old, new, path)
+        else:
+            self.changed.append(
+                Diff(
+                    path=path or jsonpath_ng.Root(),
+                    diff_type=DiffType.CHANGED,
+                    old=old,
+                    new=new,
+                )
+            )
+
+    def _diff_dicts(
+        self,
+        old: dict[Any, Any],
+        new: dict[Any, Any],
+        path: jsonpath_ng.JSONPath | None,
+    ) -> None:
+        for key, old_value in old.items():
+            key_path = _path_child(path, key if isinstance(key, str) else str(key))
+            if key in new:
+                self.diff(old_value, new[key], key_path)
+            else:
+                self.fields_removed.append(
+                    Diff(
+                        path=key_path,
+                        diff_type=DiffType.REMOVED,
+                        old=old_value,
+                        new=None,
+                    )
+                )
+        for key, new_value in new.items():
+            if key not in old:
+                self.fields_added.append(
+                    Diff(
+                        path=_path_child(
+                            path, key if isinstance(key, str) else str(key)
+                        ),
+                        diff_type=DiffType.ADDED,
+                        old=None,
+                        new=new_value,
+                    )
+                )
+
+    def _changed_items(self, items: list[Any], other: list[Any]) -> dict[int, Any]:
+        """
+        The items (by index) that don't exist in the other list. Repetitions
+        of an item are ignored.
+        """
+        other_hashes = {self.hasher.hash(i) for i in other}
+        seen: set[bytes] = set()
+        changed = {}
+        for index, item in enumerate(items):
+            item_hash = self.hasher.hash(item)
+            if item_hash not in other_hashes and item_hash not in seen:
+                changed[index] = item
+            seen.add(item_hash)
+        return changed
+
+    def _similarity(self, old: Any, new: Any) -> float:
+        if isinstance(old, dict) and isinstance(new, dict):
+            # equal values count fully, changed values of common keys half
+            keys = old.keys() | new.keys()
+            score = sum(
+                1.0 if self.hasher.hash(old[k]) == self.hasher.hash(new[k]) else 0.5
+                for k in old.keys() & new.keys()
+            )
+            return score / len(keys) if keys else 1.0
+        if isinstance(old, list) and isinstance(new, list):
+            old_hashes = {self.hasher.hash(i) for i in old}
+            new_hashes = {self.hasher.hash(i) for i in new}
+            union = old_hashes | new_hashes
+            return len(old_hashes & new_hashes) / len(union) if union else 1.0
+        return 0.0
+
+    def _diff_lists(
+        self,
+        old: list[Any],
+        new: list[Any],
+        path: jsonpath_ng.JSONPath | None,
+    ) -> None:
+        removed = self._changed_items(old, new)
+        added = self._changed_items(new, old)
+        # (old index, new index) of the items that are the same but changed
+        pairs: list[tuple[int, int]] = []
+
+        def pair(old_index: int, new_index: int) -> None:
+            pairs.append((old_index, new_index))
+            del removed[old_index]
+            del added[new_index]
+
+        # items with an identifier
+        added_by_id = {
+            identifier: index
+            for index, item in added.items()
+            if (identifier := extract_identifier_from_object(item)) is not None
+        }
+        removed_ids = {
+            index: identifier
+            for index, item in removed.items()
+            if (identifier := extract_identifier_from_object(item)) is not None
+        }
+        for old_index, identifier in removed_ids.items():
+            if (new_index := added_by_id.get(identifier)) is not None:
+                pair(old_index, new_index)
+
+        # items without an identifier are matched by a unique field value
+        def unidentified(items: dict[int, Any]) -> dict[int, dict[Any, Any]]:
+            return {
+                index: item
+                for index, item in items.items()
+                if isinstance(item, dict)
+                and extract_identifier_from_object(item) is None
+            }
+
+        for key in LIST_ITEM_MATCH_KEYS:
+            candidates: dict[tuple[bool, bytes], list[int]] = {}
+            for is_new, items in ((False, removed), (True, added)):
+                for index, item in unidentified(items).items():
+                    value = item.get(key)
+                    if isinstance(value, str):
+                        candidates.setdefault(
+                            (is_new, self.hasher.hash(value)), []
+                        ).append(index)
+            for (is_new, value_hash), old_indices in candidates.items():
+                new_indices = candidates.get((True, value_hash), [])
+                if not is_new and len(old_indices) == 1 and len(new_indices) == 1:
+                    pair(old_indices[0], new_indices[0])
+
+        # remaining containers without an identifier are matched by similarity
+        for old_index, old_item in list(removed.items()):
+            if extract_identifier_from_object(old_item) is not None:
+                continue
+            best, best_similarity = None, LIST_ITEM_SIMILARITY_THRESHOLD
+            for new_index, new_item in added.items():
+                if extract_identifier_from_object(new_item) is not None:
+                    continue
+                similarity = self._similarity(old_item, new_item)
+                if similarity >= best_similarity and (
+                    best is None or similarity > best_similarity
+                ):
+                    best, best_similarity = new_index, similarity
+            if best is not None:
+                pair(old_index, best)
+
+        for old_index, new_index in sorted(pairs, key=operator.itemgetter(1)):
+            self.diff(old[old_index], new[new_index], _path_child(path, old_index))
+
+        # items replaced in place
+        for index in sorted(removed.keys() & added.keys()):
+            self.changed.append(
+                Diff(
+                    path=_path_child(path, index),
+                    diff_type=DiffType.CHANGED,
+                    old=removed.pop(index),
+                    new=added.pop(index),
+                )
+            )
+
+        self.items_added.extend(
+            Diff(
+                path=_path_child(path, index),
+                diff_type=DiffType.ADDED,
+                old=None,
+                new=item,
+            )
+            for index, item in added.items()
+        )
+        self.items_removed.extend(
+            Diff(
+                path=_path_child(path, index),
+                diff_type=DiffType.REMOVED,
+                old=item,
+                new=None,
+            )
+            for index, item in removed.items()
+        )
+
+
 def extract_diffs(old_file_content: Any, new_file_content: Any) -> list[Diff]:
+    diffs: list[Diff] = []
+    if old_file_content and new_file_content:
+        differ = _StructuralDiffer()
+        differ.diff(old_file_content, new_file_content, None)
+        diffs.extend(differ.diffs())
+    elif old_file_content:
+        # file was deleted
+        diffs.append(
+            Diff(
+                path=jsonpath_ng.Root(),
+                diff_type=DiffType.REMOVED,
+                old=old_file_content,
+                new=None,
+            )
+        )
+    elif new_file_content:
+        # file was added
+        diffs.append(
+            Diff(
+                path=jsonpath_ng.Root(),
+                diff_type=DiffType.ADDED,
+                old=None,
+                new=new_file_content,
+            )
+        )
+
+    return diffs
+
+
+def extract_diffs_with_deepdiff(
+    old_file_content: Any, new_file_content: Any
+) -> list[Diff]:
+    """
+    The DeepDiff based predecessor of `extract_diffs`. It is kept as a
+    reference to compare results and runtime with, see
+    `reconcile.change_owners.diff_benchmark`.
+    """
     diffs: list[Diff] = []
     if old_file_content and new_file_content:
         deep_diff = DeepDiff(
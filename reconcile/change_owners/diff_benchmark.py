@@ -0,0 +1,94 @@
+"""
+Compare `extract_diffs` with its DeepDiff based predecessor on recorded
+bundle diffs.
+
+A recorded bundle diff is the JSON response of the qontract-server /diff
+endpoint, e.g. `curl $QONTRACT_SERVER/diff/$COMPARISON_SHA > diff.json`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import TYPE_CHECKING, Any
+
+from reconcile.change_owners.bundle import QontractServerDiff
+from reconcile.change_owners.changes import parse_resource_file_content
+from reconcile.change_owners.diff import (
+    Diff,
+    extract_diffs,
+    extract_diffs_with_deepdiff,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+@dataclass
+class DiffBenchmarkResult:
+    files: int = 0
+    diffs: int = 0
+    native_seconds: float = 0.0
+    deepdiff_seconds: float = 0.0
+    mismatches: list[str] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float:
+        if not self.native_seconds:
+            return 0.0
+        return self.deepdiff_seconds / self.native_seconds
+
+
+def load_recorded_diff(path: str) -> QontractServerDiff:
+    with open(path, encoding="utf-8") as f:
+        return QontractServerDiff(**json.load(f))
+
+
+def file_contents(diff: QontractServerDiff) -> Iterator[tuple[str, Any, Any]]:
+    """
+    The old and new content of every changed file, prepared the same way
+    `parse_bundle_changes` does before detecting diffs.
+    """
+    for df in diff.datafiles.values():
+        yield df.datafilepath, df.cleaned_old_data, df.cleaned_new_data
+    for rf in diff.resources.values():
+        old, _ = parse_resource_file_content(rf.old.content if rf.old else None)
+        new, _ = parse_resource_file_content(rf.new.content if rf.new else None)
+        yield rf.resourcepath, old, new
+
+
+def _summary(diffs: list[Diff]) -> list[tuple[str, str]]:
+    return sorted((d.path_str(), d.diff_type.value) for d in diffs)
+
+
+def _timed(
+    func: Callable[[Any, Any], list[Diff]], old: Any, new: Any, repeat: int
+) -> tuple[list[Diff], float]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        diffs = func(old, new)
+    return diffs, (time.perf_counter() - start) / repeat
+
+
+def benchmark_diffs(diff: QontractServerDiff, repeat: int = 1) -> DiffBenchmarkResult:
+    """
+    Detect the diffs of all changed files with both implementations and
+    report their runtime and the files where the detected diffs differ.
+    """
+    result = DiffBenchmarkResult()
+    for path, old, new in file_contents(diff):
+        native_diffs, native_seconds = _timed(extract_diffs, old, new, repeat)
+        deepdiff_diffs, deepdiff_seconds = _timed(
+            extract_diffs_with_deepdiff, old, new, repeat
+        )
+        result.files += 1
+        result.diffs += len(native_diffs)
+        result.native_seconds += native_seconds
+        result.deepdiff_seconds += deepdiff_seconds
+        if _summary(native_diffs) != _summary(deepdiff_diffs):
+            result.mismatches.append(path)
+    return result
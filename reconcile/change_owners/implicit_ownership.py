@@ -4,9 +4,9 @@ from reconcile.change_owners.approver import ApproverResolver
 from reconcile.change_owners.change_types import (
     ChangeTypeContext,
     ChangeTypeProcessor,
-    FileChange,
 )
 from reconcile.change_owners.changes import BundleFileChange
+from reconcile.change_owners.context_cache import ContextResolver
 from reconcile.gql_definitions.change_owners.queries.change_types import (
     ChangeTypeImplicitOwnershipJsonPathProviderV1,
 )
@@ -17,33 +17,34 @@ def cover_changes_with_implicit_ownership(
     change_type_processors: list[ChangeTypeProcessor],
     bundle_changes: list[BundleFileChange],
     approver_resolver: ApproverResolver,
+    context_resolver: ContextResolver | None = None,
 ) -> None:
+    context_resolver = context_resolver or ContextResolver(change_type_processors)
     for bc, ctx in change_type_contexts_for_implicit_ownership(
         change_type_processors=change_type_processors,
         bundle_changes=bundle_changes,
         approver_resolver=approver_resolver,
+        context_resolver=context_resolver,
     ):
-        bc.cover_changes(ctx)
+        with context_resolver.timed(ctx.change_type_processor.name, "coverage"):
+            bc.cover_changes(ctx)
 
 
 def change_type_contexts_for_implicit_ownership(
     change_type_processors: list[ChangeTypeProcessor],
     bundle_changes: list[BundleFileChange],
     approver_resolver: ApproverResolver,
+    context_resolver: ContextResolver | None = None,
 ) -> list[tuple[BundleFileChange, ChangeTypeContext]]:
+    context_resolver = context_resolver or ContextResolver(change_type_processors)
     change_type_contexts: list[tuple[BundleFileChange, ChangeTypeContext]] = []
     processors_with_implicit_ownership = [
         ctp for ctp in change_type_processors if ctp.implicit_ownership
     ]
     for ctp in processors_with_implicit_ownership:
         for bc in bundle_changes:
-            for ownership in ctp.find_context_file_refs(
-                change=FileChange(
-                    file_ref=bc.fileref,
-                    old=bc.old,
-                    new=bc.new,
-                ),
-                expansion_trail=set(),
+            for ownership in context_resolver.find_context_file_refs(
+                bc, ctp, with_backrefs=False
             ):
                 for io in ctp.implicit_ownership:
                     if isinstance(io, ChangeTypeImplicitOwnershipJsonPathProviderV1):
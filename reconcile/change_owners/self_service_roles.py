@@ -10,9 +10,9 @@ from reconcile.change_owners.bundle import BundleFileType
 from reconcile.change_owners.change_types import (
     ChangeTypeContext,
     ChangeTypeProcessor,
-    FileChange,
 )
 from reconcile.change_owners.changes import BundleFileChange
+from reconcile.change_owners.context_cache import ContextResolver
 from reconcile.gql_definitions.change_owners.queries import self_service_roles
 from reconcile.gql_definitions.change_owners.queries.self_service_roles import (
     PermissionGitlabGroupMembershipV1,
@@ -83,19 +83,24 @@ def cover_changes_with_self_service_roles(
     roles: list[RoleV1],
     change_type_processors: list[ChangeTypeProcessor],
     bundle_changes: list[BundleFileChange],
+    context_resolver: ContextResolver | None = None,
 ) -> None:
+    context_resolver = context_resolver or ContextResolver(change_type_processors)
     for bc, ctx in change_type_contexts_for_self_service_roles(
         roles=roles,
         change_type_processors=change_type_processors,
         bundle_changes=bundle_changes,
+        context_resolver=context_resolver,
     ):
-        bc.cover_changes(ctx)
+        with context_resolver.timed(ctx.change_type_processor.name, "coverage"):
+            bc.cover_changes(ctx)
 
 
 def change_type_contexts_for_self_service_roles(
     roles: list[RoleV1],
     change_type_processors: list[ChangeTypeProcessor],
     bundle_changes: list[BundleFileChange],
+    context_resolver: ContextResolver | None = None,
 ) -> list[tuple[BundleFileChange, ChangeTypeContext]]:
     """
     Cover changes with ChangeTypeV1 associated to datafiles and resources via a
@@ -139,19 +144,11 @@ def change_type_contexts_for_self_service_roles(
     resolved_approvers = resolve_role_members([r for r in roles if r.self_service])
 
     # match every BundleChange with every relevant ChangeTypeV1
+    context_resolver = context_resolver or ContextResolver(change_type_processors)
     change_type_contexts: list[tuple[BundleFileChange, ChangeTypeContext]] = []
     for bc in bundle_changes:
         for ctp in change_type_processors:
-            for ownership in ctp.find_context_file_refs(
-                change=FileChange(
-                    file_ref=bc.fileref,
-                    old=bc.old,
-                    new=bc.new,
-                    old_backrefs=bc.old_backrefs,
-                    new_backrefs=bc.new_backrefs,
-                ),
-                expansion_trail=set(),
-            ):
+            for ownership in context_resolver.find_context_file_refs(bc, ctp):
                 # if the context file is bound with the change type in
                 # a role, build a changetypecontext
                 owning_roles: dict[str, RoleV1] = {}
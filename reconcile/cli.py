@@ -1245,11 +1245,16 @@ def slack_usergroups_api(
     default=False,
     help="wait for pending/running pipelines before acting.",
 )
+@threaded()
 @click.pass_context
-def gitlab_housekeeping(ctx: click.Context, wait_for_pipeline: bool) -> None:
+def gitlab_housekeeping(
+    ctx: click.Context, wait_for_pipeline: bool, thread_pool_size: int
+) -> None:
     import reconcile.gitlab_housekeeping
 
-    run_integration(reconcile.gitlab_housekeeping, ctx, wait_for_pipeline)
+    run_integration(
+        reconcile.gitlab_housekeeping, ctx, wait_for_pipeline, thread_pool_size
+    )
 
 
 @integration.command(short_help="Listen to SQS and creates MRs out of the messages.")
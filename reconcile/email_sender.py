@@ -113,6 +113,8 @@ def run(dry_run: bool, defer: Callable | None = None) -> None:
         logging.error("email names must be unique.")
         sys.exit(1)
 
+    # one LIST instead of a HEAD request per email
+    state.load_manifest()
     emails_to_send = [e for e in emails if not state.exists(e.name)]
     for email in emails_to_send:
         logging.info(["send_email", email.name, email.subject])
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import (
@@ -13,21 +14,27 @@ from typing import TYPE_CHECKING, Any, cast
 
 import gitlab
 from gitlab.const import PipelineStatus
+from gitlab.v4.objects import (
+    ProjectMergeRequestPipeline,
+    ProjectMergeRequestResourceLabelEvent,
+)
 from prometheus_client import (
     Counter,
     Gauge,
     Histogram,
 )
-from sretoolbox.utils import retry
+from sretoolbox.utils import retry, threaded
 
 from reconcile import queries
 from reconcile.change_owners.change_types import ChangeTypePriority
+from reconcile.utils.constants import DEFAULT_THREAD_POOL_SIZE
 from reconcile.utils.datetime_util import ensure_utc, from_utc_iso_format, utc_now
 from reconcile.utils.gitlab_api import (
     GitLabApi,
     MRState,
     MRStatus,
 )
+from reconcile.utils.instrumented_wrappers import ConditionalResponseCache
 from reconcile.utils.mr.labels import (
     APPROVED,
     AUTO_MERGE,
@@ -54,6 +61,7 @@ from reconcile.utils.unleash import get_feature_variant
 
 if TYPE_CHECKING:
     from collections.abc import (
+        Callable,
         Iterable,
     )
     from collections.abc import (
@@ -64,7 +72,6 @@ if TYPE_CHECKING:
         ProjectCommit,
         ProjectIssue,
         ProjectMergeRequest,
-        ProjectMergeRequestPipeline,
     )
 
 MERGE_LABELS_PRIORITY = [
@@ -506,6 +513,7 @@ def get_merge_requests(
     gl: GitLabApi,
     state: State,
     users_allowed_to_label: Iterable[str] | None = None,
+    thread_pool_size: int = DEFAULT_THREAD_POOL_SIZE,
 ) -> list[dict[str, Any]]:
     mrs = gl.get_merge_requests(state=MRState.OPENED)
     return preprocess_merge_requests(
@@ -514,9 +522,57 @@ def get_merge_requests(
         project_merge_requests=mrs,
         state=state,
         users_allowed_to_label=users_allowed_to_label,
+        thread_pool_size=thread_pool_size,
     )
 
 
+@dataclass
+class MergeRequestFacts:
+    """
+    Read-only data of a merge request, fetched concurrently ahead of the
+    sequential processing that decides what to do with it.
+    """
+
+    commit_count: int = 0
+    label_events: list[ProjectMergeRequestResourceLabelEvent] | None = None
+    rebased: bool = True
+    pipelines: list[ProjectMergeRequestPipeline] | None = None
+
+
+def _fetch_preprocess_facts(
+    mr: ProjectMergeRequest, gl: GitLabApi
+) -> MergeRequestFacts:
+    facts = MergeRequestFacts(commit_count=len(mr.commits()))
+    # MRs without labels are skipped before their label events are looked at
+    if facts.commit_count and mr.labels:
+        facts.label_events = gl.get_merge_request_label_events(mr)
+    return facts
+
+
+def _fetch_merge_facts(
+    mr: ProjectMergeRequest, gl: GitLabApi, rebase: bool
+) -> MergeRequestFacts:
+    facts = MergeRequestFacts(rebased=not rebase or is_rebased(mr, gl))
+    if facts.rebased:
+        facts.pipelines = gl.get_merge_request_pipelines(mr)
+    return facts
+
+
+def fetch_merge_request_facts(
+    fetch: Callable[..., MergeRequestFacts],
+    merge_requests: list[ProjectMergeRequest],
+    thread_pool_size: int,
+    **kwargs: Any,
+) -> dict[int, MergeRequestFacts]:
+    """
+    Run the per-MR API round-trips of `fetch` in a bounded thread pool and
+    return the results by MR iid. Callers still walk the MRs in their own
+    order, so merge decisions stay deterministic.
+    """
+    facts = threaded.run(fetch, merge_requests, thread_pool_size, **kwargs)
+    return {mr.iid: f for mr, f in zip(merge_requests, facts, strict=True)}
+
+
 def preprocess_merge_requests(
     dry_run: bool,
     gl: GitLabApi,
@@ -524,17 +580,26 @@ def preprocess_merge_requests(
     state: State,
     users_allowed_to_label: Iterable[str] | None = None,
     must_pass: Iterable[str] | None = None,
+    thread_pool_size: int = DEFAULT_THREAD_POOL_SIZE,
 ) -> list[dict[str, Any]]:
-    results = []
-    for mr in project_merge_requests:
-        if mr.merge_status in {
+    candidates = [
+        mr
+        for mr in project_merge_requests
+        if mr.merge_status
+        not in {
             MRStatus.CANNOT_BE_MERGED,
             MRStatus.CANNOT_BE_MERGED_RECHECK,
-        }:
-            continue
-        if mr.draft:
-            continue
-        if len(mr.commits()) == 0:
+        }
+        and not mr.draft
+    ]
+    facts_by_iid = fetch_merge_request_facts(
+        _fetch_preprocess_facts, candidates, thread_pool_size, gl=gl
+    )
+
+    results = []
+    for mr in candidates:
+        facts = facts_by_iid[mr.iid]
+        if facts.commit_count == 0:
             continue
 
         if must_pass and not verify_on_demand_tests(
@@ -561,7 +626,7 @@ def preprocess_merge_requests(
                 gl.remove_label(mr, LGTM)
             continue
 
-        label_events = gl.get_merge_request_label_events(mr)
+        label_events = facts.label_events or []
         approval_found = False
         labels_by_unauthorized_users = set()
         labels_by_authorized_users = set()
@@ -700,6 +765,18 @@ def _try_rebase(
 OMM_MAX_INTERVAL_TOGGLE = "gitlab-housekeeping-omm-max-interval"
 DEFAULT_OMM_MAX_INTERVAL_MINUTES = 5
 
+# GET responses are kept across the loops of a long running integration and
+# revalidated with If-None-Match, so unchanged MRs, pipelines, approvals and
+# notes don't count against the API quota again
+RESPONSE_CACHE = ConditionalResponseCache()
+
+
+def response_cache_enabled() -> bool:
+    return os.environ.get("GITLAB_HOUSEKEEPING_RESPONSE_CACHE", "").lower() in {
+        "true",
+        "yes",
+    }
+
 
 def get_omm_max_interval() -> timedelta:
     """Resolve the OMM group window duration from Unleash."""
@@ -1277,6 +1354,7 @@ def merge_merge_requests(
     users_allowed_to_label: Iterable[str] | None = None,
     must_pass: Iterable[str] | None = None,
     multi_merge: bool = False,
+    thread_pool_size: int = DEFAULT_THREAD_POOL_SIZE,
 ) -> None:
     if reload_toggle.reload:
         project_merge_requests = gl.get_merge_requests(state=MRState.OPENED)
@@ -1287,6 +1365,7 @@ def merge_merge_requests(
         state=state,
         users_allowed_to_label=users_allowed_to_label,
         must_pass=must_pass,
+        thread_pool_size=thread_pool_size,
     )
     merge_requests_waiting.labels(gl.project.id).set(len(merge_requests))
     merge_requests_error.labels(gl.project.id).set(
@@ -1327,6 +1406,10 @@ def merge_merge_requests(
     # --- No active group: serial merge path ---
     merges = 0
     merged_labels: set[str] = set()
+    # facts are fetched a batch at a time as the loop reaches them: with
+    # rebase the loop stops after the first merge
+    mergeable = [item["mr"] for item in merge_requests if not item["error"]]
+    facts_by_iid: dict[int, MergeRequestFacts] = {}
 
     for merge_request in merge_requests:
         mr: ProjectMergeRequest = merge_request["mr"]
@@ -1335,10 +1418,20 @@ def merge_merge_requests(
             logging.info(["skip merge", gl.project.name, mr.iid])
             continue
 
-        if rebase and not is_rebased(mr, gl):
+        if mr.iid not in facts_by_iid:
+            fetched = len(facts_by_iid)
+            facts_by_iid |= fetch_merge_request_facts(
+                _fetch_merge_facts,
+                mergeable[fetched : fetched + thread_pool_size],
+                thread_pool_size,
+                gl=gl,
+                rebase=rebase,
+            )
+        facts = facts_by_iid[mr.iid]
+        if not facts.rebased:
             continue
 
-        pipelines = gl.get_merge_request_pipelines(mr)
+        pipelines = facts.pipelines
         if not pipelines:
             continue
 
@@ -1517,7 +1610,11 @@ def publish_access_token_expiration_metrics(gl: GitLabApi) -> None:
                 gitlab_token_expiration.remove(pat.name)
 
 
-def run(dry_run: bool, wait_for_pipeline: bool) -> None:
+def run(
+    dry_run: bool,
+    wait_for_pipeline: bool,
+    thread_pool_size: int = DEFAULT_THREAD_POOL_SIZE,
+) -> None:
     default_days_interval = 15
     default_limit = 8
     default_merge_limit = 8
@@ -1532,6 +1629,7 @@ def run(dry_run: bool, wait_for_pipeline: bool) -> None:
     app_sre_usernames: set[str] = set()
     rebase_strategy = get_rebase_strategy()
     state = init_state(QONTRACT_INTEGRATION)
+    response_cache = RESPONSE_CACHE if response_cache_enabled() else None
 
     for repo in repos:
         hk = repo["housekeeping"]
@@ -1556,7 +1654,12 @@ def run(dry_run: bool, wait_for_pipeline: bool) -> None:
                 u["org_username"] for la in labels_allowed for u in la["role"]["users"]
             }
         )
-        with GitLabApi(instance, project_url=project_url, settings=settings) as gl:
+        with GitLabApi(
+            instance,
+            project_url=project_url,
+            settings=settings,
+            response_cache=response_cache,
+        ) as gl:
             if not app_sre_usernames:
                 app_sre_usernames = get_app_sre_usernames(gl)
             issues = gl.get_issues(state=MRState.OPENED)
@@ -1610,6 +1713,7 @@ def run(dry_run: bool, wait_for_pipeline: bool) -> None:
                     users_allowed_to_label=users_allowed_to_label,
                     must_pass=must_pass,
                     multi_merge=multi_merge,
+                    thread_pool_size=thread_pool_size,
                 )
             except Exception:
                 logging.error(
@@ -1630,6 +1734,7 @@ def run(dry_run: bool, wait_for_pipeline: bool) -> None:
                     users_allowed_to_label=users_allowed_to_label,
                     must_pass=must_pass,
                     multi_merge=multi_merge,
+                    thread_pool_size=thread_pool_size,
                 )
             if rebase:
                 rebase_merge_requests(
@@ -1642,3 +1747,12 @@ def run(dry_run: bool, wait_for_pipeline: bool) -> None:
                     users_allowed_to_label=users_allowed_to_label,
                     strategy=rebase_strategy,
                 )
+
+    if response_cache is not None:
+        logging.debug(
+            "gitlab response cache: %d entries, %d hits, %d misses, hit ratio %.2f",
+            len(response_cache),
+            response_cache.hits,
+            response_cache.misses,
+            response_cache.hit_ratio,
+        )
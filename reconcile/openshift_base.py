@@ -864,6 +864,7 @@ def patch_desired_resource_for_recycle_annotations(
         desired.body["spec"]["template"]["metadata"]["annotations"] = (
             patch_annotations | desired_annotations
         )
+        desired.invalidate_cache()
     return desired
 
 
@@ -1611,6 +1612,9 @@ def get_namespace_resource_names(
 
 
 def publish_metrics(ri: ResourceInventory, integration: str) -> None:
+    # There is no per-cluster bytes gauge: the native client hands over parsed
+    # objects only, so a size would need another serialization of the whole
+    # inventory. The resource counts below are the memory proxy instead.
     for cluster, namespace, kind, data in ri:
         for state in ("current", "desired"):
             metrics.set_gauge(
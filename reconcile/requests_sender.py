@@ -92,6 +92,8 @@ def run(dry_run: bool, defer: Callable | None = None) -> None:
 
     error = False
 
+    # one LIST instead of a HEAD request per credentials request
+    state.load_manifest()
     credentials_requests_to_send = [
         r for r in credentials_requests if not state.exists(r["name"])
     ]
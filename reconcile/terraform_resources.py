@@ -1,4 +1,5 @@
 import logging
+import os
 from collections.abc import (
     Callable,
     Collection,
@@ -7,6 +8,7 @@ from collections.abc import (
     Sequence,
 )
 from dataclasses import asdict
+from datetime import timedelta
 from typing import (
     Any,
     TypedDict,
@@ -57,6 +59,7 @@ from reconcile.utils.openshift_resource import ResourceInventory
 from reconcile.utils.runtime.integration import DesiredStateShardConfig
 from reconcile.utils.secret_reader import SecretReaderBase, create_secret_reader
 from reconcile.utils.semver_helper import make_semver
+from reconcile.utils.state import init_state
 from reconcile.utils.terraform_client import TerraformClient as Terraform
 from reconcile.utils.terrascript_aws_client import TerrascriptClient
 from reconcile.utils.terrascript_aws_client import TerrascriptClient as Terrascript
@@ -233,12 +236,17 @@ def get_aws_accounts(
     return accounts
 
 
+def plan_skip_enabled() -> bool:
+    return os.environ.get("TERRAFORM_PLAN_SKIP", "").lower() in {"true", "yes"}
+
+
 def setup(
     accounts: list[dict[str, Any]],
     account_names: set[str],
     tf_namespaces: list[NamespaceV1],
     print_to_file: str | None,
     thread_pool_size: int,
+    dry_run: bool,
 ) -> tuple[Terraform, TerrascriptClient, SecretReaderBase]:
     vault_settings = get_app_interface_vault_settings()
     secret_reader = create_secret_reader(use_vault=vault_settings.vault)
@@ -265,6 +273,15 @@ def setup(
         working_dirs,
         thread_pool_size,
         aws_api,
+        plan_skip_state=(
+            init_state(QONTRACT_INTEGRATION, secret_reader)
+            if plan_skip_enabled()
+            else None
+        ),
+        plan_skip_max_age=timedelta(
+            hours=float(os.environ.get("TERRAFORM_PLAN_SKIP_MAX_AGE_HOURS", "6"))
+        ),
+        plan_skip_read_only=dry_run,
     )
     clusters = [c for c in queries.get_clusters() if c.get("ocm") is not None]
     if clusters:
@@ -405,6 +422,7 @@ def run(
         tf_namespaces,
         print_to_file,
         thread_pool_size,
+        dry_run,
     )
     if defer:
         defer(tf.cleanup)
@@ -0,0 +1,200 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from reconcile.change_owners.change_types import (
+    ChangeTypeProcessor,
+    ContextExpansion,
+    ForwardrefOwnershipContext,
+)
+from reconcile.change_owners.changes import BundleFileChange
+from reconcile.change_owners.context_cache import (
+    ContextResolver,
+    bundle_changes_digest,
+    change_types_version,
+    is_file_local,
+)
+from reconcile.change_owners.self_service_roles import (
+    cover_changes_with_self_service_roles,
+)
+from reconcile.gql_definitions.change_owners.queries.change_types import (
+    ChangeTypeV1,
+)
+from reconcile.gql_definitions.change_owners.queries.self_service_roles import (
+    DatafileObjectV1,
+)
+from reconcile.test.change_owners.fixtures import (
+    MockFileDiffResolver,
+    build_change_type,
+    build_role,
+    build_test_datafile,
+)
+from reconcile.utils.jsonpath import parse_jsonpath
+
+
+class StubState:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    def get_many(self, keys: Any, thread_pool_size: int = 10) -> dict[str, Any]:
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def add(self, key: str, value: Any = None, force: bool = False) -> None:
+        self.data[key] = value
+
+
+@pytest.fixture
+def ctp() -> ChangeTypeProcessor:
+    return build_change_type(
+        name="change-type",
+        change_selectors=["allowed_path"],
+        context_schema="schema-1.yml",
+    )
+
+
+@pytest.fixture
+def bundle_change() -> BundleFileChange:
+    return build_test_datafile(
+        content={"allowed_path": "value"},
+        filepath="file-1.yaml",
+        schema="schema-1.yml",
+    ).create_bundle_change({"allowed_path": "new_value"})
+
+
+def _change_type(name: str, description: str = "") -> ChangeTypeV1:
+    return ChangeTypeV1(
+        name=name,
+        description=description,
+        contextType="datafile",
+        contextSchema=None,
+        changes=[],
+        disabled=False,
+        priority="urgent",
+        labels=None,
+        inherit=[],
+        implicitOwnership=[],
+        restrictive=None,
+    )
+
+
+def test_change_types_version() -> None:
+    a, b = _change_type("a"), _change_type("b")
+    assert change_types_version([a, b]) == change_types_version([b, a])
+    assert change_types_version([a, b]) != change_types_version([a])
+    assert change_types_version([a, b]) != change_types_version([
+        a,
+        _change_type("b", description="changed"),
+    ])
+
+
+def test_bundle_changes_digest(bundle_change: BundleFileChange) -> None:
+    assert bundle_changes_digest("sha", [bundle_change]) == bundle_changes_digest(
+        "sha", [bundle_change]
+    )
+    assert bundle_changes_digest("sha", [bundle_change]) != bundle_changes_digest(
+        "other", [bundle_change]
+    )
+
+
+def test_is_file_local(ctp: ChangeTypeProcessor) -> None:
+    assert is_file_local(ctp)
+    ctp.add_context_expansion(MagicMock())
+    assert not is_file_local(ctp)
+
+
+def test_resolver_without_state(
+    ctp: ChangeTypeProcessor, bundle_change: BundleFileChange, mocker: MockerFixture
+) -> None:
+    spy = mocker.spy(ctp, "find_context_file_refs")
+    resolver = ContextResolver([ctp])
+
+    for _ in range(2):
+        contexts = resolver.find_context_file_refs(bundle_change, ctp)
+        assert [c.context_file_ref for c in contexts] == [bundle_change.fileref]
+
+    assert spy.call_count == 2
+    assert resolver.durations.keys() == {"change-type"}
+
+
+def test_resolver_reuses_cached_contexts(
+    ctp: ChangeTypeProcessor, bundle_change: BundleFileChange, mocker: MockerFixture
+) -> None:
+    state = StubState()
+    resolver = ContextResolver([ctp], state=state, change_types_version="v1")  # type: ignore[arg-type]
+    resolver.preload([bundle_change])
+    contexts = resolver.find_context_file_refs(bundle_change, ctp)
+    resolver.persist()
+    assert resolver.misses == 1
+    assert len(state.data) == 1
+
+    spy = mocker.spy(ctp, "find_context_file_refs")
+    resolver = ContextResolver([ctp], state=state, change_types_version="v1")  # type: ignore[arg-type]
+    resolver.preload([bundle_change])
+    assert resolver.find_context_file_refs(bundle_change, ctp) == contexts
+    assert resolver.hits == 1
+    spy.assert_not_called()
+
+    # a new change-type version invalidates the cached contexts
+    resolver = ContextResolver([ctp], state=state, change_types_version="v2")  # type: ignore[arg-type]
+    resolver.preload([bundle_change])
+    resolver.find_context_file_refs(bundle_change, ctp)
+    assert resolver.misses == 1
+    spy.assert_called_once()
+
+
+def test_resolver_bundle_scoped_contexts(
+    ctp: ChangeTypeProcessor, bundle_change: BundleFileChange, mocker: MockerFixture
+) -> None:
+    ctp.add_context_expansion(
+        ContextExpansion(
+            context=ForwardrefOwnershipContext(selector=parse_jsonpath("missing")),
+            change_type=ctp,
+            file_diff_resolver=MockFileDiffResolver(),
+        )
+    )
+    state = StubState()
+    resolver = ContextResolver([ctp], state=state, bundle_digest="d1")  # type: ignore[arg-type]
+    resolver.find_context_file_refs(bundle_change, ctp)
+    resolver.persist()
+
+    spy = mocker.spy(ctp, "find_context_file_refs")
+    resolver = ContextResolver([ctp], state=state, bundle_digest="d1")  # type: ignore[arg-type]
+    resolver.preload([bundle_change])
+    resolver.find_context_file_refs(bundle_change, ctp)
+    spy.assert_not_called()
+
+    resolver = ContextResolver([ctp], state=state, bundle_digest="d2")  # type: ignore[arg-type]
+    resolver.preload([bundle_change])
+    resolver.find_context_file_refs(bundle_change, ctp)
+    spy.assert_called_once()
+
+
+def test_cover_changes_with_cached_contexts(
+    ctp: ChangeTypeProcessor, bundle_change: BundleFileChange
+) -> None:
+    state = StubState()
+    role = build_role(
+        name="role",
+        change_type_name="change-type",
+        datafiles=[DatafileObjectV1(datafileSchema="schema-1.yml", path="file-1.yaml")],
+        users=["user"],
+    )
+    for _ in range(2):
+        resolver = ContextResolver([ctp], state=state)  # type: ignore[arg-type]
+        resolver.preload([bundle_change])
+        change = build_test_datafile(
+            content={"allowed_path": "value"},
+            filepath="file-1.yaml",
+            schema="schema-1.yml",
+        ).create_bundle_change({"allowed_path": "new_value"})
+        cover_changes_with_self_service_roles(
+            roles=[role],
+            change_type_processors=[ctp],
+            bundle_changes=[change],
+            context_resolver=resolver,
+        )
+        resolver.persist()
+        assert change.all_changes_covered()
+    assert resolver.hits == 1
@@ -1,3 +1,5 @@
+from typing import Any
+
 import jsonpath_ng
 import pytest
 
@@ -6,8 +8,11 @@ from reconcile.change_owners.diff import (
     Diff,
     DiffType,
     deepdiff_path_to_jsonpath,
+    extract_diffs,
 )
+from reconcile.change_owners.diff_benchmark import benchmark_diffs
 from reconcile.test.change_owners.fixtures import (
+    QontractServerBundleDiffDataBuilder,
     build_bundle_datafile_change,
     build_bundle_resourcefile_change,
 )
@@ -708,3 +713,141 @@ def test_bundle_change_resource_file_dict_value_added() -> None:
     assert bundle_change.diff_coverage[0].diff.diff_type == DiffType.ADDED
     assert bundle_change.diff_coverage[0].diff.old is None
     assert bundle_change.diff_coverage[0].diff.new == "new_value"
+
+
+#
+# structural differ
+#
+
+
+def _diff_summary(diffs: list[Diff]) -> list[tuple[str, DiffType]]:
+    return sorted((d.path_str(), d.diff_type) for d in diffs)
+
+
+def test_extract_diffs_matches_items_by_name() -> None:
+    old = {"targets": [{"name": "a", "ref": "1"}, {"name": "b", "ref": "2"}]}
+    new = {"targets": [{"name": "b", "ref": "3", "x": 1}, {"name": "a", "ref": "1"}]}
+
+    assert _diff_summary(extract_diffs(old, new)) == [
+        ("targets.[1].ref", DiffType.CHANGED),
+        ("targets.[1].x", DiffType.ADDED),
+    ]
+
+
+def test_extract_diffs_matches_items_by_similarity() -> None:
+    old = {"items": [{"a": 1, "b": 2, "c": 3}, {"d": 4}]}
+    new = {"items": [{"d": 4}, {"a": 1, "b": 2, "c": 5}]}
+
+    assert _diff_summary(extract_diffs(old, new)) == [
+        ("items.[0].c", DiffType.CHANGED),
+    ]
+
+
+def test_extract_diffs_identifier_items_are_not_matched_by_name() -> None:
+    old = {"items": [{"__identifier": "x", "name": "a"}]}
+    new = {"items": [{"name": "a", "v": 1}, {"__identifier": "x", "name": "a"}]}
+
+    assert _diff_summary(extract_diffs(old, new)) == [
+        ("items.[0]", DiffType.ADDED),
+    ]
+
+
+def test_extract_diffs_scalar_items() -> None:
+    assert _diff_summary(extract_diffs({"l": [1, 2, 3]}, {"l": [3, 4, 1, 5]})) == [
+        ("l.[1]", DiffType.CHANGED),
+        ("l.[3]", DiffType.ADDED),
+    ]
+
+
+@pytest.mark.parametrize(
+    "old,new,expected",
+    [
+        # moved scalars are not paired by value, unlike with DeepDiff
+        (
+            [1, 2, 3],
+            [3, 2, 4],
+            [("l.[0]", DiffType.REMOVED), ("l.[2]", DiffType.ADDED)],
+        ),
+        (
+            ["a", "b"],
+            ["b", "c"],
+            [("l.[0]", DiffType.REMOVED), ("l.[1]", DiffType.ADDED)],
+        ),
+        # scalars at the same position are changed
+        (
+            ["a", "b"],
+            ["c", "d"],
+            [("l.[0]", DiffType.CHANGED), ("l.[1]", DiffType.CHANGED)],
+        ),
+        (
+            ["a", "b", "x"],
+            ["c"],
+            [
+                ("l.[0]", DiffType.CHANGED),
+                ("l.[1]", DiffType.REMOVED),
+                ("l.[2]", DiffType.REMOVED),
+            ],
+        ),
+        ([1, 2, 3], [3, 2], [("l.[0]", DiffType.REMOVED)]),
+    ],
+)
+def test_extract_diffs_scalar_list(
+    old: list[Any], new: list[Any], expected: list[tuple[str, DiffType]]
+) -> None:
+    assert _diff_summary(extract_diffs({"l": old}, {"l": new})) == expected
+
+
+def test_extract_diffs_name_matched_items_use_old_index() -> None:
+    old = {"l": [{"name": "a", "v": 1}, {"name": "b", "v": 1}]}
+    new = {"l": [{"name": "b", "v": 2}, {"name": "a", "v": 1}]}
+
+    diffs = extract_diffs(old, new)
+    assert _diff_summary(diffs) == [("l.[1].v", DiffType.CHANGED)]
+    assert (diffs[0].old, diffs[0].new) == (1, 2)
+
+
+def test_extract_diffs_nested_lists() -> None:
+    assert _diff_summary(
+        extract_diffs({"l": [[1, 2], [3]]}, {"l": [[3], [2, 1, 5]]})
+    ) == [("l.[0].[2]", DiffType.ADDED)]
+
+
+def test_extract_diffs_same_as_deepdiff_on_bundle_diff() -> None:
+    builder = QontractServerBundleDiffDataBuilder()
+    builder.add_datafile(
+        path="/saas.yml",
+        schema="/app-sre/saas-file-2.yml",
+        old_content={
+            "resourceTemplates": [
+                {
+                    "name": "rt",
+                    "targets": [
+                        {"namespace": {"$ref": f"/ns-{i}.yml"}, "ref": "a"}
+                        for i in range(20)
+                    ],
+                }
+            ]
+        },
+        new_content={
+            "resourceTemplates": [
+                {
+                    "name": "rt",
+                    "targets": [
+                        {"namespace": {"$ref": f"/ns-{i}.yml"}, "ref": "b"}
+                        if i == 7
+                        else {"namespace": {"$ref": f"/ns-{i}.yml"}, "ref": "a"}
+                        for i in range(20)
+                    ],
+                }
+            ]
+        },
+    )
+    builder.add_resource_file(
+        path="/resource.yml", old_content="a: 1", new_content="a: 2\nb: 3"
+    )
+
+    result = benchmark_diffs(builder.diff)
+
+    assert result.files == 2
+    assert result.diffs == 3
+    assert not result.mismatches
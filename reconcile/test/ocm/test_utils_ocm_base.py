@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
 import pytest
 
 from reconcile.test.ocm.fixtures import OcmUrl
-from reconcile.test.ocm.test_utils_ocm_get_json import build_paged_ocm_response
+from reconcile.test.ocm.test_utils_ocm_get_json import (
+    buid_ocm_item_page,
+    build_paged_ocm_response,
+)
 from reconcile.utils.ocm_base_client import OCMBaseClient
+from reconcile.utils.ocm_fleet_snapshot import FleetSnapshot
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from pathlib import Path
+    from typing import Any
 
+    from pytest_httpserver import HTTPServer
     from werkzeug import Request
 
 
@@ -85,3 +93,137 @@ def test_get_json_pagination_max_pages(
 
     ocm_calls = find_all_ocm_http_requests("GET", "/api")
     assert len(ocm_calls) == max_pages
+
+
+def _register_ordered_pages(
+    httpserver: HTTPServer, pages: list[dict[str, Any]], page_size: int
+) -> None:
+    for nr, page in enumerate(pages, start=1):
+        query = {"orderBy": "id", "size": str(page_size)}
+        if nr > 1:
+            query["page"] = str(nr)
+        httpserver.expect_request(
+            "/api", method="GET", query_string=query
+        ).respond_with_json(page)
+
+
+@pytest.mark.parametrize(
+    "nr_of_items, page_size, expected_calls",
+    [(10, 3, 4), (10, 2, 6), (1, 10, 1), (10, 10, 1)],
+)
+def test_get_paginated_concurrently(
+    nr_of_items: int,
+    page_size: int,
+    expected_calls: int,
+    ocm_base: OCMBaseClient,
+    httpserver: HTTPServer,
+    find_all_ocm_http_requests: Callable[[str, str], list[Request]],
+) -> None:
+    _register_ordered_pages(
+        httpserver,
+        build_paged_ocm_response(nr_of_items=nr_of_items, page_size=page_size),
+        page_size,
+    )
+
+    resp = list(
+        ocm_base.get_paginated(
+            "/api",
+            params={"orderBy": "id"},
+            max_page_size=page_size,
+            max_concurrent_pages=3,
+        )
+    )
+
+    assert sorted(resp, key=itemgetter("id")) == [{"id": i} for i in range(nr_of_items)]
+    assert len(find_all_ocm_http_requests("GET", "/api")) == expected_calls
+
+
+def test_get_paginated_concurrently_deduplicates_by_id(
+    ocm_base: OCMBaseClient,
+    httpserver: HTTPServer,
+) -> None:
+    # an item was removed between fetching page 1 and 2, shifting item 2
+    # onto page 2 as well
+    _register_ordered_pages(
+        httpserver,
+        [
+            buid_ocm_item_page(1, [{"id": 0}, {"id": 1}, {"id": 2}], 8),
+            buid_ocm_item_page(2, [{"id": 2}, {"id": 3}, {"id": 4}], 8),
+            buid_ocm_item_page(3, [{"id": 5}, {"id": 6}], 8),
+        ],
+        3,
+    )
+
+    resp = list(
+        ocm_base.get_paginated(
+            "/api",
+            params={"orderBy": "id"},
+            max_page_size=3,
+            max_concurrent_pages=3,
+        )
+    )
+
+    assert sorted(i["id"] for i in resp) == list(range(7))
+
+
+def test_get_paginated_concurrently_continues_when_items_were_added(
+    ocm_base: OCMBaseClient,
+    httpserver: HTTPServer,
+) -> None:
+    # total reported 6 items, but another item was added in the meantime
+    _register_ordered_pages(
+        httpserver,
+        [
+            buid_ocm_item_page(1, [{"id": 0}, {"id": 1}, {"id": 2}], 6),
+            buid_ocm_item_page(2, [{"id": 3}, {"id": 4}, {"id": 5}], 7),
+            buid_ocm_item_page(3, [{"id": 6}], 7),
+        ],
+        3,
+    )
+
+    resp = list(
+        ocm_base.get_paginated(
+            "/api",
+            params={"orderBy": "id"},
+            max_page_size=3,
+            max_concurrent_pages=3,
+        )
+    )
+
+    assert sorted(i["id"] for i in resp) == list(range(7))
+
+
+def test_get_paginated_snapshot(
+    access_token_url: str,
+    ocm_url: str,
+    tmp_path: Path,
+    httpserver: HTTPServer,
+    find_all_ocm_http_requests: Callable[[str, str], list[Request]],
+) -> None:
+    ocm_api = OCMBaseClient(
+        access_token_client_id="some_client_id",
+        access_token_client_secret="some_client_secret",
+        access_token_url=access_token_url,
+        url=ocm_url,
+        fleet_snapshot=FleetSnapshot(str(tmp_path / "fleet.db")),
+    )
+    _register_ordered_pages(
+        httpserver, build_paged_ocm_response(nr_of_items=2, page_size=10), 10
+    )
+    httpserver.expect_request("/api/labels", method="POST").respond_with_json({})
+
+    def discover() -> list[dict[str, Any]]:
+        return list(
+            ocm_api.get_paginated_snapshot(
+                "/api", params={"orderBy": "id"}, max_page_size=10
+            )
+        )
+
+    assert discover() == [{"id": 0}, {"id": 1}]
+    assert discover() == [{"id": 0}, {"id": 1}]
+    assert len(find_all_ocm_http_requests("GET", "/api")) == 1
+
+    # writes drop the snapshot
+    ocm_api.post("/api/labels", data={})
+    discover()
+    assert len(find_all_ocm_http_requests("GET", "/api")) == 2
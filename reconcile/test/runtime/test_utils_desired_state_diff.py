@@ -1,22 +1,23 @@
 from __future__ import annotations
 
-from time import sleep
+import time
 from typing import TYPE_CHECKING, Any
 
-import jsonpath_ng
 import pytest
 
 from reconcile.change_owners.diff import (
     IDENTIFIER_FIELD_NAME,
-    Diff,
     DiffType,
 )
 from reconcile.utils.runtime import desired_state_diff
 from reconcile.utils.runtime.desired_state_diff import (
     DiffDetectionFailureError,
     DiffDetectionTimeoutError,
+    StateDiff,
+    StructuralHasher,
     build_desired_state_diff,
-    extract_diffs_with_timeout,
+    find_changed_shards,
+    iter_state_diffs,
 )
 from reconcile.utils.runtime.integration import DesiredStateShardConfig
 
@@ -99,39 +100,11 @@ def test_desired_state_diff_building_shardable_integration(
     assert desired_state_diff.affected_shards == {"b"}
 
 
-def diff_extration_with_3_second_sleep(
-    old_file_content: Any, new_file_content: Any
-) -> list[Diff]:
-    sleep(3)
-    return [
-        Diff(
-            diff_type=DiffType.CHANGED,
-            path=jsonpath_ng.parse("shards[1].value"),
-            old="old",
-            new="new",
-        )
-    ]
-
-
-def diff_extration_with_endless_recursion(
-    old_file_content: Any, new_file_content: Any
-) -> list[Diff]:
-    return diff_extration_with_endless_recursion(old_file_content, new_file_content)
-
-
-def diff_extration_with_exception(
-    old_file_content: Any, new_file_content: Any
-) -> list[Diff]:
-    raise Exception("something went wrong")
-
-
 def test_desired_state_diff_building_time(
     mocker: MockerFixture, shardable_test_integration: ShardableTestIntegration
 ) -> None:
-    extract_diffs_with_timeout_mock = mocker.patch.object(
-        desired_state_diff, "extract_diffs_with_timeout"
-    )
-    extract_diffs_with_timeout_mock.side_effect = DiffDetectionTimeoutError()
+    iter_state_diffs_mock = mocker.patch.object(desired_state_diff, "iter_state_diffs")
+    iter_state_diffs_mock.side_effect = DiffDetectionTimeoutError()
     diff = build_desired_state_diff(
         shardable_test_integration.get_desired_state_shard_config(),
         previous_desired_state={
@@ -151,71 +124,87 @@ def test_desired_state_diff_building_time(
 
 
 #
-# extract diffs
+# iter state diffs
 #
 
 
-def test_extract_diffs_with_timeout() -> None:
-    """
-    test timeout behaviour of diff extraction
-    """
-    previous_desired_state = {
-        "shards": [
-            {"shard": "a", "value": "old"},
-            {"shard": "b", "value": "old"},
-        ]
-    }
-    current_desired_state = {
-        "shards": [
-            {"shard": "a", "value": "old"},
-            {"shard": "b", "value": "new"},
-        ]
-    }
+def test_structural_hash_ignores_list_order() -> None:
+    hasher = StructuralHasher()
+    assert hasher.hash({"a": [1, 2], "b": "x"}) == hasher.hash({"b": "x", "a": [2, 1]})
+    assert hasher.hash({"a": [1, 2]}) != hasher.hash({"a": [1, 1, 2]})
+    assert hasher.hash({"a": 1}) != hasher.hash({"a": True})
+    assert hasher.hash({"a": 1}) != hasher.hash({"a": "1"})
+    assert hasher.hash({"a": -1}) != hasher.hash({"a": -2})
 
-    # the timeout is lower than the extraction duration -> TIMEOUT
-    with pytest.raises(DiffDetectionTimeoutError):
-        extract_diffs_with_timeout(
-            diff_extration_with_3_second_sleep,
-            previous_desired_state=previous_desired_state,
-            current_desired_state=current_desired_state,
-            timeout_seconds=1,
+
+def test_iter_state_diffs_mappings() -> None:
+    assert list(
+        iter_state_diffs(
+            {"a": 1, "b": {"c": 1, "d": 2}},
+            {"b": {"c": 2, "d": 2}, "e": 3},
         )
+    ) == [
+        StateDiff(DiffType.REMOVED, ("a",), None),
+        StateDiff(DiffType.CHANGED, ("b", "c"), ("b", "c")),
+        StateDiff(DiffType.ADDED, None, ("e",)),
+    ]
 
-    # the timeout is higher than the extraction duration -> NO TIMEOUT
-    diffs = extract_diffs_with_timeout(
-        diff_extration_with_3_second_sleep,
-        previous_desired_state=previous_desired_state,
-        current_desired_state=current_desired_state,
-        timeout_seconds=5,
-    )
-    assert diffs
-    assert isinstance(diffs[0], Diff)
 
+def test_iter_state_diffs_lists_match_by_identifier() -> None:
+    assert list(
+        iter_state_diffs(
+            {
+                "data": [
+                    {IDENTIFIER_FIELD_NAME: "a", "value": 1},
+                    {IDENTIFIER_FIELD_NAME: "b", "value": 1},
+                ]
+            },
+            {
+                "data": [
+                    {IDENTIFIER_FIELD_NAME: "b", "value": 2},
+                    {IDENTIFIER_FIELD_NAME: "c", "value": 1},
+                ]
+            },
+        )
+    ) == [
+        StateDiff(DiffType.REMOVED, ("data", 0), None),
+        StateDiff(DiffType.CHANGED, ("data", 1, "value"), ("data", 0, "value")),
+        StateDiff(DiffType.ADDED, None, ("data", 1)),
+    ]
 
-def test_extract_diffs_with_recursion_issue() -> None:
-    """
-    test if a max recursion issue is caught properly
-    """
-    with pytest.raises(DiffDetectionFailureError):
-        extract_diffs_with_timeout(
-            diff_extration_with_endless_recursion,
-            previous_desired_state={},
-            current_desired_state={},
-            timeout_seconds=100,
+
+def test_iter_state_diffs_lists_ignore_order() -> None:
+    assert not list(
+        iter_state_diffs(
+            {"data": [{"name": "a"}, {"name": "b"}, 1]},
+            {"data": [1, {"name": "b"}, {"name": "a"}]},
         )
+    )
+    assert list(
+        iter_state_diffs(
+            {"data": [{"name": "a"}, {"name": "b", "value": 1}, 1]},
+            {"data": [2, {"name": "b", "value": 2}, {"name": "a"}]},
+        )
+    ) == [
+        StateDiff(DiffType.CHANGED, ("data", 1, "value"), ("data", 1, "value")),
+        StateDiff(DiffType.REMOVED, ("data", 2), None),
+        StateDiff(DiffType.ADDED, None, ("data", 0)),
+    ]
 
 
-def test_extract_diffs_with_exception() -> None:
-    """
-    test with exception
-    """
+def test_iter_state_diffs_deadline() -> None:
+    with pytest.raises(DiffDetectionTimeoutError):
+        list(iter_state_diffs({"a": 1}, {"a": 2}, deadline=time.monotonic() - 1))
+
+
+def test_iter_state_diffs_recursion_issue() -> None:
+    previous: dict[str, Any] = {}
+    current: dict[str, Any] = {}
+    for _ in range(10000):
+        previous = {"a": previous}
+        current = {"a": current}
     with pytest.raises(DiffDetectionFailureError):
-        extract_diffs_with_timeout(
-            diff_extration_with_exception,
-            previous_desired_state={},
-            current_desired_state={},
-            timeout_seconds=100,
-        )
+        list(iter_state_diffs(previous, current, hasher=StructuralHasher()))
 
 
 #
@@ -223,6 +212,66 @@ def test_extract_diffs_with_exception() -> None:
 #
 
 
+def test_find_changed_shards_stops_when_all_shards_are_affected() -> None:
+    state = {"data": [{"shard": "a", "value": 1}]}
+    consumed = []
+
+    def diffs() -> Any:
+        for i in range(3):
+            consumed.append(i)
+            yield StateDiff(
+                DiffType.CHANGED, ("data", 0, "value"), ("data", 0, "value")
+            )
+
+    assert find_changed_shards(
+        diffs=diffs(),
+        previous_desired_state=state,
+        current_desired_state=state,
+        sharding_config=DesiredStateShardConfig(
+            shard_arg_name="shard",
+            shard_path_selectors={"data[*].shard"},
+            sharded_run_review=lambda x: True,
+        ),
+    ) == {"a"}
+    assert consumed == [0]
+
+
+def test_find_changed_shards_large_desired_state() -> None:
+    """
+    a desired state of realistic size, e.g. all namespaces of app-interface
+    with their resources, must be diffed within the timeout. otherwise no
+    shards would be detected.
+    """
+
+    def state(value: str) -> dict[str, Any]:
+        return {
+            "namespaces": [
+                {
+                    IDENTIFIER_FIELD_NAME: f"ns-{i}",
+                    "name": f"ns-{i}",
+                    "cluster": {"name": f"cluster-{i % 50}"},
+                    "resources": [
+                        {"path": f"/resource-{j}.yaml", "labels": {"app": f"{j}"}}
+                        for j in range(20)
+                    ],
+                    "value": value if i == 4242 else "unchanged",
+                }
+                for i in range(5000)
+            ]
+        }
+
+    diff = build_desired_state_diff(
+        sharding_config=DesiredStateShardConfig(
+            shard_arg_name="cluster",
+            shard_path_selectors={"namespaces[*].cluster.name"},
+            sharded_run_review=lambda x: True,
+        ),
+        previous_desired_state=state("old"),
+        current_desired_state=state("new"),
+    )
+    assert diff.affected_shards == {"cluster-42"}
+
+
 def test_config_removed_from_shard() -> None:
     """
     when something is removed from a shard, that shard is affected
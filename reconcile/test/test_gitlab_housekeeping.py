@@ -1420,6 +1420,93 @@ def test_error_labels_visible_in_queue(
     assert results[0]["error"] is True
 
 
+def test_preprocess_merge_requests_fetches_facts_concurrently(
+    state: Mock,
+    project: Project,
+    add_lgtm_merge_request_resource_label_event: ProjectMergeRequestResourceLabelEvent,
+) -> None:
+    def merge_request(iid: int, labels: list[str]) -> Mock:
+        mr = create_autospec(ProjectMergeRequest)
+        mr.merge_status = "can_be_merged"
+        mr.draft = False
+        mr.commits.return_value = [create_autospec(ProjectCommit)]
+        mr.labels = labels
+        mr.iid = iid
+        return mr
+
+    merge_requests = [merge_request(iid, ["lgtm"]) for iid in range(1, 21)]
+    unlabeled = merge_request(21, [])
+    draft = merge_request(22, ["lgtm"])
+    draft.draft = True
+
+    mocked_gl = create_autospec(GitLabApi)
+    mocked_gl.project = project
+    mocked_gl.get_merge_request_label_events.return_value = [
+        add_lgtm_merge_request_resource_label_event
+    ]
+
+    results = gl_h.preprocess_merge_requests(
+        dry_run=False,
+        gl=mocked_gl,
+        project_merge_requests=[*merge_requests, unlabeled, draft],
+        state=state,
+        thread_pool_size=4,
+    )
+
+    assert [r["mr"] for r in results] == merge_requests
+    assert mocked_gl.get_merge_request_label_events.call_count == 20
+    draft.commits.assert_not_called()
+
+
+def test_merge_merge_requests_fetches_facts_of_reached_merge_requests(
+    state: Mock,
+    project: Project,
+    add_lgtm_merge_request_resource_label_event: ProjectMergeRequestResourceLabelEvent,
+    success_merge_request_pipeline: ProjectMergeRequestPipeline,
+    mocker: MockerFixture,
+) -> None:
+    def merge_request(iid: int) -> Mock:
+        mr = create_autospec(ProjectMergeRequest)
+        mr.merge_status = "can_be_merged"
+        mr.draft = False
+        mr.commits.return_value = [create_autospec(ProjectCommit)]
+        mr.labels = ["lgtm"]
+        mr.iid = iid
+        mr.target_project_id = 3
+        mr.squash = False
+        mr.author = {"username": "user"}
+        return mr
+
+    merge_requests = [merge_request(iid) for iid in range(1, 21)]
+    mocker.patch("reconcile.gitlab_housekeeping.is_rebased", return_value=True)
+    mocker.patch("reconcile.gitlab_housekeeping.get_omm_group_lead", return_value=None)
+    mocked_gl = create_autospec(GitLabApi)
+    project.squash_option = "never"
+    mocked_gl.project = project
+    mocked_gl.get_merge_request_label_events.return_value = [
+        add_lgtm_merge_request_resource_label_event
+    ]
+    mocked_gl.get_merge_request_pipelines.return_value = [
+        success_merge_request_pipeline
+    ]
+
+    gl_h.merge_merge_requests(
+        dry_run=False,
+        gl=mocked_gl,
+        project_merge_requests=[*merge_requests],
+        reload_toggle=gl_h.ReloadToggle(reload=False),
+        merge_limit=2,
+        rebase=True,
+        app_sre_usernames=set(),
+        state=state,
+        thread_pool_size=4,
+    )
+
+    merge_requests[0].merge.assert_called_once()
+    # only the first batch is fetched, the loop stops after the first merge
+    assert mocked_gl.get_merge_request_pipelines.call_count == 4
+
+
 class TestMergeErrorCycleEndToEnd:
     """End-to-end test for the silent merge-error label flow.
 
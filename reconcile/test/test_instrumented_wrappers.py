@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import io
 from typing import TYPE_CHECKING
 from unittest.mock import create_autospec
 
 from prometheus_client import Counter
-from requests import Session
+from requests import PreparedRequest, Request, Response, Session
 from sretoolbox.container import (
     Image,
     Skopeo,
 )
 
 from reconcile.utils.instrumented_wrappers import (
+    CachedResponse,
+    ConditionalRequestSession,
+    ConditionalResponseCache,
     InstrumentedImage,
     InstrumentedSession,
     InstrumentedSkopeo,
@@ -80,3 +84,95 @@ def test_instrumented_session(mocker: MockerFixture) -> None:
         params={"k", "v"},
     )
     counter.inc.assert_called_once_with()
+
+
+def _response(status_code: int, content: bytes = b"", **headers: str) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.raw = io.BytesIO()
+    response.headers.update(headers)
+    return response
+
+
+def _get(session: Session, url: str = "https://gitlab.example.com/mrs") -> Response:
+    return session.send(Request("GET", url).prepare())
+
+
+def test_conditional_request_session_revalidates(mocker: MockerFixture) -> None:
+    mocked_send = mocker.patch.object(
+        Session,
+        "send",
+        side_effect=[
+            _response(200, b"[1]", ETag='W/"1"', Link="next"),
+            _response(304),
+        ],
+    )
+    cache = ConditionalResponseCache()
+    result_counter = create_autospec(Counter)
+    session = ConditionalRequestSession(
+        create_autospec(Counter), cache=cache, result_counter=result_counter
+    )
+
+    first = _get(session)
+    second = _get(session)
+
+    assert first.content == second.content == b"[1]"
+    assert second.status_code == 200
+    assert second.headers["Link"] == "next"
+    revalidation: PreparedRequest = mocked_send.call_args_list[1].args[0]
+    assert revalidation.headers["If-None-Match"] == 'W/"1"'
+    assert (cache.hits, cache.misses, cache.hit_ratio) == (1, 1, 0.5)
+    result_counter.labels.assert_any_call(integration="", result="miss")
+    result_counter.labels.assert_any_call(integration="", result="hit")
+
+
+def test_conditional_request_session_refreshes_changed(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        Session,
+        "send",
+        side_effect=[
+            _response(200, b"[1]", ETag='"1"'),
+            _response(200, b"[2]", ETag='"2"'),
+        ],
+    )
+    cache = ConditionalResponseCache()
+    session = ConditionalRequestSession(create_autospec(Counter), cache=cache)
+
+    _get(session)
+
+    assert _get(session).content == b"[2]"
+    cached = cache.get("https://gitlab.example.com/mrs")
+    assert cached
+    assert cached.etag == '"2"'
+
+
+def test_conditional_request_session_skips_non_cacheable(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(
+        Session, "send", side_effect=[_response(200, b"x"), _response(201, b"y")]
+    )
+    cache = ConditionalResponseCache()
+    session = ConditionalRequestSession(create_autospec(Counter), cache=cache)
+
+    _get(session)
+    session.send(Request("POST", "https://gitlab.example.com/mrs").prepare())
+
+    assert len(cache) == 0
+    assert cache.hits == cache.misses == 0
+
+
+def test_conditional_response_cache_evicts_least_recently_used() -> None:
+    cache = ConditionalResponseCache(max_entries=2)
+    entry = CachedResponse(
+        etag='"1"', last_modified=None, headers={}, content=b"", encoding=None
+    )
+    cache.put("a", entry)
+    cache.put("b", entry)
+    cache.get("a")
+    cache.put("c", entry)
+
+    assert cache.get("a")
+    assert not cache.get("b")
+    assert cache.get("c")
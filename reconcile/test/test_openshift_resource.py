@@ -1,4 +1,5 @@
 import pytest
+from pytest_mock import MockerFixture
 
 from reconcile.utils.openshift_resource import (
     ConstructResourceError,
@@ -188,6 +189,33 @@ def test_sha256sum() -> None:
     assert not annotated.has_valid_sha256sum()
 
 
+def test_sha256sum_memoized(mocker: MockerFixture) -> None:
+    resource = fxt.get_anymarkup("sha256sum.yml")
+    openshift_resource = OR(resource, TEST_INT, TEST_INT_VER)
+    canonicalize = mocker.spy(OR, "canonicalize")
+
+    sha256sum = openshift_resource.sha256sum()
+    assert openshift_resource.sha256sum() == sha256sum
+    assert openshift_resource.annotate().sha256sum() == sha256sum
+    assert canonicalize.call_count == 1
+
+
+def test_sha256sum_invalidated() -> None:
+    resource = fxt.get_anymarkup("sha256sum.yml")
+    openshift_resource = OR(resource, TEST_INT, TEST_INT_VER)
+    sha256sum = openshift_resource.sha256sum()
+
+    openshift_resource.body["metadata"]["labels"] = {"new": "label"}
+    assert openshift_resource.sha256sum() == sha256sum
+    openshift_resource.invalidate_cache()
+    assert openshift_resource.sha256sum() != sha256sum
+
+    openshift_resource.body = resource | {"metadata": {"name": "other"}}
+    assert openshift_resource.sha256sum() == OR.calculate_sha256sum(
+        OR.serialize(OR.canonicalize(openshift_resource.body))
+    )
+
+
 def test_has_owner_reference_true() -> None:
     resource = {
         "kind": "kind",
@@ -440,3 +468,39 @@ def test_resource_inventory_add_desired_resource_mixed_kinds() -> None:
             assert resource["desired"].get("foo")
         elif resource_type == "Deployment":
             assert len(resource["desired"]) == 0
+
+
+def test_resource_inventory_add_current_compacts_resource() -> None:
+    ri = ResourceInventory()
+    ri.initialize_resource_type(
+        cluster="cl", namespace="ns", resource_type="Deployment"
+    )
+    res = build_resource("Deployment", "apps/v1", "foo")
+    body = res.body
+    body["status"] = {"replicas": 1}
+    body["metadata"]["managedFields"] = [{"manager": "kubectl"}]
+    ri.add_current("cl", "ns", "Deployment", "foo", res)
+
+    current = ri.get_current("cl", "ns", "Deployment", "foo")
+    assert current is not None
+    assert current.body == {
+        "kind": "Deployment",
+        "apiVersion": "apps/v1",
+        "metadata": {"name": "foo"},
+        "status": {"replicas": 1},
+    }
+    # the caller's body is not modified
+    assert body["metadata"]["managedFields"] == [{"manager": "kubectl"}]
+
+
+def test_resource_inventory_add_current_keeps_desired_status_equal() -> None:
+    ri = ResourceInventory()
+    ri.initialize_resource_type(cluster="cl", namespace="ns", resource_type="Service")
+    desired = build_resource("Service", "v1", "foo")
+    desired.body["status"] = {"loadBalancer": {"ingress": [{"ip": "10.0.0.1"}]}}
+    current = build_resource("Service", "v1", "foo")
+    current.body["status"] = {"loadBalancer": {"ingress": [{"ip": "10.0.0.1"}]}}
+    current.body["metadata"]["managedFields"] = [{"manager": "kubectl"}]
+    ri.add_current("cl", "ns", "Service", "foo", current)
+
+    assert desired == ri.get_current("cl", "ns", "Service", "foo")
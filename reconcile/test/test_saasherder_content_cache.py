@@ -0,0 +1,304 @@
+"""
+Unit tests for the commit sha keyed content cache of SaasHerder
+"""
+
+import io
+import os
+import tarfile
+import threading
+import time
+from pathlib import Path
+from typing import IO
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_httpserver import HTTPServer
+from pytest_mock import MockerFixture
+
+from reconcile.utils.saasherder.content_cache import (
+    ArchiveMissError,
+    RepoArchiveCache,
+    RepoContentCache,
+)
+from reconcile.utils.saasherder.saasherder import GithubRepositoryApi, SaasHerder
+
+URL = "https://github.com/test/repo"
+SHA = "a" * 40
+KEY = ("file", URL, "/template.yaml", SHA)
+
+
+def test_content_cache_fetches_once() -> None:
+    cache = RepoContentCache()
+    fetch = MagicMock(return_value=[b"content"])
+
+    assert cache.get(KEY, fetch) == [b"content"]
+    assert cache.get(KEY, fetch) == [b"content"]
+    fetch.assert_called_once()
+
+
+def test_content_cache_deduplicates_inflight_requests() -> None:
+    cache = RepoContentCache()
+    calls = []
+
+    def fetch() -> list[bytes]:
+        calls.append(1)
+        time.sleep(0.1)
+        return [b"content"]
+
+    threads = [threading.Thread(target=cache.get, args=(KEY, fetch)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+
+
+def test_content_cache_failed_fetch_is_not_cached() -> None:
+    cache = RepoContentCache()
+    fetch = MagicMock(side_effect=[Exception("rate limited"), [b"content"]])
+
+    with pytest.raises(Exception, match="rate limited"):
+        cache.get(KEY, fetch)
+    assert cache.get(KEY, fetch) == [b"content"]
+
+
+def test_content_cache_on_disk(tmp_path: Path) -> None:
+    fetch = MagicMock(return_value=[b"a", b"b"])
+
+    assert RepoContentCache(str(tmp_path)).get(KEY, fetch) == [b"a", b"b"]
+    assert RepoContentCache(str(tmp_path)).get(KEY, fetch) == [b"a", b"b"]
+    fetch.assert_called_once()
+
+
+def test_content_cache_corrupt_file(tmp_path: Path) -> None:
+    cache = RepoContentCache(str(tmp_path))
+    cache.get(KEY, lambda: [b"content"])
+    for f in tmp_path.iterdir():
+        f.write_text("not json")
+
+    assert RepoContentCache(str(tmp_path)).get(KEY, lambda: [b"new"]) == [b"new"]
+
+
+def build_saasherder() -> SaasHerder:
+    return SaasHerder(
+        [MagicMock(), MagicMock()],
+        secret_reader=MagicMock(),
+        thread_pool_size=1,
+        integration="",
+        integration_version="",
+        hash_length=7,
+        repo_url="https://repo-url.com",
+    )
+
+
+def test_get_file_contents_uses_content_cache(mocker: MockerFixture) -> None:
+    saasherder = build_saasherder()
+    mocker.patch.object(saasherder, "_get_commit_sha", return_value=SHA)
+    get_raw_file = mocker.patch.object(
+        GithubRepositoryApi, "get_raw_file", return_value=b"kind: Template"
+    )
+    github = MagicMock()
+
+    for _ in range(2):
+        template, commit_sha = saasherder._get_file_contents(
+            url=URL, path="/template.yaml", ref="main", github=github
+        )
+        assert template == {"kind": "Template"}
+        assert commit_sha == SHA
+
+    get_raw_file.assert_called_once_with(
+        repo=github.get_repo.return_value, path="/template.yaml", ref=SHA
+    )
+
+
+def build_archive(
+    files: dict[str, bytes], links: dict[str, str] | None = None
+) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, target in (links or {}).items():
+            info = tarfile.TarInfo(f"test-repo-{SHA}/{name}")
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tar.addfile(info)
+        for name, content in files.items():
+            info = tarfile.TarInfo(f"test-repo-{SHA}/{name}")
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+ARCHIVE = build_archive({
+    "template.yaml": b"kind: Template",
+    "dir/a.yaml": b"kind: A",
+    "dir/b.yaml": b"kind: B",
+    "nested/c.yaml": b"kind: C",
+    "nested/sub/d.yaml": b"kind: D",
+})
+
+
+def write_archive(f: IO[bytes]) -> None:
+    f.write(ARCHIVE)
+
+
+def test_archive_cache_downloads_once(tmp_path: Path) -> None:
+    cache = RepoArchiveCache(str(tmp_path))
+    download = MagicMock(side_effect=write_archive)
+
+    root = cache.get(URL, SHA, download)
+    assert root
+    assert cache.get(URL, SHA, download) == root
+    download.assert_called_once()
+
+    assert cache.read_file(root, "/template.yaml") == b"kind: Template"
+    assert cache.read_directory(root, "/dir", recursive=False) == [
+        b"kind: A",
+        b"kind: B",
+    ]
+    assert cache.read_directory(root, "/nested", recursive=True) == [
+        b"kind: C",
+        b"kind: D",
+    ]
+    with pytest.raises(IsADirectoryError):
+        cache.read_directory(root, "/nested", recursive=False)
+    with pytest.raises(ValueError):
+        cache.read_file(root, "../../etc/passwd")
+    with pytest.raises(ArchiveMissError):
+        cache.read_file(root, "/missing.yaml")
+    with pytest.raises(ArchiveMissError):
+        cache.read_directory(root, "/missing", recursive=False)
+
+
+def test_archive_cache_resolves_links(tmp_path: Path) -> None:
+    archive = build_archive(
+        {"templates/t.yaml": b"kind: Template", "dir/a.yaml": b"kind: A"},
+        links={
+            "template.yaml": "templates/t.yaml",
+            "link-to-link.yaml": "template.yaml",
+            "linked-dir": "dir",
+            "outside.yaml": "../../etc/passwd",
+            "missing.yaml": "templates/missing.yaml",
+        },
+    )
+
+    def download(f: IO[bytes]) -> None:
+        f.write(archive)
+
+    cache = RepoArchiveCache(str(tmp_path))
+    root = cache.get(URL, SHA, download)
+    assert root
+
+    assert cache.read_file(root, "/template.yaml") == b"kind: Template"
+    assert cache.read_file(root, "/link-to-link.yaml") == b"kind: Template"
+    assert cache.read_directory(root, "/linked-dir", recursive=False) == [b"kind: A"]
+    with pytest.raises(ArchiveMissError):
+        cache.read_file(root, "/outside.yaml")
+    with pytest.raises(ArchiveMissError):
+        cache.read_file(root, "/missing.yaml")
+
+
+def test_archive_cache_prunes_unused_archives(tmp_path: Path) -> None:
+    root = RepoArchiveCache(str(tmp_path)).get(URL, SHA, write_archive)
+    assert root
+    old = Path(root).stat().st_mtime - 2 * 3600
+    os.utime(root, (old, old))
+
+    RepoArchiveCache(str(tmp_path), max_age=3600)
+    assert list(tmp_path.iterdir()) == []
+
+    download = MagicMock(side_effect=write_archive)
+    assert RepoArchiveCache(str(tmp_path), max_age=3600).get(URL, SHA, download)
+    download.assert_called_once()
+
+
+def test_archive_cache_marks_reused_archives(tmp_path: Path) -> None:
+    root = RepoArchiveCache(str(tmp_path)).get(URL, SHA, write_archive)
+    assert root
+    old = Path(root).stat().st_mtime - 2 * 3600
+    os.utime(root, (old, old))
+
+    assert RepoArchiveCache(str(tmp_path)).get(URL, SHA, MagicMock()) == root
+    RepoArchiveCache(str(tmp_path), max_age=3600)
+    assert Path(root).is_dir()
+
+
+def test_archive_cache_reuses_extracted_archive(tmp_path: Path) -> None:
+    RepoArchiveCache(str(tmp_path)).get(URL, SHA, write_archive)
+    download = MagicMock()
+
+    assert RepoArchiveCache(str(tmp_path)).get(URL, SHA, download)
+    download.assert_not_called()
+
+
+def test_archive_cache_download_failure(tmp_path: Path) -> None:
+    cache = RepoArchiveCache(str(tmp_path))
+    download = MagicMock(side_effect=Exception("not found"))
+
+    assert cache.get(URL, SHA, download) is None
+    assert cache.get(URL, SHA, download) is None
+    download.assert_called_once()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_archive_cache_rejects_unsafe_paths(tmp_path: Path) -> None:
+    archive = build_archive({"../../evil.yaml": b"evil"})
+
+    def download(f: IO[bytes]) -> None:
+        f.write(archive)
+
+    assert RepoArchiveCache(str(tmp_path)).get(URL, SHA, download) is None
+    assert not (tmp_path.parent / "evil.yaml").exists()
+
+
+def test_archive_fetch_mode(
+    monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture, httpserver: HTTPServer
+) -> None:
+    monkeypatch.setenv("SAASHERDER_ARCHIVE_FETCH", "true")
+    httpserver.expect_oneshot_request("/tarball").respond_with_data(ARCHIVE)
+    saasherder = build_saasherder()
+    mocker.patch.object(saasherder, "_get_commit_sha", return_value=SHA)
+    get_raw_file = mocker.patch.object(GithubRepositoryApi, "get_raw_file")
+    github = MagicMock()
+    github.get_repo.return_value.get_archive_link.return_value = httpserver.url_for(
+        "/tarball"
+    )
+
+    template, _ = saasherder._get_file_contents(
+        url=URL, path="/template.yaml", ref="main", github=github
+    )
+    resources, _ = saasherder._get_directory_contents(
+        url=URL, path="/dir", ref="main", github=github
+    )
+    assert template == {"kind": "Template"}
+    assert resources == [{"kind": "A"}, {"kind": "B"}]
+    get_raw_file.assert_not_called()
+    assert saasherder._archive_tmp_dir
+
+    saasherder.cleanup()
+    assert not Path(saasherder._archive_tmp_dir).exists()
+
+
+def test_archive_fetch_mode_missing_file(
+    monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture, httpserver: HTTPServer
+) -> None:
+    monkeypatch.setenv("SAASHERDER_ARCHIVE_FETCH", "true")
+    httpserver.expect_oneshot_request("/tarball").respond_with_data(ARCHIVE)
+    saasherder = build_saasherder()
+    mocker.patch.object(saasherder, "_get_commit_sha", return_value=SHA)
+    get_raw_file = mocker.patch.object(
+        GithubRepositoryApi, "get_raw_file", return_value=b"kind: Other"
+    )
+    github = MagicMock()
+    github.get_repo.return_value.get_archive_link.return_value = httpserver.url_for(
+        "/tarball"
+    )
+
+    template, _ = saasherder._get_file_contents(
+        url=URL, path="/other.yaml", ref="main", github=github
+    )
+    assert template == {"kind": "Other"}
+    get_raw_file.assert_called_once_with(
+        repo=github.get_repo.return_value, path="/other.yaml", ref=SHA
+    )
+    saasherder.cleanup()
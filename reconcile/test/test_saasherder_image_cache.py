@@ -0,0 +1,141 @@
+"""
+Unit tests for the resolved image digest cache of SaasHerder
+"""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from reconcile.utils.saasherder import image_cache
+from reconcile.utils.saasherder.image_cache import (
+    ImageDigestCache,
+    ResolvedImage,
+)
+from reconcile.utils.saasherder.models import ImageAuth
+from reconcile.utils.saasherder.saasherder import SaasHerder
+
+IMAGE = "quay.io/app-sre/test:abcdef0"
+DIGEST = "sha256:" + "a" * 64
+PINNED_IMAGE = f"quay.io/app-sre/test@{DIGEST}"
+RESOLVED = ResolvedImage(url=IMAGE, registry_path="quay.io/app-sre/test", digest=DIGEST)
+
+
+@pytest.fixture(autouse=True)
+def reset_image_digest_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(image_cache, "_image_digest_cache", None)
+
+
+def test_resolved_image_url_digest() -> None:
+    assert RESOLVED.url_digest == PINNED_IMAGE
+    with pytest.raises(ValueError):
+        _ = ResolvedImage(url=IMAGE, registry_path="", digest=None).url_digest
+
+
+def test_image_cache_resolves_once() -> None:
+    cache = ImageDigestCache()
+    resolve = MagicMock(return_value=RESOLVED)
+
+    assert cache.get(IMAGE, "user", resolve) == RESOLVED
+    assert cache.get(IMAGE, "user", resolve) == RESOLVED
+    resolve.assert_called_once()
+    # other credentials
+    cache.get(IMAGE, "other", resolve)
+    assert resolve.call_count == 2
+
+
+def test_image_cache_does_not_cache_missing_images() -> None:
+    cache = ImageDigestCache()
+    resolve = MagicMock(side_effect=[None, RESOLVED])
+
+    assert cache.get(IMAGE, "", resolve) is None
+    assert cache.get(IMAGE, "", resolve) == RESOLVED
+
+
+def test_image_cache_tag_ttl() -> None:
+    cache = ImageDigestCache(tag_ttl=-1)
+    resolve = MagicMock(return_value=RESOLVED)
+
+    cache.get(IMAGE, "", resolve)
+    cache.get(IMAGE, "", resolve)
+    assert resolve.call_count == 2
+    # digest pinned images never expire
+    cache.get(PINNED_IMAGE, "", resolve)
+    cache.get(PINNED_IMAGE, "", resolve)
+    assert resolve.call_count == 3
+
+
+def test_image_cache_drops_expired_entries() -> None:
+    cache = ImageDigestCache(tag_ttl=-1)
+
+    cache.get(IMAGE, "", lambda: RESOLVED)
+    cache.get(IMAGE, "", lambda: None)
+    assert not cache._images
+    assert not cache._locks
+
+
+def test_image_cache_max_size() -> None:
+    cache = ImageDigestCache(max_size=2)
+    resolve = MagicMock(return_value=RESOLVED)
+
+    cache.get(IMAGE, "a", resolve)
+    cache.get(IMAGE, "b", resolve)
+    # the least recently used entry is evicted
+    cache.get(IMAGE, "a", resolve)
+    cache.get(IMAGE, "c", resolve)
+    assert list(cache._images) == [(IMAGE, "a"), (IMAGE, "c")]
+    assert resolve.call_count == 3
+
+
+def test_image_cache_coalesces_concurrent_lookups() -> None:
+    cache = ImageDigestCache()
+    calls = []
+
+    def resolve() -> ResolvedImage:
+        calls.append(1)
+        time.sleep(0.1)
+        return RESOLVED
+
+    threads = [
+        threading.Thread(target=cache.get, args=(IMAGE, "", resolve)) for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert not cache._locks
+
+
+def test_image_cache_persistent(tmp_path: Path) -> None:
+    path = str(tmp_path / "images.db")
+    resolve = MagicMock(return_value=RESOLVED)
+
+    for _ in range(2):
+        assert ImageDigestCache(path=path).get(IMAGE, "", resolve) == RESOLVED
+        assert ImageDigestCache(path=path).get(PINNED_IMAGE, "", resolve)
+    assert resolve.call_count == 2
+
+
+def test_get_image_uses_cache(mocker: MockerFixture) -> None:
+    image = mocker.patch("reconcile.utils.saasherder.saasherder.Image")
+    image.return_value.registry = "quay.io"
+    image.return_value.repository = "app-sre"
+    image.return_value.image = "test"
+    image.return_value.digest = DIGEST
+
+    for _ in range(2):
+        img = SaasHerder._get_image(
+            image=IMAGE,
+            image_patterns=["quay.io/app-sre"],
+            image_auth=ImageAuth(username="user", password="pass"),
+            error_prefix="",
+        )
+        assert img
+        assert img.url_digest == PINNED_IMAGE
+
+    image.assert_called_once()
@@ -18,6 +18,7 @@ from reconcile.utils.gql import (
     GqlApiErrorForbiddenSchemaError,
     GqlApiIntegrationNotFoundError,
     PersistentRequestsHTTPTransport,
+    parse_query,
 )
 
 TEST_QUERY = """
@@ -203,3 +204,73 @@ def test_gqlapi_query_full_stack_transport_error(httpserver: HTTPServer) -> None
     )
     with pytest.raises(GqlApiError, match="error.*returned with GraphQL response"):
         gql_api.query.__wrapped__(gql_api, SIMPLE_QUERY)  # type: ignore[attr-defined]
+
+
+def test_parse_query_cached() -> None:
+    query = "query User($id: ID!) { user(id: $id) { name } }"
+    parsed = parse_query(query)
+    assert parsed is parse_query(query)
+    assert parsed.operation_name == "User"
+    assert parse_query(SIMPLE_QUERY).operation_name == "anonymous"
+
+
+def test_gqlapi_query_invalid(httpserver: HTTPServer) -> None:
+    gql_api = GqlApi(httpserver.url_for("/graphql"), validate_schemas=False)
+    with pytest.raises(GqlApiError, match="Invalid GraphQL query"):
+        gql_api.query.__wrapped__(gql_api, "{ user(")  # type: ignore[attr-defined]
+
+
+def test_gqlapi_query_persisted(httpserver: HTTPServer) -> None:
+    query = "query User($id: ID!) { user(id: $id) { name } }"
+    sha256 = parse_query(query).sha256
+    httpserver.expect_ordered_request(
+        "/graphql",
+        method="POST",
+        json={
+            "extensions": {"persistedQuery": {"version": 1, "sha256Hash": sha256}},
+            "variables": {"id": "1"},
+        },
+    ).respond_with_json({"errors": [{"message": "PersistedQueryNotFound"}]})
+    httpserver.expect_ordered_request(
+        "/graphql",
+        method="POST",
+        json={
+            "extensions": {"persistedQuery": {"version": 1, "sha256Hash": sha256}},
+            "variables": {"id": "1"},
+            "query": query,
+        },
+    ).respond_with_json({"data": {"user": {"name": "test-user"}}})
+    httpserver.expect_ordered_request(
+        "/graphql",
+        method="POST",
+        json={
+            "extensions": {"persistedQuery": {"version": 1, "sha256Hash": sha256}},
+            "variables": {"id": "2"},
+        },
+    ).respond_with_json({"data": {"user": {"name": "other-user"}}})
+    gql_api = GqlApi(
+        httpserver.url_for("/graphql"),
+        token="Basic test-token",
+        validate_schemas=False,
+        persisted_queries=True,
+    )
+
+    result = gql_api.query.__wrapped__(gql_api, query, variables={"id": "1"})  # type: ignore[attr-defined]
+    assert result["user"]["name"] == "test-user"
+    result = gql_api.query.__wrapped__(gql_api, query, variables={"id": "2"})  # type: ignore[attr-defined]
+    assert result["user"]["name"] == "other-user"
+    httpserver.check_assertions()
+    assert httpserver.log[0][0].headers["Authorization"] == "Basic test-token"
+
+
+def test_gqlapi_query_persisted_error(httpserver: HTTPServer) -> None:
+    httpserver.expect_request("/graphql", method="POST").respond_with_json({
+        "errors": [{"message": "Something went wrong"}]
+    })
+    gql_api = GqlApi(
+        httpserver.url_for("/graphql"),
+        validate_schemas=False,
+        persisted_queries=True,
+    )
+    with pytest.raises(GqlApiError, match="error.*returned with GraphQL response"):
+        gql_api.query.__wrapped__(gql_api, SIMPLE_QUERY)  # type: ignore[attr-defined]
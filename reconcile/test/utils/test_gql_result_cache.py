@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from reconcile.utils.gql import GqlApi
+from reconcile.utils.gql_result_cache import (
+    GqlResultCache,
+    bundle_sha_from_url,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_httpserver import HTTPServer
+
+QUERY = "{ __typename }"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> GqlResultCache:
+    return GqlResultCache(str(tmp_path / "gql.db"), max_bytes=100)
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("http://localhost/graphqlsha/abc123", "abc123"),
+        ("http://localhost/graphqlsha/abc123/", "abc123"),
+        ("http://localhost/graphql", None),
+    ],
+)
+def test_bundle_sha_from_url(url: str, expected: str | None) -> None:
+    assert bundle_sha_from_url(url) == expected
+
+
+def test_cache_key() -> None:
+    key = GqlResultCache.key("sha", QUERY, {"b": 1, "a": 2})
+    assert key == GqlResultCache.key("sha", QUERY, {"a": 2, "b": 1})
+    assert key != GqlResultCache.key("other", QUERY, {"a": 2, "b": 1})
+    assert key != GqlResultCache.key("sha", QUERY, None)
+
+
+def test_cache_get_set(cache: GqlResultCache) -> None:
+    assert cache.get("key") is None
+    cache.set("key", {"data": {"a": 1}})
+    assert cache.get("key") == {"data": {"a": 1}}
+
+
+def test_cache_evicts_least_recently_used(cache: GqlResultCache) -> None:
+    value = {"data": "x" * 30}
+    cache.set("a", value)
+    cache.set("b", value)
+    cache.get("a")
+    cache.set("c", value)
+
+    assert cache.get("a") == value
+    assert cache.get("b") is None
+    assert cache.get("c") == value
+
+
+def test_cache_skips_too_large_values(cache: GqlResultCache) -> None:
+    cache.set("key", {"data": "x" * 200})
+    assert cache.get("key") is None
+
+
+def test_gqlapi_uses_result_cache(
+    httpserver: HTTPServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GQL_RESULT_CACHE_PATH", str(tmp_path / "gql.db"))
+    httpserver.expect_oneshot_request(
+        "/graphqlsha/abc", method="POST"
+    ).respond_with_json({"data": {"__typename": "Query"}})
+
+    for _ in range(2):
+        gql_api = GqlApi(httpserver.url_for("/graphqlsha/abc"), validate_schemas=False)
+        result = gql_api.query.__wrapped__(gql_api, QUERY)  # type: ignore[attr-defined]
+        assert result == {"__typename": "Query"}
+        gql_api.close()
+
+    assert len(httpserver.log) == 1
+
+
+def test_gqlapi_no_result_cache_without_sha(
+    httpserver: HTTPServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GQL_RESULT_CACHE_PATH", str(tmp_path / "gql.db"))
+    gql_api = GqlApi(httpserver.url_for("/graphql"), validate_schemas=False)
+    assert gql_api.result_cache is None
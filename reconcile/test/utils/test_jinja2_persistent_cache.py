@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+
+from reconcile.utils.jinja2 import utils
+from reconcile.utils.jinja2.persistent_cache import (
+    PersistentTemplateCache,
+    ttls_from_env,
+)
+from reconcile.utils.jinja2.utils import Jinja2TemplateCache, lookup_secret
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+SHA = "a" * 40
+
+
+@pytest.fixture
+def persistent(tmp_path: Path) -> PersistentTemplateCache:
+    return PersistentTemplateCache(
+        str(tmp_path / "jinja2.db"), ttls={"github": 3600, "s3": 3600, "vault": 3600}
+    )
+
+
+def test_ttls_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JINJA2_TEMPLATE_CACHE_TTL_VAULT", "60")
+    ttls = ttls_from_env()
+    assert ttls["vault"] == 60
+    assert ttls["s3"] == 300
+
+
+def test_persistent_get_set(persistent: PersistentTemplateCache) -> None:
+    assert persistent.get("s3", ("a", "b")) is None
+    persistent.set("s3", ("a", "b"), {"x": 1})
+    assert persistent.get("s3", ("a", "b")) == {"x": 1}
+    assert persistent.get("s3", ("a", "c")) is None
+
+
+def test_persistent_disabled_namespace(persistent: PersistentTemplateCache) -> None:
+    persistent.set("query", "key", "value")
+    assert persistent.get("query", "key") is None
+
+
+def test_persistent_expired(tmp_path: Path) -> None:
+    persistent = PersistentTemplateCache(str(tmp_path / "jinja2.db"), ttls={"s3": 1})
+    persistent.ttls["s3"] = -1
+    persistent.set("s3", "key", "value")
+    persistent.ttls["s3"] = 1
+    assert persistent.get("s3", "key") is None
+
+
+def test_template_cache_uses_persistent_tier(
+    persistent: PersistentTemplateCache,
+) -> None:
+    compute = MagicMock(return_value="content")
+    for _ in range(2):
+        cache = Jinja2TemplateCache(persistent=persistent)
+        assert cache.get_or_set(Jinja2TemplateCache.S3, ("a", "b"), compute) == (
+            "content"
+        )
+        assert cache.get_or_set(Jinja2TemplateCache.S3, ("a", "b"), compute) == (
+            "content"
+        )
+    compute.assert_called_once()
+
+
+def test_template_cache_persist_false(persistent: PersistentTemplateCache) -> None:
+    compute = MagicMock(return_value="content")
+    for _ in range(2):
+        cache = Jinja2TemplateCache(persistent=persistent)
+        cache.get_or_set(Jinja2TemplateCache.S3, "key", compute, persist=False)
+    assert compute.call_count == 2
+
+
+def test_lookup_secret_persists_pinned_versions_only(
+    persistent: PersistentTemplateCache,
+) -> None:
+    secret_reader = MagicMock()
+    secret_reader.read_all.return_value = {"key": "value"}
+    for _ in range(2):
+        cache = Jinja2TemplateCache(persistent=persistent)
+        for version in ("1", None):
+            assert (
+                lookup_secret(
+                    "path", "key", version, secret_reader=secret_reader, cache=cache
+                )
+                == "value"
+            )
+    # version 1 is read once, the latest version once per run
+    assert secret_reader.read_all.call_count == 3
+
+
+def test_github_file_content_by_sha(
+    persistent: PersistentTemplateCache, mocker: MockerFixture
+) -> None:
+    init_github = mocker.patch.object(utils, "init_github")
+    repo = init_github.return_value.get_repo.return_value
+    repo.get_commit.return_value.sha = SHA
+    get_raw_file = mocker.patch.object(
+        utils.GithubRepositoryApi, "get_raw_file", return_value=b"content"
+    )
+
+    for _ in range(2):
+        cache = Jinja2TemplateCache(persistent=persistent)
+        assert (
+            utils.lookup_github_file_content("org/repo", "file", "main", cache=cache)
+            == "content"
+        )
+
+    # the ref is resolved per run, the content is fetched once by sha
+    assert repo.get_commit.call_count == 2
+    get_raw_file.assert_called_once_with(repo=repo, path="file", ref=SHA)
+
+
+def test_github_file_content_without_persistent_tier(mocker: MockerFixture) -> None:
+    init_github = mocker.patch.object(utils, "init_github")
+    repo = init_github.return_value.get_repo.return_value
+    get_raw_file = mocker.patch.object(
+        utils.GithubRepositoryApi, "get_raw_file", return_value=b"content"
+    )
+
+    cache = Jinja2TemplateCache()
+    utils.lookup_github_file_content("org/repo", "file", "main", cache=cache)
+
+    repo.get_commit.assert_not_called()
+    get_raw_file.assert_called_once_with(repo=repo, path="file", ref="main")
@@ -1,3 +1,5 @@
+import hashlib
+import io
 import json
 from dataclasses import dataclass
 from datetime import date, datetime
@@ -9,7 +11,7 @@ from zoneinfo import ZoneInfo
 import pytest
 from pydantic import BaseModel, Field
 
-from reconcile.utils.json import json_dumps, pydantic_encoder
+from reconcile.utils.json import json_dump, json_dumps, pydantic_encoder
 
 
 def test_basic_serialization() -> None:
@@ -183,3 +185,23 @@ def test_pydantic_exclude(exclude: set[str] | None, expected: str) -> None:
     )
     result = json_dumps(data, compact=True, exclude=exclude)
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    ("compact", "indent"),
+    [(False, None), (True, None), (False, 2)],
+)
+def test_json_dump_matches_json_dumps(compact: bool, indent: int | None) -> None:
+    data = {"b": [{"y": 1, "x": None}] * 10_000, "a": "value"}
+    fp = io.StringIO()
+
+    digest = json_dump(data, fp, compact=compact, indent=indent)
+
+    expected = json_dumps(data, compact=compact, indent=indent)
+    assert fp.getvalue() == expected
+    assert digest == hashlib.sha256(expected.encode("utf-8")).hexdigest()
+
+
+def test_json_dump_digest_only() -> None:
+    data = {"b": "value", "a": 42}
+    assert json_dump(data) == hashlib.sha256(b'{"a": 42, "b": "value"}').hexdigest()
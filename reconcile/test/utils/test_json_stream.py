@@ -0,0 +1,87 @@
+import io
+import json
+from typing import Any
+
+import pytest
+
+from reconcile.utils.json_stream import JSONStreamReader
+
+DOCUMENT = {
+    "format_version": "1.2",
+    "planned_values": {"root_module": {"resources": [{"a": [1, 2, {"b": None}]}]}},
+    "escapes": 'quote " backslash \\ brackets ]}[{ unicode é \\"',
+    "numbers": [0, -1, 12345678901234567890, 1.5e-10, 3.25],
+    "literals": [True, False, None],
+    "resource_changes": [
+        {"address": f"aws_s3_bucket.b{i}", "change": {"actions": ["create"]}}
+        for i in range(20)
+    ],
+    "empty": [{}, [], ""],
+    "output_changes": {"o": {"after": "v"}},
+}
+
+
+def reader_for(
+    data: Any, read_size: int, indent: int | None = None
+) -> JSONStreamReader:
+    return JSONStreamReader(io.StringIO(json.dumps(data, indent=indent)), read_size)
+
+
+def read_all(reader: JSONStreamReader) -> Any:
+    """Rebuild the document only through the incremental API."""
+    match reader._peek():
+        case "{":
+            return {key: read_all(reader) for key in reader.object_items()}
+        case "[":
+            return [read_all(reader) for _ in reader.array_items()]
+        case _:
+            return reader.value()
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64, 65536])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_read_all(read_size: int, indent: int | None) -> None:
+    assert read_all(reader_for(DOCUMENT, read_size, indent)) == DOCUMENT
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 64])
+def test_skip_unconsumed_members(read_size: int) -> None:
+    reader = reader_for(DOCUMENT, read_size, indent=2)
+    addresses = []
+    output_changes = None
+    for key in reader.object_items():
+        if key == "resource_changes":
+            addresses = [reader.value()["address"] for _ in reader.array_items()]
+        elif key == "output_changes":
+            output_changes = reader.value()
+
+    assert addresses == [f"aws_s3_bucket.b{i}" for i in range(20)]
+    assert output_changes == {"o": {"after": "v"}}
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 64])
+def test_skip(read_size: int) -> None:
+    reader = reader_for([DOCUMENT, "s", 1, None, {"last": True}], read_size)
+    items = reader.array_items()
+    for _ in range(4):
+        next(items)
+        reader.skip()
+    next(items)
+    assert reader.value() == {"last": True}
+
+
+def test_memory_is_bounded_by_decoded_values() -> None:
+    large = {"skipped": ["x" * 1000] * 1000, "kept": [1, 2, 3]}
+    reader = reader_for(large, 4096)
+    for key in reader.object_items():
+        if key == "kept":
+            assert reader.value() == [1, 2, 3]
+    assert len(reader._buf) < 3 * 4096
+
+
+@pytest.mark.parametrize(
+    "document", ['{"a": 1', '{"a" 1}', '{"a": [1, 2}', "[1 2]", '{"a": "b'], ids=str
+)
+def test_invalid_documents(document: str) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        read_all(JSONStreamReader(io.StringIO(document), 2))
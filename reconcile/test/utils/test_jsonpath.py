@@ -13,7 +13,9 @@ from jsonpath_ng.ext.filter import (
 )
 
 from reconcile.utils.jsonpath import (
+    JSONPathTrie,
     apply_constraint_to_path,
+    jsonpath_key,
     jsonpath_parts,
     narrow_jsonpath_node,
     parse_jsonpath,
@@ -282,3 +284,59 @@ def test_remove_prefix_from_path(path: str, prefix: str, expected: str | None) -
 )
 def test_parse_jsonpath(path: str, rendered: str) -> None:
     assert str(parse_jsonpath(path)) == rendered
+
+
+#
+# T R I E
+#
+
+
+@pytest.mark.parametrize(
+    "path, key",
+    [
+        ("$", ()),
+        ("a.b", ("a", "b")),
+        ("a[1].b", ("a", 1, "b")),
+        ("a.[*].b", ("a", "[*]", "b")),
+    ],
+)
+def test_jsonpath_key(path: str, key: tuple) -> None:
+    assert jsonpath_key(parse(path)) == key
+
+
+def test_jsonpath_trie_at_or_under() -> None:
+    trie: JSONPathTrie[str] = JSONPathTrie()
+    trie.add(parse("spec.name"), "name")
+    trie.add(parse("spec.namespace"), "namespace")
+    trie.add(parse("spec.items[1].a"), "item-1")
+    trie.add(parse("spec.items[10]"), "item-10")
+
+    assert sorted(trie.at_or_under(parse("spec"))) == [
+        "item-1",
+        "item-10",
+        "name",
+        "namespace",
+    ]
+    assert list(trie.at_or_under(parse("spec.name"))) == ["name"]
+    assert list(trie.at_or_under(parse("spec.items[1]"))) == ["item-1"]
+    assert list(trie.at_or_under(parse("spec.other"))) == []
+    assert len(list(trie.at_or_under(parse("$")))) == 4
+
+
+def test_jsonpath_trie_above() -> None:
+    trie: JSONPathTrie[str] = JSONPathTrie()
+    trie.add(parse("$"), "root")
+    trie.add(parse("spec"), "spec")
+    trie.add(parse("spec.items[1]"), "item-1")
+
+    assert sorted(trie.above(parse("spec.items[1].a"))) == ["item-1", "root", "spec"]
+    assert sorted(trie.above(parse("spec.items[1]"))) == ["root", "spec"]
+    assert list(trie.above(parse("$"))) == []
+    assert sorted(trie.above(parse("spec.items[10]"))) == ["root", "spec"]
+
+
+def test_jsonpath_trie_bool() -> None:
+    trie: JSONPathTrie[int] = JSONPathTrie()
+    assert not trie
+    trie.add(parse("a"), 1)
+    assert trie
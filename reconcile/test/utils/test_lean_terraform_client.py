@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import os
+import subprocess
+import sys
 import tempfile
 from subprocess import CompletedProcess
 from typing import TYPE_CHECKING
 
+import pytest
+
 from reconcile.utils import lean_terraform_client
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest_mock import MockerFixture
 
 
@@ -174,6 +180,59 @@ def test_show_json(mocker: MockerFixture) -> None:
     )
 
 
+def fake_terraform_show(mocker: MockerFixture, script: str) -> None:
+    popen = subprocess.Popen
+    mocker.patch.object(
+        lean_terraform_client.subprocess,
+        "Popen",
+        side_effect=lambda args, **kwargs: popen(
+            [sys.executable, "-c", script], **kwargs
+        ),
+    )
+
+
+def test_show_json_stream(mocker: MockerFixture, tmp_path: Path) -> None:
+    # large enough to block terraform if the rest of the plan wasn't drained
+    fake_terraform_show(
+        mocker,
+        "import json; print(json.dumps("
+        "{'format_version': '1.2', 'configuration': ['x' * 1000] * 1000}))",
+    )
+
+    with lean_terraform_client.show_json_stream(str(tmp_path), "tfplan") as plan:
+        keys = plan.object_items()
+        assert next(keys) == "format_version"
+        assert plan.value() == "1.2"
+
+
+def test_show_json_stream_error(mocker: MockerFixture, tmp_path: Path) -> None:
+    fake_terraform_show(
+        mocker, "import sys; print('plan not found', file=sys.stderr); sys.exit(1)"
+    )
+
+    with (
+        pytest.raises(Exception, match=r"\[tfplan\] terraform show failed: plan"),
+        lean_terraform_client.show_json_stream(str(tmp_path), "tfplan"),
+    ):
+        pass
+
+
+def test_show_json_stream_caller_error(mocker: MockerFixture, tmp_path: Path) -> None:
+    # never exits on its own, the plan must not be drained
+    fake_terraform_show(
+        mocker,
+        'import itertools, sys; print(\'{"format_version": "1.2"\'); '
+        "any(sys.stdout.write(' ') and False for _ in itertools.count())",
+    )
+
+    with (
+        pytest.raises(ValueError, match="caller failed"),
+        lean_terraform_client.show_json_stream(str(tmp_path), "tfplan") as plan,
+    ):
+        next(plan.object_items())
+        raise ValueError("caller failed")
+
+
 def test_terraform_component() -> None:
     with tempfile.TemporaryDirectory() as working_dir:
         with open(os.path.join(working_dir, "main.tf"), "w", encoding="locale"):
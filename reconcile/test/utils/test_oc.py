@@ -1313,6 +1313,30 @@ def test_oc_native_get_items_with_resource_names(oc_native: OCNative) -> None:
     )
 
 
+def test_oc_native_get_items_from_informer(oc_native: OCNative) -> None:
+    oc_native.informers = MagicMock()
+    informer = oc_native.informers.get.return_value
+    informer.items.return_value = [{"metadata": {"name": "name"}}]
+
+    items = oc_native.get_items(
+        "kind1", namespace="cluster", labels={"label1": "value1"}
+    )
+
+    assert items == [{"metadata": {"name": "name"}}]
+    oc_native.informers.get.assert_called_once_with(
+        server="server",
+        token=oc_native._informer_token,
+        client_factory=oc_native._informer_client_factory,
+        group_version="group1/v1",
+        kind="kind1",
+        namespace="",
+    )
+    informer.items.assert_called_once_with(
+        labels={"label1": "value1"}, resource_names=None
+    )
+    oc_native.client.resources.get.return_value.get.assert_not_called()
+
+
 def test_oc_native_get_all(oc_native: OCNative) -> None:
     oc_native.get_all("kind1")
 
@@ -1325,6 +1349,50 @@ def test_oc_native_get_all(oc_native: OCNative) -> None:
     )
 
 
+def test_oc_cli_get_items_with_resource_names_batched(
+    oc_cli: OCCli,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(reconcile.utils.oc, "GET_ITEMS_BATCH_SIZE", 2)
+    mocker.patch.object(oc_cli, "project_exists", return_value=True)
+    mock_run_json = mocker.patch.object(
+        oc_cli,
+        "_run_json",
+        side_effect=[
+            {"kind": "List", "items": [{"metadata": {"name": "a"}}]},
+            {"kind": "Secret", "metadata": {"name": "c"}},
+        ],
+    )
+
+    items = oc_cli.get_items(
+        "Secret", namespace="ns", resource_names=["a", "b", "a", "c"]
+    )
+
+    assert items == [
+        {"metadata": {"name": "a"}},
+        {"kind": "Secret", "metadata": {"name": "c"}},
+    ]
+    assert mock_run_json.call_args_list == [
+        mocker.call(
+            ["get", "Secret", "-o", "json", "-n", "ns", "--ignore-not-found", "a", "b"],
+            allow_not_found=True,
+        ),
+        mocker.call(
+            ["get", "Secret", "-o", "json", "-n", "ns", "--ignore-not-found", "c"],
+            allow_not_found=True,
+        ),
+    ]
+
+
+def test_oc_cli_get_items_with_resource_names_none_found(
+    oc_cli: OCCli,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(oc_cli, "_run", return_value=b"{}")
+
+    assert oc_cli.get_items("Secret", resource_names=["a", "b"]) == []
+
+
 @pytest.mark.parametrize(
     ("namespace", "project_kind_supported", "expected_command"),
     [
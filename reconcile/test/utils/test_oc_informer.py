@@ -0,0 +1,162 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from reconcile.utils.oc_informer import (
+    MAX_CONSECUTIVE_ERRORS,
+    InformerRegistry,
+    ResourceInformer,
+)
+
+
+def _obj(name: str, rv: str, labels: dict[str, str] | None = None) -> dict[str, Any]:
+    return {
+        "kind": "ConfigMap",
+        "metadata": {
+            "name": name,
+            "namespace": "ns",
+            "resourceVersion": rv,
+            "labels": labels or {},
+        },
+    }
+
+
+@pytest.fixture
+def resource() -> MagicMock:
+    resource = MagicMock()
+    resource.kind = "ConfigMap"
+    resource.get.return_value.to_dict.return_value = {
+        "metadata": {"resourceVersion": "1"},
+        "items": [_obj("a", "1", {"app": "x"}), _obj("b", "1")],
+    }
+    resource.watch.side_effect = Exception("no more events")
+    return resource
+
+
+@pytest.fixture
+def informer(resource: MagicMock) -> ResourceInformer:
+    informer = ResourceInformer(
+        resource=resource, namespace="ns", resync_interval=3600, max_items=3
+    )
+    informer._list()
+    return informer
+
+
+def test_informer_list(informer: ResourceInformer) -> None:
+    assert informer.synced
+    assert [o["metadata"]["name"] for o in informer.items()] == ["a", "b"]
+
+
+def test_informer_items_filter(informer: ResourceInformer) -> None:
+    assert [o["metadata"]["name"] for o in informer.items(labels={"app": "x"})] == ["a"]
+    assert [
+        o["metadata"]["name"] for o in informer.items(resource_names=["b", "c"])
+    ] == ["b"]
+
+
+def test_informer_items_are_copies(informer: ResourceInformer) -> None:
+    informer.items()[0]["metadata"].pop("labels")
+    assert informer.items(labels={"app": "x"})[0]["metadata"]["name"] == "a"
+
+
+def test_informer_unhealthy_when_stale(informer: ResourceInformer) -> None:
+    informer._thread = MagicMock()
+    assert informer.healthy
+    # watch expired, the relist didn't happen yet
+    informer._synced_at = 0.0
+    assert not informer.healthy
+
+
+def test_informer_unhealthy_after_errors(informer: ResourceInformer) -> None:
+    informer._thread = MagicMock()
+    informer._stop.set()
+    for _ in range(MAX_CONSECUTIVE_ERRORS):
+        assert informer.healthy
+        informer._failed(Exception("connection refused"))
+    assert not informer.healthy
+
+
+def test_informer_apply_events(informer: ResourceInformer) -> None:
+    informer._apply("ADDED", _obj("c", "2"))
+    informer._apply("MODIFIED", _obj("a", "3", {"app": "y"}))
+    informer._apply("DELETED", _obj("b", "4"))
+
+    assert informer._resource_version == "4"
+    assert {
+        o["metadata"]["name"]: o["metadata"]["labels"] for o in informer.items()
+    } == {"a": {"app": "y"}, "c": {}}
+
+
+def test_informer_apply_expired(informer: ResourceInformer) -> None:
+    with pytest.raises(ApiException):
+        informer._apply("ERROR", {"code": 410, "message": "too old"})
+    assert informer._synced_at == 0.0
+
+
+def test_informer_max_items(informer: ResourceInformer) -> None:
+    informer._apply("ADDED", _obj("c", "2"))
+    assert not informer.disabled
+    informer._apply("ADDED", _obj("d", "3"))
+    assert informer.disabled
+    assert not informer.healthy
+
+
+def test_registry_returns_started_informer(resource: MagicMock) -> None:
+    client = MagicMock()
+    client.resources.get.return_value = resource
+    registry = InformerRegistry(resync_interval=3600, max_items=10, max_informers=1)
+
+    informer = registry.get("server", "token", lambda: client, "v1", "ConfigMap", "ns")
+    try:
+        assert informer is not None
+        assert informer.healthy
+        assert registry.get(
+            "server", "token", lambda: client, "v1", "ConfigMap", "ns"
+        ) is (informer)
+        # max_informers reached
+        assert (
+            registry.get("server", "token", lambda: client, "v1", "Secret", "ns")
+            is None
+        )
+        client.resources.get.assert_called_once_with(api_version="v1", kind="ConfigMap")
+    finally:
+        registry.stop_all()
+
+
+def test_registry_informers_per_token(resource: MagicMock) -> None:
+    clients = [MagicMock(), MagicMock()]
+    for client in clients:
+        client.resources.get.return_value = resource
+    registry = InformerRegistry(resync_interval=3600, max_items=10, max_informers=5)
+
+    try:
+        a = registry.get(
+            "server", "token-a", lambda: clients[0], "v1", "ConfigMap", "ns"
+        )
+        b = registry.get(
+            "server", "token-b", lambda: clients[1], "v1", "ConfigMap", "ns"
+        )
+        assert a is not None
+        assert b is not None
+        assert a is not b
+        clients[0].resources.get.assert_called_once()
+        clients[1].resources.get.assert_called_once()
+    finally:
+        registry.stop_all()
+
+
+def test_registry_too_many_items(resource: MagicMock) -> None:
+    client = MagicMock()
+    client.resources.get.return_value = resource
+    registry = InformerRegistry(resync_interval=3600, max_items=1, max_informers=5)
+
+    assert (
+        registry.get("server", "token", lambda: client, "v1", "ConfigMap", "ns") is None
+    )
+    assert (
+        registry.get("server", "token", lambda: client, "v1", "ConfigMap", "ns") is None
+    )
+    resource.get.assert_called_once()
+    registry.stop_all()
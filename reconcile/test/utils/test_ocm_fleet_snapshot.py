@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+import pytest
+
+from reconcile.utils.ocm_fleet_snapshot import (
+    FleetSnapshot,
+    fleet_snapshot_from_env,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+OCM_URL = "https://ocm.example.com"
+ITEMS: list[dict[str, Any]] = [{"id": "sub-1"}, {"id": "sub-2"}]
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> str:
+    return str(tmp_path / "fleet.db")
+
+
+def key(api_path: str = "/subscriptions", client_id: str = "client") -> str:
+    return FleetSnapshot.key(OCM_URL, client_id, api_path, {"search": "x"})
+
+
+def test_key_depends_on_client_and_query() -> None:
+    assert key() == key()
+    assert key() != key(client_id="other")
+    assert key() != key(api_path="/organizations")
+
+
+def test_items_are_shared_between_snapshots(path: str) -> None:
+    fetch = Mock(return_value=ITEMS)
+
+    assert FleetSnapshot(path).items(key(), OCM_URL, fetch) == ITEMS
+    # another process with its own snapshot object
+    assert FleetSnapshot(path).items(key(), OCM_URL, fetch) == ITEMS
+
+    fetch.assert_called_once_with()
+
+
+def test_items_are_served_from_memory(path: str) -> None:
+    snapshot = FleetSnapshot(path)
+    snapshot.items(key(), OCM_URL, Mock(return_value=ITEMS))
+
+    assert snapshot.items(key(), OCM_URL, Mock()) is snapshot.items(
+        key(), OCM_URL, Mock()
+    )
+
+
+def test_expired_items_are_fetched_again(path: str) -> None:
+    snapshot = FleetSnapshot(path, ttl=-1)
+    fetch = Mock(return_value=ITEMS)
+
+    snapshot.items(key(), OCM_URL, fetch)
+    snapshot.items(key(), OCM_URL, fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_invalidate_drops_snapshots_of_environment(path: str) -> None:
+    snapshot = FleetSnapshot(path)
+    other_env_key = FleetSnapshot.key("https://other.example.com", "c", "/", None)
+    snapshot.items(key(), OCM_URL, Mock(return_value=ITEMS))
+    snapshot.items(other_env_key, "https://other.example.com", Mock(return_value=[]))
+
+    FleetSnapshot(path).invalidate(OCM_URL)
+
+    fetch = Mock(return_value=[])
+    assert snapshot.items(key(), OCM_URL, fetch) == []
+    fetch.assert_called_once_with()
+    unexpected_fetch = Mock()
+    snapshot.items(other_env_key, "https://other.example.com", unexpected_fetch)
+    unexpected_fetch.assert_not_called()
+
+
+def test_unusable_path_falls_back_to_fetch(tmp_path: Path) -> None:
+    snapshot = FleetSnapshot(str(tmp_path / "missing" / "fleet.db"))
+    fetch = Mock(return_value=ITEMS)
+
+    assert snapshot.items(key(), OCM_URL, fetch) == ITEMS
+    assert snapshot.items(key(), OCM_URL, fetch) == ITEMS
+    assert fetch.call_count == 2
+
+
+def test_fleet_snapshot_from_env(path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OCM_FLEET_SNAPSHOT_PATH", raising=False)
+    assert fleet_snapshot_from_env() is None
+
+    monkeypatch.setenv("OCM_FLEET_SNAPSHOT_PATH", path)
+    monkeypatch.setenv("OCM_FLEET_SNAPSHOT_TTL", "60")
+    snapshot = fleet_snapshot_from_env()
+
+    assert snapshot
+    assert snapshot.ttl == 60
+    assert fleet_snapshot_from_env() is snapshot
@@ -36,3 +36,50 @@ def test_is_in_shard_three_shards_fail(monkeypatch: MonkeyPatch) -> None:
     importlib.reload(sharding)
 
     assert sharding.is_in_shard(VALUE) is False
+
+
+def test_shard_of_modulo() -> None:
+    assert sharding.shard_of(VALUE, shards=3, mode="modulo") == 1
+
+
+def test_shard_of_rendezvous_moves_few_values() -> None:
+    values = [f"cluster-{i}" for i in range(1000)]
+    before = {v: sharding.shard_of(v, shards=10, mode="rendezvous") for v in values}
+    after = {v: sharding.shard_of(v, shards=11, mode="rendezvous") for v in values}
+
+    moved = [v for v in values if before[v] != after[v]]
+    # only values that moved to the new shard change their assignment
+    assert all(after[v] == 10 for v in moved)
+    assert len(moved) < 150
+    assert set(before.values()) == set(range(10))
+
+
+def test_shard_assignment_balances_weights() -> None:
+    weights = {f"ns-{i}": 1.0 for i in range(100)} | {"big-1": 50.0, "big-2": 50.0}
+
+    assignment = sharding.shard_assignment(weights, shards=4, load_factor=1.1)
+
+    loads = [0.0] * 4
+    for value, shard in assignment.items():
+        loads[shard] += weights[value]
+    assert max(loads) <= 1.1 * sum(weights.values()) / 4
+    assert assignment["big-1"] != assignment["big-2"]
+    assert assignment == sharding.shard_assignment(
+        dict(reversed(weights.items())), shards=4, load_factor=1.1
+    )
+
+
+def test_shard_assignment_single_shard() -> None:
+    assert sharding.shard_assignment({"a": 1, "b": 2}, shards=1) == {"a": 0, "b": 0}
+
+
+def test_values_in_shard(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("SHARDS", "2")
+    monkeypatch.setenv("SHARD_ID", "0")
+    importlib.reload(sharding)
+    weights = {f"ns-{i}": float(i) for i in range(10)}
+
+    in_shard = sharding.values_in_shard(weights)
+
+    assignment = sharding.shard_assignment(weights)
+    assert in_shard == {v for v, s in assignment.items() if s == 0}
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from reconcile.utils.sqlite_cache import SqliteStore
+
+if TYPE_CHECKING:
+    import sqlite3
+    from pathlib import Path
+
+SCHEMA = ["CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT)"]
+
+
+def test_store_run(tmp_path: Path) -> None:
+    store = SqliteStore(str(tmp_path / "cache.db"), "test cache", SCHEMA)
+    assert store.available
+    store.run(
+        "update",
+        lambda conn: conn.execute("INSERT INTO entries VALUES (?, ?)", ("k", "v")),
+        None,
+    )
+
+    other = SqliteStore(str(tmp_path / "cache.db"), "test cache", SCHEMA)
+    assert other.run(
+        "lookup",
+        lambda conn: conn.execute("SELECT value FROM entries").fetchone(),
+        None,
+    ) == ("v",)
+
+
+def test_store_run_error_returns_default(tmp_path: Path) -> None:
+    store = SqliteStore(str(tmp_path / "cache.db"), "test cache", SCHEMA)
+
+    def fail(conn: sqlite3.Connection) -> str:
+        conn.execute("SELECT * FROM missing")
+        return "unreachable"
+
+    assert store.run("lookup", fail, "default") == "default"
+
+
+def test_store_unusable_path(tmp_path: Path) -> None:
+    store = SqliteStore(str(tmp_path / "missing" / "cache.db"), "test cache", SCHEMA)
+
+    assert not store.available
+    assert store.run("lookup", lambda conn: "value", "default") == "default"
+
+
+def test_store_closed(tmp_path: Path) -> None:
+    store = SqliteStore(str(tmp_path / "cache.db"), "test cache", SCHEMA)
+    store.close()
+
+    assert not store.available
+    assert store.run("lookup", lambda conn: "value", "default") == "default"
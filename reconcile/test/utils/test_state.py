@@ -214,6 +214,69 @@ def test_add_with_metadata(integration_state: State) -> None:
     assert integration_state.get("k") == "v"
 
 
+def test_get_many(integration_state: State) -> None:
+    integration_state.add("a", "1")
+    integration_state.add("b", "2")
+
+    assert integration_state.get_many(["a", "b", "missing"]) == {"a": "1", "b": "2"}
+
+
+def test_get_all(integration_state: State) -> None:
+    integration_state.add("path/a", "1")
+    integration_state.add("path/b", {"c": "d"})
+    integration_state.add("other/c", "3")
+
+    assert integration_state.get_all("path") == {"a": "1", "b": {"c": "d"}}
+
+
+def test_get_all_key_removed(integration_state: State, mocker: MockerFixture) -> None:
+    integration_state.add("path/a", "1")
+    mocker.patch.object(integration_state, "ls", return_value=["/path/a", "/path/b"])
+
+    with pytest.raises(KeyError):
+        integration_state.get_all("path")
+
+
+def test_manifest_skips_head_calls(
+    integration_state: State, mocker: MockerFixture
+) -> None:
+    integration_state.add("a", "1", metadata={"m": "v"})
+    integration_state.head("a")
+    integration_state.load_manifest()
+    head_object = mocker.spy(integration_state.client, "head_object")
+
+    assert integration_state.head("a") == (True, {"m": "v"})
+    assert integration_state.head("missing") == (False, {})
+    head_object.assert_not_called()
+
+
+def test_manifest_exists_without_head_calls(
+    integration_state: State, mocker: MockerFixture
+) -> None:
+    integration_state.add("a", "1")
+    # a fresh process has no cached metadata
+    mocker.patch("reconcile.utils.state._metadata_cache.get", return_value=None)
+    integration_state.load_manifest()
+    head_object = mocker.spy(integration_state.client, "head_object")
+
+    assert integration_state.exists("a")
+    assert not integration_state.exists("missing")
+    head_object.assert_not_called()
+
+
+def test_manifest_tracks_own_writes(
+    integration_state: State, mocker: MockerFixture
+) -> None:
+    integration_state.load_manifest()
+    head_object = mocker.spy(integration_state.client, "head_object")
+
+    integration_state.add("a", "1", metadata={"m": "v"}, force=True)
+    assert integration_state.head("a") == (True, {"m": "v"})
+    integration_state.rm("a")
+    assert not integration_state.exists("a")
+    head_object.assert_not_called()
+
+
 #
 # aquire settings
 #
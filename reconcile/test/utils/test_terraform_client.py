@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import base64
+import io
+import json
 import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
 from logging import DEBUG
 from operator import itemgetter
 from typing import TYPE_CHECKING, Any
@@ -11,11 +15,15 @@ import pytest
 from botocore.errorfactory import ClientError
 
 from reconcile.utils.aws_api import AWSApi
+from reconcile.utils.datetime_util import utc_now
 from reconcile.utils.external_resource_spec import (
     ExternalResourceSpec,
     ExternalResourceUniqueKey,
 )
+from reconcile.utils.json_stream import JSONStreamReader
+from reconcile.utils.state import State
 from reconcile.utils.terraform_client import (
+    AccountUser,
     DeletionApprovalExpirationValueError,
     RdsUpgradeValidationError,
     TerraformClient,
@@ -23,13 +31,21 @@ from reconcile.utils.terraform_client import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
     from pytest_mock import MockerFixture
 
 MockAWSApi = MagicMock
 
 
+def mock_show_json(lean_tf: MagicMock, plan: dict[str, Any]) -> None:
+    @contextmanager
+    def show_json_stream(working_dir: str, path: str) -> Iterator[JSONStreamReader]:
+        yield JSONStreamReader(io.StringIO(json.dumps(plan)))
+
+    lean_tf.show_json_stream.side_effect = show_json_stream
+
+
 @pytest.fixture
 def aws_api() -> MockAWSApi:
     return create_autospec(AWSApi)
@@ -1074,7 +1090,7 @@ def test_terraform_plan(
     terraform_spec_builder: Callable[..., TerraformSpec],
 ) -> None:
     mocked_lean_tf = mocker.patch("reconcile.utils.terraform_client.lean_tf")
-    mocked_lean_tf.show_json.return_value = {"format_version": "1.2"}
+    mock_show_json(mocked_lean_tf, {"format_version": "1.2"})
     mocked_lean_tf.plan.return_value = (0, "", "")
     mocked_tempfile = mocker.patch("reconcile.utils.terraform_client.tempfile")
     mocked_logging = mocker.patch("reconcile.utils.terraform_client.logging")
@@ -1135,7 +1151,39 @@ def test_terraform_plan_with_error(
     mocked_logging.error.assert_called_once_with(
         f"[{ACCOUNT_NAME} - plan] {error_message}"
     )
-    mocked_lean_tf.show_json.assert_not_called()
+    mocked_lean_tf.show_json_stream.assert_not_called()
+
+
+@pytest.mark.parametrize("plugin_cache", [None, MagicMock()])
+def test_terraform_init_specs(
+    aws_api: MockAWSApi,
+    mocker: MockerFixture,
+    plugin_cache: MagicMock | None,
+) -> None:
+    mocker.patch(
+        "reconcile.utils.terraform_client.plugin_cache_from_env", return_value=None
+    )
+    mocked_threaded_run = mocker.patch("reconcile.utils.terraform_client.threaded.run")
+    mocked_init = mocker.patch.object(TerraformClient, "terraform_init")
+    mocker.patch.object(TerraformClient, "init_outputs")
+
+    tf = TerraformClient(
+        "integ",
+        "v1",
+        "integ_pfx",
+        [{"name": ACCOUNT_NAME}],
+        {ACCOUNT_NAME: "/tmp/wd"},
+        2,
+        aws_api,
+        plugin_cache=plugin_cache,
+    )
+
+    if plugin_cache:
+        mocked_threaded_run.assert_called_once_with(tf.terraform_init, tf.specs, 2)
+        mocked_init.assert_not_called()
+    else:
+        mocked_threaded_run.assert_not_called()
+        mocked_init.assert_called_once_with(tf.specs[0])
 
 
 def test_terraform_safe_plan_raises_errors(
@@ -1191,3 +1239,252 @@ def test_terraform_apply(
     mocked_logging.warning.assert_called_once_with(
         f"[{ACCOUNT_NAME} - apply] {warning_log}"
     )
+
+
+@pytest.fixture
+def plan_skip_state() -> MagicMock:
+    records: dict[str, Any] = {}
+    state = create_autospec(State)
+    state.get.side_effect = records.get
+    state.add.side_effect = lambda key, value, force=False: records.__setitem__(
+        key, value
+    )
+    return state
+
+
+@pytest.fixture
+def plan_skip_tf(aws_api: MockAWSApi, plan_skip_state: MagicMock) -> TerraformClient:
+    account = {"name": ACCOUNT_NAME, "deletionApprovals": []}
+    return TerraformClient(
+        "integ",
+        "v1",
+        "integ_pfx",
+        [account],
+        {},
+        1,
+        aws_api,
+        plan_skip_state=plan_skip_state,
+    )
+
+
+@pytest.fixture
+def plan_skip_lean_tf(mocker: MockerFixture) -> MagicMock:
+    mocked_lean_tf = mocker.patch("reconcile.utils.terraform_client.lean_tf")
+    mock_show_json(mocked_lean_tf, {"format_version": "1.2"})
+    mocked_lean_tf.plan.return_value = (0, "", "")
+    mocked_lean_tf.apply.return_value = (0, "", "")
+    mocked_lean_tf.state_pull.return_value = (
+        0,
+        '{"lineage": "l1", "serial": 3}',
+        "",
+    )
+    return mocked_lean_tf
+
+
+def _plan_in(tf: TerraformClient, working_dir: str, config: str) -> None:
+    with open(f"{working_dir}/config.tf.json", "w", encoding="utf-8") as f:
+        f.write(config)
+    tf.terraform_plan(TerraformSpec(name=ACCOUNT_NAME, working_dir=working_dir), False)
+
+
+def test_terraform_plan_skips_unchanged_plan(
+    plan_skip_tf: TerraformClient,
+    plan_skip_lean_tf: MagicMock,
+) -> None:
+    with tempfile.TemporaryDirectory() as working_dir:
+        _plan_in(plan_skip_tf, working_dir, "{}")
+        _plan_in(plan_skip_tf, working_dir, "{}")
+        spec = TerraformSpec(name=ACCOUNT_NAME, working_dir=working_dir)
+        error = plan_skip_tf.terraform_apply(spec)
+
+    plan_skip_lean_tf.plan.assert_called_once()
+    assert plan_skip_tf.skipped_plans == {ACCOUNT_NAME}
+    assert error is False
+    plan_skip_lean_tf.apply.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "config, state_pull",
+    [
+        ('{"changed": true}', (0, '{"lineage": "l1", "serial": 3}', "")),
+        ("{}", (0, '{"lineage": "l1", "serial": 4}', "")),
+        ("{}", (1, "", "state unavailable")),
+    ],
+)
+def test_terraform_plan_replans_changed_fingerprint(
+    plan_skip_tf: TerraformClient,
+    plan_skip_lean_tf: MagicMock,
+    config: str,
+    state_pull: tuple[int, str, str],
+) -> None:
+    with tempfile.TemporaryDirectory() as working_dir:
+        _plan_in(plan_skip_tf, working_dir, "{}")
+        plan_skip_lean_tf.state_pull.return_value = state_pull
+        _plan_in(plan_skip_tf, working_dir, config)
+
+    assert plan_skip_lean_tf.plan.call_count == 2
+    assert plan_skip_tf.skipped_plans == set()
+
+
+def test_terraform_plan_replans_after_max_age(
+    plan_skip_tf: TerraformClient,
+    plan_skip_lean_tf: MagicMock,
+    plan_skip_state: MagicMock,
+) -> None:
+    with tempfile.TemporaryDirectory() as working_dir:
+        _plan_in(plan_skip_tf, working_dir, "{}")
+        record = plan_skip_state.get(f"plan-skip/{ACCOUNT_NAME}")
+        record["planned_at"] = (utc_now() - timedelta(days=1)).isoformat()
+        _plan_in(plan_skip_tf, working_dir, "{}")
+
+    assert plan_skip_lean_tf.plan.call_count == 2
+
+
+def test_terraform_plan_does_not_remember_changes(
+    plan_skip_tf: TerraformClient,
+    plan_skip_lean_tf: MagicMock,
+    plan_skip_state: MagicMock,
+) -> None:
+    mock_show_json(
+        plan_skip_lean_tf,
+        {
+            "format_version": "1.2",
+            "resource_changes": [
+                {
+                    "type": "aws_s3_bucket",
+                    "name": "b",
+                    "address": "aws_s3_bucket.b",
+                    "change": {"actions": ["create"], "before": None, "after": {}},
+                }
+            ],
+        },
+    )
+    with tempfile.TemporaryDirectory() as working_dir:
+        _plan_in(plan_skip_tf, working_dir, "{}")
+        _plan_in(plan_skip_tf, working_dir, "{}")
+
+    assert plan_skip_lean_tf.plan.call_count == 2
+    plan_skip_state.add.assert_not_called()
+    assert plan_skip_tf.should_apply()
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"fingerprint": {}},
+        {"planned_at": "yesterday", "fingerprint": {}},
+        {"planned_at": "2024-01-01T00:00:00"},
+        ["not", "a", "record"],
+    ],
+)
+def test_terraform_plan_ignores_invalid_record(
+    plan_skip_tf: TerraformClient,
+    plan_skip_lean_tf: MagicMock,
+    plan_skip_state: MagicMock,
+    record: Any,
+) -> None:
+    plan_skip_state.get.side_effect = lambda key, default=None: record
+    with tempfile.TemporaryDirectory() as working_dir:
+        _plan_in(plan_skip_tf, working_dir, "{}")
+
+    plan_skip_lean_tf.plan.assert_called_once()
+    assert plan_skip_tf.skipped_plans == set()
+
+
+def test_terraform_plan_skip_read_only(
+    aws_api: MockAWSApi,
+    plan_skip_lean_tf: MagicMock,
+    plan_skip_state: MagicMock,
+) -> None:
+    tf = TerraformClient(
+        "integ",
+        "v1",
+        "integ_pfx",
+        [{"name": ACCOUNT_NAME, "deletionApprovals": []}],
+        {},
+        1,
+        aws_api,
+        plan_skip_state=plan_skip_state,
+        plan_skip_read_only=True,
+    )
+    with tempfile.TemporaryDirectory() as working_dir:
+        _plan_in(tf, working_dir, "{}")
+        _plan_in(tf, working_dir, "{}")
+
+    assert plan_skip_lean_tf.plan.call_count == 2
+    plan_skip_state.add.assert_not_called()
+
+
+@pytest.fixture
+def plan_lean_tf(mocker: MockerFixture) -> MagicMock:
+    mocker.patch(
+        "reconcile.utils.terraform_client.get_app_interface_custom_message",
+        return_value=None,
+    )
+    return mocker.patch("reconcile.utils.terraform_client.lean_tf")
+
+
+def test_log_plan_diff(
+    tf: TerraformClient,
+    plan_lean_tf: MagicMock,
+    terraform_spec_builder: Callable[..., TerraformSpec],
+) -> None:
+    tf.outputs[ACCOUNT_NAME] = {"changed": {"value": "old"}, "same": {"value": "v"}}
+    mock_show_json(
+        plan_lean_tf,
+        {
+            "format_version": "1.2",
+            "planned_values": {"root_module": {"resources": [{"values": {}}]}},
+            "resource_changes": [
+                {
+                    "type": "aws_iam_user_login_profile",
+                    "name": "user",
+                    "address": "aws_iam_user_login_profile.user",
+                    "change": {"actions": ["create"], "before": None, "after": {}},
+                },
+                {
+                    "type": "aws_s3_bucket",
+                    "name": "bucket",
+                    "address": "aws_s3_bucket.bucket",
+                    "change": {"actions": ["delete"], "before": {}, "after": None},
+                },
+                {
+                    "type": "random_id",
+                    "name": "id",
+                    "address": "random_id.id",
+                    "change": {"actions": ["no-op"], "before": {}, "after": {}},
+                },
+            ],
+            "output_changes": {
+                "changed": {"after": "new"},
+                "same": {"after": "v"},
+            },
+            "prior_state": {
+                "values": {
+                    "outputs": {"changed": {}, "same": {}, "deleted": {}},
+                    "root_module": {"resources": [{"values": {}}]},
+                }
+            },
+            "configuration": {"root_module": {}},
+        },
+    )
+
+    disabled_deletion_detected, created_users = tf.log_plan_diff(
+        terraform_spec_builder(ACCOUNT_NAME, "wd"), enable_deletion=False
+    )
+
+    assert disabled_deletion_detected is True
+    assert created_users == [AccountUser(ACCOUNT_NAME, "user")]
+    # create, delete, changed output and deleted output
+    assert tf.apply_count == 4
+
+
+def test_log_plan_diff_untested_format_version(
+    tf: TerraformClient,
+    plan_lean_tf: MagicMock,
+    terraform_spec_builder: Callable[..., TerraformSpec],
+) -> None:
+    mock_show_json(plan_lean_tf, {"format_version": "0.1", "resource_changes": []})
+
+    with pytest.raises(NotImplementedError):
+        tf.log_plan_diff(terraform_spec_builder(ACCOUNT_NAME, "wd"), False)
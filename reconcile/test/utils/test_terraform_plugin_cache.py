@@ -0,0 +1,154 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from reconcile.utils.terraform import plugin_cache
+from reconcile.utils.terraform.plugin_cache import (
+    DEPENDENCY_LOCK_FILE,
+    TerraformPluginCache,
+    plugin_cache_from_env,
+)
+
+
+def write_config(working_dir: Path, aws_version: str) -> None:
+    working_dir.mkdir(exist_ok=True)
+    config = {
+        "terraform": [
+            {
+                "required_providers": {
+                    "aws": {"source": "hashicorp/aws", "version": aws_version}
+                },
+                "backend": {"s3": {"key": working_dir.name}},
+            }
+        ],
+        "resource": {"aws_s3_bucket": {working_dir.name: {}}},
+    }
+    (working_dir / "config.tf.json").write_text(json.dumps(config), encoding="utf-8")
+
+
+class FakeInit:
+    def __init__(self, return_code: int = 0) -> None:
+        self.return_code = return_code
+        self.calls: list[tuple[str, dict[str, str], bool]] = []
+
+    def __call__(self, working_dir: Path) -> "FakeRunInit":
+        return FakeRunInit(self, working_dir)
+
+
+class FakeRunInit:
+    def __init__(self, init: FakeInit, working_dir: Path) -> None:
+        self.init = init
+        self.working_dir = working_dir
+
+    def __call__(self, env: dict[str, str]) -> tuple[int, str, str]:
+        lock_file = self.working_dir / DEPENDENCY_LOCK_FILE
+        self.init.calls.append((self.working_dir.name, env, lock_file.exists()))
+        if self.init.return_code == 0 and not lock_file.exists():
+            lock_file.write_text(
+                f"# written by {self.working_dir.name}\n", encoding="utf-8"
+            )
+        return self.init.return_code, "", ""
+
+
+def test_providers_key_ignores_everything_but_providers(tmp_path: Path) -> None:
+    write_config(tmp_path / "a", "5.0.0")
+    write_config(tmp_path / "b", "5.0.0")
+    write_config(tmp_path / "c", "5.1.0")
+
+    key_a = TerraformPluginCache.providers_key(str(tmp_path / "a"))
+    assert key_a == TerraformPluginCache.providers_key(str(tmp_path / "b"))
+    assert key_a != TerraformPluginCache.providers_key(str(tmp_path / "c"))
+
+
+def test_providers_key_without_config(tmp_path: Path) -> None:
+    assert TerraformPluginCache.providers_key(str(tmp_path))
+
+
+def test_plugin_cache_env(tmp_path: Path) -> None:
+    cache = TerraformPluginCache(str(tmp_path / "cache"))
+    assert cache.env == {"TF_PLUGIN_CACHE_DIR": str(tmp_path / "cache")}
+
+
+def test_plugin_cache_env_with_mirror(tmp_path: Path) -> None:
+    cache = TerraformPluginCache(str(tmp_path / "cache"), mirror="/mirror")
+    assert cache.env["TF_PLUGIN_CACHE_DIR"] == str(tmp_path / "cache")
+    cli_config = Path(cache.env["TF_CLI_CONFIG_FILE"]).read_text(encoding="utf-8")
+    assert 'path = "/mirror"' in cli_config
+    assert "direct {}" in cli_config
+
+
+def test_plugin_cache_seeds_lock_file(tmp_path: Path) -> None:
+    cache = TerraformPluginCache(str(tmp_path / "cache"))
+    fake_init = FakeInit()
+    for name in ["a", "b"]:
+        write_config(tmp_path / name, "5.0.0")
+        assert cache.init(str(tmp_path / name), fake_init(tmp_path / name)) == (
+            0,
+            "",
+            "",
+        )
+
+    assert [(name, seeded) for name, _, seeded in fake_init.calls] == [
+        ("a", False),
+        ("b", True),
+    ]
+    assert (tmp_path / "b" / DEPENDENCY_LOCK_FILE).read_text(
+        encoding="utf-8"
+    ) == "# written by a\n"
+    assert all(env == cache.env for _, env, _ in fake_init.calls)
+
+
+def test_plugin_cache_does_not_seed_other_providers(tmp_path: Path) -> None:
+    cache = TerraformPluginCache(str(tmp_path / "cache"))
+    fake_init = FakeInit()
+    write_config(tmp_path / "a", "5.0.0")
+    write_config(tmp_path / "b", "5.1.0")
+    cache.init(str(tmp_path / "a"), fake_init(tmp_path / "a"))
+    cache.init(str(tmp_path / "b"), fake_init(tmp_path / "b"))
+
+    assert [seeded for _, _, seeded in fake_init.calls] == [False, False]
+
+
+def test_plugin_cache_shared_between_processes(tmp_path: Path) -> None:
+    fake_init = FakeInit()
+    write_config(tmp_path / "a", "5.0.0")
+    write_config(tmp_path / "b", "5.0.0")
+    TerraformPluginCache(str(tmp_path / "cache")).init(
+        str(tmp_path / "a"), fake_init(tmp_path / "a")
+    )
+    TerraformPluginCache(str(tmp_path / "cache")).init(
+        str(tmp_path / "b"), fake_init(tmp_path / "b")
+    )
+
+    assert [seeded for _, _, seeded in fake_init.calls] == [False, True]
+
+
+def test_plugin_cache_ignores_failed_init(tmp_path: Path) -> None:
+    cache = TerraformPluginCache(str(tmp_path / "cache"))
+    write_config(tmp_path / "a", "5.0.0")
+    write_config(tmp_path / "b", "5.0.0")
+    failing_init = FakeInit(return_code=1)
+    assert cache.init(str(tmp_path / "a"), failing_init(tmp_path / "a"))[0] == 1
+
+    fake_init = FakeInit()
+    cache.init(str(tmp_path / "b"), fake_init(tmp_path / "b"))
+    assert [seeded for _, _, seeded in fake_init.calls] == [False]
+
+
+def test_plugin_cache_from_env_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TERRAFORM_PLUGIN_CACHE_DIR", raising=False)
+    assert plugin_cache_from_env() is None
+
+
+def test_plugin_cache_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(plugin_cache, "_caches", {})
+    monkeypatch.setenv("TERRAFORM_PLUGIN_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("TERRAFORM_PROVIDER_MIRROR_DIR", "/mirror")
+
+    cache = plugin_cache_from_env()
+    assert cache is not None
+    assert cache.mirror == "/mirror"
+    assert plugin_cache_from_env() is cache
+    assert os.path.isdir(tmp_path / "cache")
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import json
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock
 
 import pytest
+from terrascript import Output
 from terrascript.resource import (
     aws_lb,
     aws_s3_bucket,
@@ -27,6 +29,7 @@ from reconcile.utils.external_resource_spec import (
     ExternalResourceSpec,
     ExternalResourceUniqueKey,
 )
+from reconcile.utils.json import json_dumps
 from reconcile.utils.ocm.ocm import OCM
 from reconcile.utils.terrascript_aws_client import (
     OutputResourceNameNotUniqueError,
@@ -36,6 +39,8 @@ from reconcile.utils.terrascript_aws_client import (
 )
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest_mock import MockerFixture
 
 
@@ -2113,3 +2118,105 @@ def test_populate_vpc_requests_s3_gateway_endpoint_route_tables(
     )
     assert "route_table_ids" not in s3_endpoint["tags"]
     assert s3_endpoint["tags"]["Name"] == "cluster-vpc--vpce-s3"
+
+
+def test_get_values_fetches_each_path_once(
+    mocker: MockerFixture, ts: TerrascriptClient
+) -> None:
+    get_raw_values = mocker.patch.object(
+        ts,
+        "get_raw_values",
+        return_value={"content": '{"$schema": "/x.yml", "engine": {"name": "pg"}}'},
+    )
+
+    values = ts.get_values("/defaults.yml")
+    values["engine"]["name"] = "mysql"
+
+    assert ts.get_values("/defaults.yml") == {"engine": {"name": "pg"}}
+    get_raw_values.assert_called_once_with("/defaults.yml")
+
+
+def test_populate_resources_keeps_account_order(
+    mocker: MockerFixture, ts: TerrascriptClient
+) -> None:
+    specs = {
+        account: [
+            build_s3_spec({"identifier": f"{account}-{i}", "provider": "s3"})
+            for i in range(5)
+        ]
+        for account in ["a", "b", "c"]
+    }
+    ts.account_resource_specs = specs
+    ts.thread_pool_size = 3
+    populated: list[ExternalResourceSpec] = []
+    mocker.patch.object(
+        ts,
+        "populate_tf_resources",
+        side_effect=lambda spec, ocm_map: populated.append(spec),
+    )
+
+    ts.populate_resources()
+
+    for account, account_specs in specs.items():
+        assert [
+            s for s in populated if s.resource["identifier"].startswith(account)
+        ] == account_specs
+
+
+@pytest.fixture
+def account_ts(
+    mocker: MockerFixture, default_account: dict[str, Any]
+) -> TerrascriptClient:
+    mocked_secret_reader = mocker.patch(
+        "reconcile.utils.terrascript_aws_client.SecretReader",
+        autospec=True,
+    )
+    mocked_secret_reader.return_value.read_all.return_value = {
+        "aws_access_key_id": "some-key-id",
+        "aws_secret_access_key": "some-secret-key",
+    }
+    return TerrascriptClient(
+        "a_integration", "prefix", 1, [default_account], default_tags=None
+    )
+
+
+def test_dump_writes_sorted_config(
+    account_ts: TerrascriptClient, tmp_path: Path
+) -> None:
+    account_ts.dump(existing_dirs={"account1": str(tmp_path)})
+
+    content = (tmp_path / "config.tf.json").read_text(encoding="utf-8")
+    assert content == json_dumps(account_ts.tss["account1"], indent=2)
+    assert account_ts.terraform_configurations() == {
+        "account1": hashlib.sha256(content.encode("utf-8")).hexdigest()
+    }
+
+
+def test_dump_print_to_file(account_ts: TerrascriptClient, tmp_path: Path) -> None:
+    print_to_file = tmp_path / "print.json"
+    (tmp_path / "wd").mkdir()
+    account_ts.dump(
+        print_to_file=str(print_to_file),
+        existing_dirs={"account1": str(tmp_path / "wd")},
+    )
+
+    config = (tmp_path / "wd" / "config.tf.json").read_text(encoding="utf-8")
+    assert print_to_file.read_text(encoding="utf-8") == (
+        f"##### account1 #####\n{config}\n"
+    )
+
+
+def test_terraform_configurations_changes_with_resources(
+    account_ts: TerrascriptClient, tmp_path: Path
+) -> None:
+    account_ts.dump(existing_dirs={"account1": str(tmp_path)})
+    dumped = account_ts.terraform_configurations()
+
+    account_ts.add_resource("account1", Output("o", value="v"))
+
+    assert account_ts.terraform_configurations() != dumped
+    assert account_ts.terraform_configurations() == {
+        "account1": hashlib.sha256(
+            json_dumps(account_ts.tss["account1"], indent=2).encode("utf-8")
+        ).hexdigest()
+    }
@@ -48,8 +48,12 @@ from gitlab.v4.objects import (
 )
 from sretoolbox.utils import retry
 
-from reconcile.utils.instrumented_wrappers import InstrumentedSession
-from reconcile.utils.metrics import gitlab_request
+from reconcile.utils.instrumented_wrappers import (
+    ConditionalRequestSession,
+    ConditionalResponseCache,
+    InstrumentedSession,
+)
+from reconcile.utils.metrics import gitlab_conditional_request, gitlab_request
 from reconcile.utils.secret_reader import SecretReader, SecretReaderBase
 
 if TYPE_CHECKING:
@@ -125,6 +129,7 @@ class GitLabApi:
         project_url: str | None = None,
         timeout: float = 30,
         session: Session | None = None,
+        response_cache: ConditionalResponseCache | None = None,
     ):
         self.server = instance["url"]
         if not secret_reader:
@@ -133,9 +138,20 @@ class GitLabApi:
         self.ssl_verify = (
             instance["sslVerify"] if instance["sslVerify"] is not None else True
         )
-        self.session = session or InstrumentedSession(
-            gitlab_request.labels(integration=os.getenv("INTEGRATION_NAME", ""))
+        request_counter = gitlab_request.labels(
+            integration=os.getenv("INTEGRATION_NAME", "")
         )
+        if session:
+            self.session = session
+        elif response_cache is not None:
+            # revalidate GET requests against responses of earlier sessions
+            self.session = ConditionalRequestSession(
+                request_counter,
+                cache=response_cache,
+                result_counter=gitlab_conditional_request,
+            )
+        else:
+            self.session = InstrumentedSession(request_counter)
         self.gl = Gitlab(
             self.server,
             private_token=token,
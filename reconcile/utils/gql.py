@@ -1,18 +1,23 @@
 import contextlib
+import hashlib
 import logging
+import os
 import textwrap
 import threading
+import time
+from collections.abc import Mapping
 from datetime import (
     UTC,
     datetime,
 )
-from typing import Any
+from functools import lru_cache
+from typing import Any, NamedTuple
 from urllib.parse import ParseResult, urlparse
 
 import requests
 from gql import (
     Client,
-    gql,
+    GraphQLRequest,
 )
 from gql.transport.exceptions import (
     TransportConnectionFailed,
@@ -20,11 +25,18 @@ from gql.transport.exceptions import (
 )
 from gql.transport.requests import RequestsHTTPTransport
 from gql.transport.requests import log as requests_logger
+from graphql import DocumentNode, GraphQLError, OperationDefinitionNode
 from sentry_sdk import capture_exception
 from sretoolbox.utils import retry
 
 from reconcile.status import RunningState
 from reconcile.utils.config import get_config
+from reconcile.utils.gql_result_cache import (
+    GqlResultCache,
+    bundle_sha_from_url,
+    result_cache_from_env,
+)
+from reconcile.utils.metrics import gql_query_duration
 
 INTEGRATIONS_QUERY = """
 {
@@ -36,6 +48,8 @@ INTEGRATIONS_QUERY = """
 }
 """
 
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+
 requests_logger.setLevel(logging.WARNING)
 
 
@@ -81,6 +95,30 @@ class GqlGetResourceError(Exception):
         super().__init__(f"Error getting resource from path {path}: {msg!s}")
 
 
+class ParsedQuery(NamedTuple):
+    document: DocumentNode
+    operation_name: str
+    sha256: str
+
+
+@lru_cache(maxsize=512)
+def parse_query(query: str) -> ParsedQuery:
+    """Parse a query string once. Queries are static strings, so the parsed
+    document is cached and shared between all GqlApi instances. DocumentNodes
+    are never mutated by gql, which makes them safe to share across threads."""
+    document = GraphQLRequest(query).document
+    operation_name = next(
+        (
+            d.name.value
+            for d in document.definitions
+            if isinstance(d, OperationDefinitionNode) and d.name
+        ),
+        "anonymous",
+    )
+    sha256 = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return ParsedQuery(document, operation_name, sha256)
+
+
 class GqlApi:
     _valid_schemas: list[str] = []
     _queried_schemas: set[Any] = set()
@@ -93,6 +131,7 @@ class GqlApi:
         validate_schemas: bool = False,
         commit: str | None = None,
         commit_timestamp: str | None = None,
+        persisted_queries: bool | None = None,
     ) -> None:
         self.url = url
         self.token = token
@@ -100,7 +139,16 @@ class GqlApi:
         self.validate_schemas = validate_schemas
         self.commit = commit
         self.commit_timestamp = commit_timestamp
+        if persisted_queries is None:
+            persisted_queries = os.environ.get("GQL_PERSISTED_QUERIES", "").lower() in {
+                "true",
+                "yes",
+            }
+        self.persisted_queries = persisted_queries
         self.client = self._init_gql_client()
+        # results of a sha pinned bundle are immutable and can be cached
+        self.bundle_sha = bundle_sha_from_url(url)
+        self.result_cache = result_cache_from_env() if self.bundle_sha else None
 
         if validate_schemas and not int_name:
             raise Exception(
@@ -132,6 +180,8 @@ class GqlApi:
         logging.debug("Closing GqlApi client")
         if hasattr(self.client.transport, "session") and self.client.transport.session:
             self.client.transport.session.close()
+        if self.result_cache:
+            self.result_cache.close()
 
     @retry(exceptions=GqlApiError, max_attempts=5, hook=capture_and_forget)
     def query(
@@ -140,11 +190,26 @@ class GqlApi:
         variables: dict[str, Any] | None = None,
         skip_validation: bool = False,
     ) -> dict[str, Any]:
+        cache_key = None
+        if self.result_cache and self.bundle_sha:
+            cache_key = GqlResultCache.key(self.bundle_sha, query, variables)
+            if (cached := self.result_cache.get(cache_key)) is not None:
+                return self._process_result(cached, skip_validation)
+
+        try:
+            parsed = parse_query(query)
+        except GraphQLError as e:
+            raise GqlApiError(f"Invalid GraphQL query: {e}") from e
+        start_time = time.monotonic()
+        result: Mapping[str, Any]
         try:
-            request = gql(query)
-            if variables:
-                request.variable_values = variables
-            result = self.client.execute(request, get_execution_result=True).formatted
+            if self.persisted_queries:
+                result = self._execute_persisted(query, parsed, variables)
+            else:
+                request = GraphQLRequest(parsed.document, variable_values=variables)
+                result = self.client.execute(
+                    request, get_execution_result=True
+                ).formatted
         except (requests.exceptions.ConnectionError, TransportConnectionFailed) as e:
             raise GqlApiError(f"Could not connect to GraphQL server ({e})") from None
         except TransportQueryError as e:
@@ -155,7 +220,20 @@ class GqlApi:
             ) from None
         except Exception as e:
             raise GqlApiError("Unexpected error occurred") from e
-
+        finally:
+            gql_query_duration.labels(
+                integration=RunningState().integration,
+                operation=parsed.operation_name,
+            ).observe(time.monotonic() - start_time)
+
+        data = self._process_result(result, skip_validation)
+        if self.result_cache and cache_key:
+            self.result_cache.set(cache_key, result)
+        return data
+
+    def _process_result(
+        self, result: Mapping[str, Any], skip_validation: bool
+    ) -> dict[str, Any]:
         # show schemas if log level is debug
         query_schemas = result.get("extensions", {}).get("schemas", [])
         self._queried_schemas.update(query_schemas)
@@ -174,6 +252,53 @@ class GqlApi:
         assert "data" in result and result["data"] is not None
         return result["data"]
 
+    def _execute_persisted(
+        self,
+        query: str,
+        parsed: ParsedQuery,
+        variables: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Execute a query using the automatic persisted queries protocol.
+
+        Only the sha256 hash of the query is sent. If the server does not know
+        the hash yet, the request is repeated with the full query, which
+        registers it for subsequent requests.
+        """
+        payload: dict[str, Any] = {
+            "extensions": {
+                "persistedQuery": {"version": 1, "sha256Hash": parsed.sha256}
+            },
+        }
+        if variables:
+            payload["variables"] = variables
+        result = self._post(payload)
+        if any(
+            e.get("message") == PERSISTED_QUERY_NOT_FOUND
+            or e.get("extensions", {}).get("code") == "PERSISTED_QUERY_NOT_FOUND"
+            for e in result.get("errors") or []
+        ):
+            result = self._post(payload | {"query": query})
+        if result.get("errors"):
+            raise TransportQueryError(
+                str(result["errors"][0]),
+                errors=result["errors"],
+                data=result.get("data"),
+            )
+        return result
+
+    def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
+        transport = self.client.transport
+        assert isinstance(transport, PersistentRequestsHTTPTransport)
+        assert transport.session is not None
+        response = transport.session.post(
+            self.url,
+            json=payload,
+            headers=transport.headers,
+            timeout=transport.default_timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
     def get_template(self, path: str) -> dict[str, str]:
         query = """
         query Template($path: String) {
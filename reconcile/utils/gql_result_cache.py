@@ -0,0 +1,113 @@
+"""On-disk cache for GraphQL query results.
+
+Results of queries against a sha pinned bundle (/graphqlsha/<sha>) never
+change, so they can be cached by (sha, query hash, variables hash) and shared
+by all integrations running on the same node. The cache is a single sqlite
+database, which handles concurrent access from several processes, and is
+trimmed to a maximum size by evicting the least recently used entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+from reconcile.utils.json import json_dumps
+from reconcile.utils.sqlite_cache import SqliteStore
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Mapping
+
+GRAPHQL_SHA_PATH_RE = re.compile(r"/graphqlsha/(?P<sha>[0-9a-f]+)/?$")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def bundle_sha_from_url(url: str) -> str | None:
+    """Return the bundle sha of a sha pinned GraphQL endpoint URL."""
+    if match := GRAPHQL_SHA_PATH_RE.search(url):
+        return match.group("sha")
+    return None
+
+
+class GqlResultCache:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._store = SqliteStore(
+            path,
+            "GraphQL result cache",
+            [
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            ],
+        )
+
+    @staticmethod
+    def key(sha: str, query: str, variables: dict[str, Any] | None) -> str:
+        query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        variables_hash = hashlib.sha256(
+            json_dumps(variables or {}).encode("utf-8")
+        ).hexdigest()
+        return f"{sha}:{query_hash}:{variables_hash}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        def lookup(conn: sqlite3.Connection) -> str | None:
+            row = conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+        data = self._store.run("lookup", lookup, None)
+        return json.loads(data) if data is not None else None
+
+    def set(self, key: str, value: Mapping[str, Any]) -> None:
+        data = json_dumps(value, compact=True)
+        if len(data) > self.max_bytes:
+            return
+
+        def update(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._evict(conn)
+
+        self._store.run("update", update, None)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self.max_bytes:
+            return
+        to_free = total - self.max_bytes
+        keys = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ):
+            keys.append((key,))
+            to_free -= size
+            if to_free <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", keys)
+
+    def close(self) -> None:
+        self._store.close()
+
+
+def result_cache_from_env() -> GqlResultCache | None:
+    """Create the cache configured by GQL_RESULT_CACHE_PATH, if any."""
+    if not (path := os.environ.get("GQL_RESULT_CACHE_PATH")):
+        return None
+    max_bytes = int(os.environ.get("GQL_RESULT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    return GqlResultCache(path, max_bytes=max_bytes)
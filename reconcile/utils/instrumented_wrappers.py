@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
 from requests import (
+    PreparedRequest,
     Response,
     Session,
 )
+from requests.structures import CaseInsensitiveDict
 from sretoolbox.container import (
     Image,
     Skopeo,
@@ -72,3 +78,135 @@ class InstrumentedSession(Session):
     def request(self, *args: Any, **kwargs: Any) -> Response:
         self.counter.inc()
         return super().request(*args, **kwargs)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    headers: dict[str, str]
+    content: bytes
+    encoding: str | None
+
+
+class ConditionalResponseCache:
+    """
+    Bounded LRU cache of GET responses that carry an ETag or Last-Modified
+    validator. It is meant to outlive a single session, e.g. as a module
+    level object reused across the loops of a long running integration.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ConditionalRequestSession(InstrumentedSession):
+    """
+    InstrumentedSession that revalidates GET requests with If-None-Match and
+    If-Modified-Since against a ConditionalResponseCache. A 304 Not Modified
+    answer is turned back into the cached 200 response, so callers don't
+    notice the difference.
+
+    Streamed responses are never cached.
+    """
+
+    def __init__(
+        self,
+        counter: Counter,
+        cache: ConditionalResponseCache,
+        result_counter: Counter | None = None,
+    ) -> None:
+        super().__init__(counter)
+        self.cache = cache
+        self.result_counter = result_counter
+
+    def _record(self, result: str) -> None:
+        if result != "uncached":
+            self.cache.record(hit=result == "hit")
+        if self.result_counter:
+            self.result_counter.labels(
+                integration=INTEGRATION_NAME, result=result
+            ).inc()
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if request.method != "GET" or not request.url or kwargs.get("stream"):
+            return super().send(request, **kwargs)
+
+        key = request.url
+        cached = self.cache.get(key)
+        if cached:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = super().send(request, **kwargs)
+        if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+            self._record("hit")
+            return self._from_cache(cached, response)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != HTTPStatus.OK or not (etag or last_modified):
+            self._record("uncached")
+            return response
+
+        self._record("miss")
+        self.cache.put(
+            key,
+            CachedResponse(
+                etag=etag,
+                last_modified=last_modified,
+                headers=dict(response.headers),
+                content=response.content,
+                encoding=response.encoding,
+            ),
+        )
+        return response
+
+    @staticmethod
+    def _from_cache(cached: CachedResponse, not_modified: Response) -> Response:
+        response = Response()
+        response.status_code = HTTPStatus.OK
+        response.reason = HTTPStatus.OK.phrase
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response._content = cached.content
+        response.encoding = cached.encoding
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        not_modified.close()
+        return response
@@ -0,0 +1,125 @@
+"""Cross-run second tier for Jinja2TemplateCache.
+
+Jinja2TemplateCache lives for a single integration run. Long-running
+integrations (run_integration loop mode) would otherwise fetch the same
+GitHub files, vault secrets and S3 objects on every iteration. This cache
+persists such lookups in a local sqlite database, with a TTL per namespace.
+
+Only immutable lookups are safe to keep for long: GitHub files are stored by
+resolved commit sha and vault secrets only if a version is pinned.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from reconcile.utils.json import json_dumps
+from reconcile.utils.sqlite_cache import SqliteStore
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Mapping
+
+# seconds an entry is kept per namespace, 0 disables persisting a namespace.
+# vault is opt-in because it stores secrets on disk. query results are
+# already cached on disk per bundle sha by the GraphQL result cache.
+DEFAULT_TTLS: dict[str, float] = {
+    "github": 7 * 24 * 3600,
+    "query": 0,
+    "s3": 300,
+    "s3_ls": 300,
+    "vault": 0,
+}
+
+
+def ttls_from_env() -> dict[str, float]:
+    """TTLs per namespace, overridable via JINJA2_TEMPLATE_CACHE_TTL_<NAMESPACE>."""
+    return {
+        namespace: float(
+            os.environ.get(f"JINJA2_TEMPLATE_CACHE_TTL_{namespace.upper()}", ttl)
+        )
+        for namespace, ttl in DEFAULT_TTLS.items()
+    }
+
+
+class PersistentTemplateCache:
+    def __init__(self, path: str, ttls: Mapping[str, float] | None = None) -> None:
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._store = SqliteStore(
+            path,
+            "jinja2 template cache",
+            [
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            ],
+        )
+        self._store.run(
+            "cleanup",
+            lambda conn: conn.execute(
+                "DELETE FROM entries WHERE expires < ?", (time.time(),)
+            ),
+            None,
+        )
+
+    def enabled(self, namespace: str) -> bool:
+        return self.ttls.get(namespace, 0) > 0
+
+    @staticmethod
+    def _key(key: Any) -> str:
+        return json_dumps(key, compact=True)
+
+    def get(self, namespace: str, key: Any) -> Any | None:
+        if not self.enabled(namespace):
+            return None
+
+        def lookup(conn: sqlite3.Connection) -> tuple[str] | None:
+            return conn.execute(
+                "SELECT value FROM entries "
+                "WHERE namespace = ? AND key = ? AND expires >= ?",
+                (namespace, self._key(key), time.time()),
+            ).fetchone()
+
+        row = self._store.run("lookup", lookup, None)
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: Any, value: Any) -> None:
+        if not self.enabled(namespace) or value is None:
+            return
+        self._store.run(
+            "update",
+            lambda conn: conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    namespace,
+                    self._key(key),
+                    json_dumps(value, compact=True),
+                    time.time() + self.ttls[namespace],
+                ),
+            ),
+            None,
+        )
+
+    def close(self) -> None:
+        self._store.close()
+
+
+_persistent_cache: PersistentTemplateCache | None = None
+_persistent_cache_lock = threading.Lock()
+
+
+def get_persistent_template_cache() -> PersistentTemplateCache | None:
+    """The process wide cache configured by JINJA2_TEMPLATE_CACHE_PATH, if any."""
+    global _persistent_cache  # noqa: PLW0603
+    if not (path := os.environ.get("JINJA2_TEMPLATE_CACHE_PATH")):
+        return None
+    with _persistent_cache_lock:
+        if _persistent_cache is None or _persistent_cache.path != path:
+            _persistent_cache = PersistentTemplateCache(path, ttls_from_env())
+        return _persistent_cache
@@ -1,6 +1,7 @@
 import datetime
 import json
 import os
+import re
 import threading
 from collections.abc import Callable, Mapping
 from functools import cache
@@ -15,6 +16,7 @@ from sretoolbox.utils import retry
 from reconcile import queries
 from reconcile.checkpoint import url_makes_sense
 from reconcile.github_org import get_default_config
+from reconcile.status import RunningState
 from reconcile.utils import gql
 from reconcile.utils.aws_api import AWSApi
 from reconcile.utils.datetime_util import utc_now
@@ -33,6 +35,11 @@ from reconcile.utils.jinja2.filters import (
     urlunescape,
     yaml_to_dict,
 )
+from reconcile.utils.jinja2.persistent_cache import (
+    PersistentTemplateCache,
+    get_persistent_template_cache,
+)
+from reconcile.utils.metrics import jinja2_template_cache_lookups
 from reconcile.utils.secret_reader import (
     SecretNotFoundError,
     SecretReader,
@@ -118,17 +125,23 @@ class Jinja2TemplateCache:
     Create one instance per integration run and pass it to process_jinja2_template
     so all template renderings within a run share cached results. A fresh instance
     per run prevents stale data across loop iterations in run_integration.py.
+
+    Lookups that are safe to keep across runs are additionally stored in the
+    optional persistent tier (see persistent_cache.py), which is shared by all
+    instances of the process.
     """
 
     GITHUB = "github"
+    GITHUB_REF = "github_ref"
     QUERY = "query"
     S3 = "s3"
     S3_LS = "s3_ls"
     VAULT = "vault"
 
-    _NAMESPACES = (GITHUB, QUERY, S3, S3_LS, VAULT)
+    _NAMESPACES = (GITHUB, GITHUB_REF, QUERY, S3, S3_LS, VAULT)
 
-    def __init__(self) -> None:
+    def __init__(self, persistent: PersistentTemplateCache | None = None) -> None:
+        self.persistent = persistent or get_persistent_template_cache()
         self._stores: dict[str, dict[Any, Any]] = {ns: {} for ns in self._NAMESPACES}
         self._locks: dict[str, dict[Any, threading.Lock]] = {
             ns: {} for ns in self._NAMESPACES
@@ -145,16 +158,65 @@ class Jinja2TemplateCache:
                 locks[key] = threading.Lock()
             return locks[key]
 
-    def get_or_set(self, namespace: str, key: Any, compute: Callable[[], Any]) -> Any:
+    def persistent_enabled(self, namespace: str) -> bool:
+        return self.persistent is not None and self.persistent.enabled(namespace)
+
+    def get_or_set(
+        self,
+        namespace: str,
+        key: Any,
+        compute: Callable[[], Any],
+        persist: bool = True,
+    ) -> Any:
+        """Return the cached value of key or compute it.
+
+        `persist` must only be set for keys which identify immutable data
+        or data that is fine to be as old as the TTL of the namespace.
+        """
+        result = "hit"
         with self._lock_for(namespace, key):
             if key not in self._stores[namespace]:
-                self._stores[namespace][key] = compute()
+                persistent = self.persistent if persist else None
+                value = persistent.get(namespace, key) if persistent else None
+                if value is not None:
+                    result = "persistent_hit"
+                else:
+                    result = "miss"
+                    value = compute()
+                    if persistent:
+                        persistent.set(namespace, key, value)
+                self._stores[namespace][key] = value
+        jinja2_template_cache_lookups.labels(
+            integration=RunningState().integration,
+            namespace=namespace,
+            result=result,
+        ).inc()
         return self._stores[namespace][key]
 
 
+GIT_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+
+def _resolve_github_ref(repo: str, ref: str, cache: Jinja2TemplateCache) -> str:
+    if GIT_SHA_RE.match(ref):
+        return ref
+
+    def _fetch() -> str:
+        return init_github().get_repo(repo).get_commit(ref).sha
+
+    # branches move, so refs are only resolved once per run
+    return cache.get_or_set(
+        Jinja2TemplateCache.GITHUB_REF, (repo, ref), _fetch, persist=False
+    )
+
+
 def _fetch_github_file_content(
     repo: str, path: str, ref: str, cache: Jinja2TemplateCache
 ) -> str:
+    if cache.persistent_enabled(Jinja2TemplateCache.GITHUB):
+        # file contents are only persisted by commit sha, so they never go stale
+        ref = _resolve_github_ref(repo, ref, cache)
+
     def _fetch() -> str:
         gh = init_github()
         content = GithubRepositoryApi.get_raw_file(
@@ -164,7 +226,12 @@ def _fetch_github_file_content(
         )
         return content.decode("utf-8")
 
-    return cache.get_or_set(Jinja2TemplateCache.GITHUB, (repo, path, ref), _fetch)
+    return cache.get_or_set(
+        Jinja2TemplateCache.GITHUB,
+        (repo, path, ref),
+        _fetch,
+        persist=bool(GIT_SHA_RE.match(ref)),
+    )
 
 
 def lookup_github_file_content(
@@ -336,7 +403,10 @@ def lookup_secret(
         except Exception as e:
             raise FetchSecretError(e) from e
 
-    secret_data = cache.get_or_set(Jinja2TemplateCache.VAULT, cache_key, _fetch)
+    # only pinned versions are immutable and safe to keep across runs
+    secret_data = cache.get_or_set(
+        Jinja2TemplateCache.VAULT, cache_key, _fetch, persist=version is not None
+    )
     if secret_data is None:
         if allow_not_found:
             return None
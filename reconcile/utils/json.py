@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import asdict, is_dataclass
 from datetime import date, datetime
@@ -11,10 +12,12 @@ from pydantic import BaseModel
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from typing import IO
 
     from pydantic.main import IncEx
 
 JSON_COMPACT_SEPARATORS = (",", ":")
+JSON_DUMP_BUFFER_SIZE = 64 * 1024
 
 
 def pydantic_encoder(obj: Any) -> Any:
@@ -77,3 +80,53 @@ def json_dumps(
         cls=cls,
         default=defaults,
     )
+
+
+def json_dump(
+    data: Any,
+    fp: IO[str] | None = None,
+    *,
+    compact: bool = False,
+    indent: int | None = None,
+    cls: type[json.JSONEncoder] | None = None,
+    defaults: Callable | None = None,
+) -> str:
+    """
+    Stream `data` to `fp` formatted exactly like `json_dumps` and return the
+    sha256 hex digest of the written document. The document is never held
+    in memory as a whole, which matters for very large structures.
+
+    Args:
+        data: The data to serialize.
+        fp: A text file to write to. If None, only the digest is calculated.
+        compact: If True, use compact separators (no spaces after commas or colons).
+        indent: If specified, pretty-print the JSON with this many spaces of indentation.
+        cls: A custom JSONEncoder subclass to use for serialization.
+    Returns:
+        The sha256 hex digest of the JSON document.
+    """
+    encoder = (cls or json.JSONEncoder)(
+        indent=indent,
+        separators=JSON_COMPACT_SEPARATORS if compact else None,
+        sort_keys=True,
+        default=defaults,
+    )
+    digest = hashlib.sha256()
+    buffer: list[str] = []
+    buffered = 0
+
+    def flush() -> None:
+        chunk = "".join(buffer)
+        digest.update(chunk.encode("utf-8"))
+        if fp is not None:
+            fp.write(chunk)
+        buffer.clear()
+
+    for chunk in encoder.iterencode(data):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= JSON_DUMP_BUFFER_SIZE:
+            flush()
+            buffered = 0
+    flush()
+    return digest.hexdigest()
@@ -0,0 +1,191 @@
+"""Incremental reading of large JSON documents.
+
+`JSONStreamReader` walks a JSON document from a text stream without loading
+it as a whole. Objects and arrays can be iterated member by member, values
+of interest are decoded with `value()` and everything else is skipped
+without building Python objects, so memory is bounded by the largest value
+that is actually decoded.
+
+    reader = JSONStreamReader(fp)
+    for key in reader.object_items():
+        if key == "items":
+            for _ in reader.array_items():
+                handle(reader.value())
+
+Members that are not consumed by the caller are skipped automatically.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+READ_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_SPECIAL = re.compile(r'["\\]')
+_CONTAINER_SPECIAL = re.compile(r'["{}\[\]]')
+_SCALAR = re.compile(r"[^,:{}\[\]\s]*")
+
+
+class JSONStreamReader:
+    def __init__(self, fp: IO[str], read_size: int = READ_SIZE) -> None:
+        self._fp = fp
+        self._read_size = read_size
+        self._buf = ""
+        self._pos = 0
+        # absolute offset of self._buf[0] in the stream
+        self._base = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def _fill(self, size: int | None = None) -> bool:
+        """Read more data, returns False at the end of the stream."""
+        if self._eof:
+            return False
+        if self._pos > len(self._buf) // 2:
+            self._base += self._pos
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        data = self._fp.read(max(size or 0, self._read_size))
+        if not data:
+            self._eof = True
+            return False
+        self._buf += data
+        return True
+
+    def _offset(self) -> int:
+        return self._base + self._pos
+
+    def _peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the stream."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _members(self, close: str) -> Iterator[None]:
+        """Position at every member of the container opened before."""
+        if self._peek() == close:
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self._peek()
+            self._pos += 1
+            if char == close:
+                return
+            if char != ",":
+                raise self._error(f"Expecting ',' or '{close}'")
+
+    def _consumed(self, start: int) -> None:
+        if self._offset() == start:
+            self.skip()
+
+    def object_items(self) -> Iterator[str]:
+        """
+        Iterate the keys of the object at the current position. After each key
+        the reader is positioned at its value, which is skipped unless the
+        caller consumes it.
+        """
+        self._expect("{")
+        for _ in self._members("}"):
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self._expect(":")
+            start = self._offset()
+            yield key
+            self._consumed(start)
+
+    def array_items(self) -> Iterator[None]:
+        """
+        Position the reader at each element of the array at the current
+        position. Elements are skipped unless the caller consumes them.
+        """
+        self._expect("[")
+        for _ in self._members("]"):
+            start = self._offset()
+            yield None
+            self._consumed(start)
+
+    def value(self) -> Any:
+        """Decode the value at the current position."""
+        if self._peek() not in {'"', "{", "["}:
+            # a prefix of a number is a valid number, make sure it is complete
+            while self._scalar_end() == len(self._buf) and self._fill():
+                pass
+        while True:
+            try:
+                value, self._pos = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # the value is incomplete, grow the buffer geometrically to
+                # keep decoding of large values linear
+                if self._fill(len(self._buf) - self._pos):
+                    continue
+                raise
+            return value
+
+    def _scalar_end(self) -> int:
+        return _SCALAR.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+
+    def _skip_string(self) -> None:
+        self._pos += 1
+        while True:
+            m = _STRING_SPECIAL.search(self._buf, self._pos)
+            if m is None:
+                self._pos = len(self._buf)
+            elif m.group() == '"':
+                self._pos = m.end()
+                return
+            elif m.end() < len(self._buf):
+                # skip the escaped character
+                self._pos = m.end() + 1
+                continue
+            else:
+                self._pos = m.start()
+            if not self._fill():
+                raise self._error("Unterminated string")
+
+    def skip(self) -> None:
+        """Skip the value at the current position without decoding it."""
+        char = self._peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in {"{", "["}:
+            while True:
+                self._pos = self._scalar_end()
+                if self._pos < len(self._buf) or not self._fill():
+                    return
+        depth = 0
+        while True:
+            m = _CONTAINER_SPECIAL.search(self._buf, self._pos)
+            if m is None:
+                self._pos = len(self._buf)
+                if not self._fill():
+                    raise self._error("Unterminated container")
+                continue
+            self._pos = m.start()
+            char = m.group()
+            if char == '"':
+                self._skip_string()
+                continue
+            self._pos += 1
+            depth += 1 if char in {"{", "["} else -1
+            if depth == 0:
+                return
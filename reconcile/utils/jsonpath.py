@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Hashable
 from functools import (
     lru_cache,
     reduce,
@@ -163,3 +164,71 @@ def remove_prefix_from_path(
     if suffix:
         return reduce(lambda a, b: a.child(b), suffix)
     return None
+
+
+def jsonpath_key(path: jsonpath_ng.JSONPath) -> tuple[Hashable, ...]:
+    """
+    Return the parts of a concrete JSONPath (e.g. the `full_path` of a match)
+    as hashable values: field names for fields, ints for indices and the
+    string representation for everything else. The root is ignored.
+    """
+    key: list[Hashable] = []
+    for p in jsonpath_parts(path, ignore_root=True):
+        if isinstance(p, jsonpath_ng.Fields) and len(p.fields) == 1:
+            key.append(p.fields[0])
+        elif isinstance(p, jsonpath_ng.Index):
+            key.append(p.index)
+        else:
+            key.append(str(p))
+    return tuple(key)
+
+
+class JSONPathTrie[T]:
+    """
+    Index of values by concrete JSONPaths. It finds the values stored at or
+    under a path and the values stored above a path with one walk along the
+    parts of that path, instead of comparing the path with every stored one.
+    """
+
+    def __init__(self) -> None:
+        self._values: list[T] = []
+        self._children: dict[Hashable, JSONPathTrie[T]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._values or self._children)
+
+    def add(self, path: jsonpath_ng.JSONPath, value: T) -> None:
+        node = self
+        for part in jsonpath_key(path):
+            node = node._children.setdefault(part, JSONPathTrie())
+        node._values.append(value)
+
+    def _all_values(self) -> list[T]:
+        values = list(self._values)
+        for child in self._children.values():
+            values.extend(child._all_values())
+        return values
+
+    def at_or_under(self, path: jsonpath_ng.JSONPath) -> list[T]:
+        """
+        Values stored at `path` or at paths prefixed by it.
+        """
+        node = self
+        for part in jsonpath_key(path):
+            if (child := node._children.get(part)) is None:
+                return []
+            node = child
+        return node._all_values()
+
+    def above(self, path: jsonpath_ng.JSONPath) -> list[T]:
+        """
+        Values stored at the proper prefixes of `path`.
+        """
+        values: list[T] = []
+        node = self
+        for part in jsonpath_key(path):
+            values.extend(node._values)
+            if (child := node._children.get(part)) is None:
+                break
+            node = child
+        return values
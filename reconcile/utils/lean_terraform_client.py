@@ -2,9 +2,13 @@ import json
 import logging
 import os
 import subprocess
-from collections.abc import Mapping
+import tempfile
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from typing import Any
 
+from reconcile.utils.json_stream import READ_SIZE, JSONStreamReader
+
 
 def state_rm_access_key(
     working_dirs: Mapping[str, str], account: str, user: str
@@ -62,6 +66,50 @@ def show_json(working_dir: str, path: str) -> dict[str, Any]:
     return json.loads(stdout)
 
 
+@contextmanager
+def show_json_stream(working_dir: str, path: str) -> Iterator[JSONStreamReader]:
+    """
+    Run terraform show -no-color -json <path> and read its output incrementally.
+    Plans of large accounts can be hundreds of MB, this avoids loading them as a
+    whole.
+
+    :param working_dir: The directory where the terraform files are located
+    :param path: The path to the plan file
+    :return: A reader positioned at the start of the JSON output
+    """
+    with (
+        tempfile.TemporaryFile() as stderr,
+        subprocess.Popen(
+            ["terraform", "show", "-no-color", "-json", path],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            cwd=working_dir,
+            env=_compute_terraform_env(),
+            encoding="utf-8",
+        ) as process,
+    ):
+        assert process.stdout is not None
+        try:
+            yield JSONStreamReader(process.stdout)
+        except BaseException:
+            # the rest of the plan is of no use, don't wait for it
+            process.kill()
+            process.wait()
+            stderr.seek(0)
+            if error := stderr.read().decode("utf-8"):
+                logging.warning(f"[{path}] terraform show failed: {error}")
+            raise
+        # drain what the caller didn't read, so terraform can exit
+        while process.stdout.read(READ_SIZE):
+            pass
+        if process.wait() != 0:
+            stderr.seek(0)
+            error = stderr.read().decode("utf-8")
+            msg = f"[{path}] terraform show failed: {error}"
+            logging.warning(msg)
+            raise Exception(msg)
+
+
 def init(
     working_dir: str,
     env: Mapping[str, str] | None = None,
@@ -136,3 +184,21 @@ def apply(
         working_dir=working_dir,
         env=env,
     )
+
+
+def state_pull(
+    working_dir: str,
+    env: Mapping[str, str] | None = None,
+) -> tuple[int, str, str]:
+    """
+    Run terraform state pull.
+
+    :param working_dir: The directory where the terraform files are located
+    :param env: Environment variables to pass to the terraform command
+    :return: (return_code, stdout, stderr)
+    """
+    return _terraform_command(
+        args=["terraform", "state", "pull"],
+        working_dir=working_dir,
+        env=env,
+    )
@@ -84,6 +84,32 @@ oc_get_items_duration = Histogram(
     buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf")),
 )
 
+oc_get_items_calls = Counter(
+    name="qontract_reconcile_oc_get_items_calls_total",
+    documentation="Number of API calls (oc processes or requests) issued by get_items",
+    labelnames=["integration", "cluster", "kind"],
+)
+
+gql_query_duration = Histogram(
+    name="qontract_reconcile_gql_query_seconds",
+    documentation="Duration of GraphQL queries per operation",
+    labelnames=["integration", "operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf")),
+)
+
+change_owners_change_type_duration = Histogram(
+    name="qontract_reconcile_change_owners_change_type_seconds",
+    documentation="Time spent per change-type resolving contexts and covering diffs",
+    labelnames=["integration", "change_type", "phase"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")),
+)
+
+jinja2_template_cache_lookups = Counter(
+    name="qontract_reconcile_jinja2_template_cache_lookups_total",
+    documentation="Lookups of external data in jinja2 templates by cache result",
+    labelnames=["integration", "namespace", "result"],
+)
+
 registry_reachouts = Counter(
     name="qontract_reconcile_registry_get_manifest_total",
     documentation="Number of GET requests on image registries",
@@ -120,6 +146,12 @@ gitlab_request = Counter(
     labelnames=["integration"],
 )
 
+gitlab_conditional_request = Counter(
+    name="qontract_reconcile_gitlab_conditional_request_total",
+    documentation="GET requests to the Gitlab API by response cache result",
+    labelnames=["integration", "result"],
+)
+
 ocm_request = Counter(
     name="qontract_reconcile_ocm_request_total",
     documentation="Number of calls made to OCM API",
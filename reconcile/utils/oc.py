@@ -13,7 +13,7 @@ import time
 from collections import defaultdict
 from contextlib import suppress
 from dataclasses import dataclass
-from functools import cache, wraps
+from functools import cache, partial, wraps
 from subprocess import Popen
 from threading import Lock
 from typing import TYPE_CHECKING, Any, Self, TextIO, cast
@@ -52,7 +52,12 @@ from reconcile.utils.jump_host import (
     JumphostParameters,
     JumpHostSSH,
 )
-from reconcile.utils.metrics import oc_get_items_duration, reconcile_time
+from reconcile.utils.metrics import (
+    oc_get_items_calls,
+    oc_get_items_duration,
+    reconcile_time,
+)
+from reconcile.utils.oc_informer import get_informer_registry, informer_enabled
 from reconcile.utils.openshift_resource import OpenshiftResource as OR
 from reconcile.utils.secret_reader import (
     SecretNotFoundError,
@@ -68,6 +73,8 @@ if TYPE_CHECKING:
 urllib3.disable_warnings()
 
 GET_REPLICASET_MAX_ATTEMPTS = 20
+# max number of resource names passed to a single `oc get` invocation
+GET_ITEMS_BATCH_SIZE = int(os.environ.get("OC_GET_ITEMS_BATCH_SIZE", "100"))
 DEFAULT_GROUP = ""
 PROJECT_KIND = "Project.project.openshift.io"
 POD_RECYCLE_SUPPORTED_TRIGGER_KINDS = [
@@ -499,14 +506,11 @@ class OCCli:
 
             resource_names = kwargs.get("resource_names")
             if resource_names:
-                resource_items = []
-                for resource_name in resource_names:
-                    resource_cmd = cmd + [resource_name]
-                    item = self._run_json(resource_cmd, allow_not_found=True)
-                    if item:
-                        resource_items.append(item)
-                items_list = {"items": resource_items}
+                items_list = {
+                    "items": self._get_items_by_names(kind, cmd, resource_names)
+                }
             else:
+                self._count_get_items_call(kind)
                 items_list = self._run_json(cmd)
 
             items = items_list.get("items")
@@ -521,6 +525,36 @@ class OCCli:
                 kind=kind,
             ).observe(duration)
 
+    def _get_items_by_names(
+        self, kind: str, cmd: list[str], resource_names: Iterable[str]
+    ) -> list[dict[str, Any]]:
+        """Fetch named resources with one `oc get` per batch of names.
+
+        Missing resources are skipped via --ignore-not-found. `oc` returns a
+        List for multiple names but the bare object for a single name, so
+        both shapes are handled.
+        """
+        names = list(dict.fromkeys(resource_names))
+        resource_items: list[dict[str, Any]] = []
+        for i in range(0, len(names), GET_ITEMS_BATCH_SIZE):
+            batch = names[i : i + GET_ITEMS_BATCH_SIZE]
+            self._count_get_items_call(kind)
+            result = self._run_json(
+                [*cmd, "--ignore-not-found", *batch], allow_not_found=True
+            )
+            if "items" in result:
+                resource_items.extend(result["items"] or [])
+            elif result:
+                resource_items.append(result)
+        return resource_items
+
+    def _count_get_items_call(self, kind: str) -> None:
+        oc_get_items_calls.labels(
+            integration=RunningState().integration,
+            cluster=self.cluster_name,
+            kind=kind,
+        ).inc()
+
     def get(
         self,
         namespace: str | None,
@@ -1378,6 +1412,16 @@ class OCNative(OCCli):
         self.client = self._get_client(server, token)
         self.api_resources = self.get_api_resources()
 
+        # informers outlive this client, so they are not supported through
+        # a jump host tunnel, which is torn down in cleanup
+        self.informers = (
+            get_informer_registry()
+            if informer_enabled() and not self.jump_host
+            else None
+        )
+        self._informer_token = token
+        self._informer_client_factory = partial(self._get_client, server, token)
+
         self.projects = set()
         self.init_projects = init_projects
         if self.init_projects:
@@ -1447,6 +1491,21 @@ class OCNative(OCCli):
                     if not self.project_exists(namespace):
                         return []
 
+            if self.informers and (
+                informer := self.informers.get(
+                    server=self.server or "",
+                    token=self._informer_token,
+                    client_factory=self._informer_client_factory,
+                    group_version=resource.group_version,
+                    kind=resource.kind,
+                    namespace=namespace if namespace != "cluster" else "",
+                )
+            ):
+                return informer.items(
+                    labels=kwargs.get("labels"),
+                    resource_names=kwargs.get("resource_names"),
+                )
+
             labels = ""
             if "labels" in kwargs:
                 labels_list = [f"{k}={v}" for k, v in kwargs.get("labels", {}).items()]
@@ -1456,6 +1515,7 @@ class OCNative(OCCli):
             if resource_names:
                 resource_items = []
                 for resource_name in resource_names:
+                    self._count_get_items_call(kind)
                     try:
                         item = obj_client.get(
                             name=resource_name,
@@ -1469,6 +1529,7 @@ class OCNative(OCCli):
                         pass
                 items_list = {"items": resource_items}
             else:
+                self._count_get_items_call(kind)
                 items_list = obj_client.get(
                     namespace=namespace,
                     label_selector=labels,
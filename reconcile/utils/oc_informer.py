@@ -0,0 +1,318 @@
+"""Watch-backed cache of cluster resources for OCNative.
+
+An informer does one LIST per (cluster, kind, namespace) and then keeps an
+in-memory index of the objects up to date by applying WATCH events in a
+background thread. It is meant for long-running processes (run_integration
+loop mode), where every iteration would otherwise re-list the same kinds.
+
+Informers are opt-in via OC_NATIVE_INFORMER and are kept in a process wide
+registry, so they survive the per-run OC clients.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from kubernetes.client.exceptions import ApiException
+from kubernetes.watch import Watch
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from kubernetes.dynamic import DynamicClient, Resource
+
+REQUEST_TIMEOUT = 60
+# server side timeout of a single watch request, the watch is re-established
+# afterwards from the last seen resourceVersion
+WATCH_TIMEOUT = 300
+WATCH_ERROR_BACKOFF = 5
+# an informer that failed this many times in a row is no longer trusted
+MAX_CONSECUTIVE_ERRORS = 3
+
+
+def informer_enabled() -> bool:
+    return os.environ.get("OC_NATIVE_INFORMER", "").lower() in {"true", "yes"}
+
+
+class InformerDisabledError(Exception):
+    pass
+
+
+class ResourceInformer:
+    """Keeps the objects of one kind in one namespace (or cluster wide if
+    namespace is empty) in sync with the API server.
+
+    The informer relists every `resync_interval` seconds and after the watch
+    expired (HTTP 410). If more than `max_items` objects are listed, the
+    informer stops itself and callers have to fall back to a direct LIST.
+    The same applies while the informer can't keep up with the API server,
+    i.e. after repeated errors or if the last successful list is overdue.
+    """
+
+    def __init__(
+        self,
+        resource: Resource,
+        namespace: str,
+        resync_interval: float,
+        max_items: int,
+    ) -> None:
+        self.resource = resource
+        self.namespace = namespace
+        self.resync_interval = resync_interval
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._index: dict[tuple[str, str], dict[str, Any]] = {}
+        self._resource_version: str | None = None
+        self._synced_at = 0.0
+        self._errors = 0
+        self._stop = threading.Event()
+        self._watcher: Watch | None = None
+        self._thread: threading.Thread | None = None
+        self.synced = False
+        self.disabled = False
+
+    def start(self) -> None:
+        self._list()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"informer-{self.resource.kind}-{self.namespace}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher:
+            self._watcher.stop()
+
+    @property
+    def starting(self) -> bool:
+        return self._thread is None and not self._stop.is_set()
+
+    @property
+    def stale(self) -> bool:
+        # relists are due every resync_interval, allow for the running watch
+        # and the list request to finish
+        max_age = self.resync_interval + WATCH_TIMEOUT + REQUEST_TIMEOUT
+        return (
+            self._errors >= MAX_CONSECUTIVE_ERRORS
+            or time.monotonic() - self._synced_at > max_age
+        )
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.synced
+            and not self.disabled
+            and not self.stale
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def _list(self) -> None:
+        result = self.resource.get(
+            namespace=self.namespace, _request_timeout=REQUEST_TIMEOUT
+        ).to_dict()
+        items = result.get("items") or []
+        if len(items) > self.max_items:
+            self.disabled = True
+            self.stop()
+            raise InformerDisabledError(
+                f"{self.resource.kind} in '{self.namespace}': "
+                f"{len(items)} items exceed the limit of {self.max_items}"
+            )
+        index = {self._key(item): item for item in items}
+        with self._lock:
+            self._index = index
+            self._resource_version = result["metadata"]["resourceVersion"]
+            self._synced_at = time.monotonic()
+            self.synced = True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() - self._synced_at > self.resync_interval:
+                    self._list()
+                self._watch()
+                self._errors = 0
+            except InformerDisabledError as e:
+                logging.info(f"informer disabled: {e}")
+                return
+            except ApiException as e:
+                if e.status == 410:
+                    # resourceVersion is too old, relist
+                    self._synced_at = 0.0
+                    continue
+                self._failed(e)
+            except Exception as e:
+                self._failed(e)
+
+    def _failed(self, e: Exception) -> None:
+        self._errors += 1
+        logging.warning(
+            f"informer {self.resource.kind} in '{self.namespace}' failed "
+            f"({self._errors} times in a row): {e}"
+        )
+        self._stop.wait(WATCH_ERROR_BACKOFF)
+
+    def _watch(self) -> None:
+        self._watcher = Watch()
+        timeout = min(WATCH_TIMEOUT, max(1, int(self.resync_interval)))
+        for event in self.resource.watch(
+            namespace=self.namespace or None,
+            resource_version=self._resource_version,
+            timeout=timeout,
+            watcher=self._watcher,
+        ):
+            self._apply(event["type"], event["raw_object"])
+            if self._stop.is_set():
+                return
+
+    def _apply(self, event_type: str, obj: dict[str, Any]) -> None:
+        if event_type == "ERROR":
+            if obj.get("code") == 410:
+                self._synced_at = 0.0
+            raise ApiException(status=obj.get("code"), reason=obj.get("message"))
+        with self._lock:
+            self._resource_version = obj["metadata"]["resourceVersion"]
+            if event_type in {"ADDED", "MODIFIED"}:
+                self._index[self._key(obj)] = obj
+                if len(self._index) > self.max_items:
+                    self.disabled = True
+                    self.stop()
+            elif event_type == "DELETED":
+                self._index.pop(self._key(obj), None)
+
+    @staticmethod
+    def _key(obj: Mapping[str, Any]) -> tuple[str, str]:
+        metadata = obj["metadata"]
+        return metadata.get("namespace") or "", metadata["name"]
+
+    def items(
+        self,
+        labels: Mapping[str, str] | None = None,
+        resource_names: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Copies of the matching objects, callers may modify them without
+        affecting the index.
+        """
+        with self._lock:
+            objects = list(self._index.values())
+        if resource_names:
+            names = set(resource_names)
+            objects = [o for o in objects if o["metadata"]["name"] in names]
+        if labels:
+            objects = [
+                o
+                for o in objects
+                if all(
+                    (o["metadata"].get("labels") or {}).get(k) == v
+                    for k, v in labels.items()
+                )
+            ]
+        return copy.deepcopy(objects)
+
+
+class InformerRegistry:
+    """Process wide registry of informers and the API clients they use.
+
+    Each server and token gets its own DynamicClient, so informers are not
+    affected by OCNative.cleanup closing the per-run client.
+    """
+
+    def __init__(
+        self,
+        resync_interval: float | None = None,
+        max_items: int | None = None,
+        max_informers: int | None = None,
+    ) -> None:
+        self.resync_interval = resync_interval or float(
+            os.environ.get("OC_NATIVE_INFORMER_RESYNC_SECONDS", "3600")
+        )
+        self.max_items = max_items or int(
+            os.environ.get("OC_NATIVE_INFORMER_MAX_ITEMS", "5000")
+        )
+        self.max_informers = max_informers or int(
+            os.environ.get("OC_NATIVE_INFORMER_MAX_INFORMERS", "1000")
+        )
+        self._lock = threading.Lock()
+        # keyed by server and token digest
+        self._clients: dict[tuple[str, str], DynamicClient] = {}
+        self._informers: dict[tuple[str, str, str, str, str], ResourceInformer] = {}
+
+    def get(
+        self,
+        server: str,
+        token: str,
+        client_factory: Callable[[], DynamicClient],
+        group_version: str,
+        kind: str,
+        namespace: str,
+    ) -> ResourceInformer | None:
+        """Return a synced informer or None if the caller should query the
+        API server directly. Informers are never shared between tokens."""
+        identity = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        key = (server, identity, group_version, kind, namespace)
+        with self._lock:
+            informer = self._informers.get(key)
+            if informer and informer.healthy:
+                return informer
+            if informer and (informer.disabled or informer.starting):
+                return None
+            if informer:
+                informer.stop()
+                self._informers.pop(key)
+            if len(self._informers) >= self.max_informers:
+                return None
+            if (server, identity) not in self._clients:
+                self._clients[server, identity] = client_factory()
+            resource = self._clients[server, identity].resources.get(
+                api_version=group_version, kind=kind
+            )
+            informer = ResourceInformer(
+                resource=resource,
+                namespace=namespace,
+                resync_interval=self.resync_interval,
+                max_items=self.max_items,
+            )
+            self._informers[key] = informer
+        try:
+            informer.start()
+        except InformerDisabledError as e:
+            logging.info(f"informer disabled: {e}")
+            return None
+        except Exception as e:
+            logging.debug(f"informer start failed: {e}")
+            informer.stop()
+            with self._lock:
+                self._informers.pop(key, None)
+            return None
+        return informer
+
+    def stop_all(self) -> None:
+        with self._lock:
+            for informer in self._informers.values():
+                informer.stop()
+            self._informers.clear()
+            for client in self._clients.values():
+                client.client.close()
+            self._clients.clear()
+
+
+_registry: InformerRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_informer_registry() -> InformerRegistry:
+    global _registry  # noqa: PLW0603
+    with _registry_lock:
+        if _registry is None:
+            _registry = InformerRegistry()
+        return _registry
@@ -25,6 +25,7 @@ from reconcile.utils.ocm.subscriptions import (
     build_subscription_filter,
     get_subscriptions,
 )
+from reconcile.utils.ocm_base_client import CONCURRENT_PAGES
 
 if TYPE_CHECKING:
     from collections.abc import (
@@ -136,10 +137,11 @@ def get_ocm_clusters(
     ocm_api: OCMBaseClient,
     cluster_filter: Filter,
 ) -> Generator[OCMCluster]:
-    for cluster_dict in ocm_api.get_paginated(
+    for cluster_dict in ocm_api.get_paginated_snapshot(
         api_path="/api/clusters_mgmt/v1/clusters",
         params={"search": cluster_filter.render(), "order": "creation_timestamp"},
         max_page_size=100,
+        max_concurrent_pages=CONCURRENT_PAGES,
     ):
         yield OCMCluster(**cluster_dict)
 
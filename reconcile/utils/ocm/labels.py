@@ -127,7 +127,7 @@ def get_labels(ocm_api: OCMBaseClient, filter: Filter) -> Generator[OCMLabel]:
     """
     Finds all labels that match the given filter.
     """
-    for label_dict in ocm_api.get_paginated(
+    for label_dict in ocm_api.get_paginated_snapshot(
         api_path="/api/accounts_mgmt/v1/labels",
         params={"search": filter.render(), "orderBy": "created_at"},
     ):
@@ -5,7 +5,10 @@ from reconcile.utils.ocm.base import (
     OCMSubscription,
 )
 from reconcile.utils.ocm.search_filters import Filter
-from reconcile.utils.ocm_base_client import OCMBaseClient
+from reconcile.utils.ocm_base_client import (
+    CONCURRENT_PAGES,
+    OCMBaseClient,
+)
 
 
 def get_subscriptions(
@@ -21,10 +24,11 @@ def get_subscriptions(
         # Note, that pagination is currently broken.
         # Each call will return a random order, meaning pages are not consistent.
         # ALWAYS by default use "orderBy: id", as id has an index in the db.
-        for subscription_dict in ocm_api.get_paginated(
+        for subscription_dict in ocm_api.get_paginated_snapshot(
             api_path="/api/accounts_mgmt/v1/subscriptions?fetchCapabilities=true&fetchLabels=true",
             params={"search": filter_chunk.render(), "orderBy": "id"},
             max_page_size=chunk_size,
+            max_concurrent_pages=CONCURRENT_PAGES,
         ):
             try:
                 sub = OCMSubscription(
@@ -58,10 +62,11 @@ def get_organizations(
     organizations = {}
     chunk_size = 100
     for filter_chunk in filter.chunk_by("id", chunk_size, ignore_missing=True):
-        for organization_dict in ocm_api.get_paginated(
+        for organization_dict in ocm_api.get_paginated_snapshot(
             api_path="/api/accounts_mgmt/v1/organizations?fetchCapabilities=true&fetchLabels=true",
-            params={"search": filter_chunk.render()},
+            params={"search": filter_chunk.render(), "orderBy": "id"},
             max_page_size=chunk_size,
+            max_concurrent_pages=CONCURRENT_PAGES,
         ):
             try:
                 org = OCMOrganization(
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 import logging
+import math
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed,
+)
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -16,6 +21,10 @@ from requests import (
 from sretoolbox.utils import retry
 
 from reconcile.utils.metrics import ocm_request
+from reconcile.utils.ocm_fleet_snapshot import (
+    FleetSnapshot,
+    fleet_snapshot_from_env,
+)
 from reconcile.utils.secret_reader import (
     HasSecret,
     SecretReaderBase,
@@ -23,7 +32,10 @@ from reconcile.utils.secret_reader import (
 
 if TYPE_CHECKING:
     from collections.abc import (
+        Callable,
         Generator,
+        Iterable,
+        Iterator,
         Mapping,
     )
     from types import TracebackType
@@ -31,6 +43,8 @@ if TYPE_CHECKING:
     from reconcile.gql_definitions.fragments.aus_organization import AUSOCMOrganization
 
 REQUEST_TIMEOUT_SEC = 60
+# number of pages fetched in parallel by fleet wide discovery queries
+CONCURRENT_PAGES = 5
 
 
 class OCMBaseClient:
@@ -46,12 +60,14 @@ class OCMBaseClient:
         access_token_url: str,
         access_token_client_id: str,
         session: Session | None = None,
+        fleet_snapshot: FleetSnapshot | None = None,
     ):
         self._access_token_client_secret = access_token_client_secret
         self._access_token_client_id = access_token_client_id
         self._access_token_url = access_token_url
         self._url = url
         self._session = session or Session()
+        self._fleet_snapshot = fleet_snapshot
         self._init_access_token()
         self._init_request_headers()
 
@@ -90,15 +106,29 @@ class OCMBaseClient:
         params: dict[str, Any] | None = None,
         max_page_size: int = 100,
         max_pages: int | None = None,
+        max_concurrent_pages: int = 1,
     ) -> Generator[dict[str, Any]]:
         """
         Note, that pagination is currently broken.
         Each call will return a random order, meaning pages are not consistent.
         ALWAYS by default try to use "orderBy: id", as id exists for every resource and has an index in the db.
+
+        With max_concurrent_pages > 1, the remaining pages are fetched in parallel
+        once the first page reported the total number of items. Items are yielded
+        as their pages arrive and are deduplicated by id. This requires a stable
+        order, so params must define one via `orderBy` or `order`.
         """
         params_copy = {} if not params else params.copy()
         params_copy["size"] = max_page_size
 
+        if max_concurrent_pages > 1 and (
+            "orderBy" in params_copy or "order" in params_copy
+        ):
+            yield from self._get_paginated_concurrently(
+                api_path, params_copy, max_page_size, max_pages, max_concurrent_pages
+            )
+            return
+
         while True:
             rs = self.get(api_path, params=params_copy)
             yield from rs.get("items", [])
@@ -110,6 +140,119 @@ class OCMBaseClient:
                 return
             params_copy["page"] = current_page + 1
 
+    def get_paginated_snapshot(
+        self,
+        api_path: str,
+        params: dict[str, Any] | None = None,
+        max_page_size: int = 100,
+        max_concurrent_pages: int = 1,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Like get_paginated, but served from the shared fleet snapshot if the
+        client has one. Meant for fleet discovery queries that several
+        integrations run with identical searches.
+        """
+        if not self._fleet_snapshot:
+            return self.get_paginated(
+                api_path,
+                params=params,
+                max_page_size=max_page_size,
+                max_concurrent_pages=max_concurrent_pages,
+            )
+        key = self._fleet_snapshot.key(
+            self._url, self._access_token_client_id, api_path, params
+        )
+        return iter(
+            self._fleet_snapshot.items(
+                key,
+                self._url,
+                lambda: list(
+                    self.get_paginated(
+                        api_path,
+                        params=params,
+                        max_page_size=max_page_size,
+                        max_concurrent_pages=max_concurrent_pages,
+                    )
+                ),
+            )
+        )
+
+    def _invalidate_fleet_snapshot(self) -> None:
+        if self._fleet_snapshot:
+            self._fleet_snapshot.invalidate(self._url)
+
+    def _get_paginated_concurrently(
+        self,
+        api_path: str,
+        params: dict[str, Any],
+        page_size: int,
+        max_pages: int | None,
+        max_concurrent_pages: int,
+    ) -> Generator[dict[str, Any]]:
+        seen_ids: set[str] = set()
+
+        def new_items(page: Mapping[str, Any]) -> Generator[dict[str, Any]]:
+            for item in page.get("items", []):
+                item_id = item.get("id")
+                if item_id is not None:
+                    if item_id in seen_ids:
+                        continue
+                    seen_ids.add(item_id)
+                yield item
+
+        first_page = self.get(api_path, params=params)
+        yield from new_items(first_page)
+        if first_page.get("size", len(first_page.get("items", []))) < page_size:
+            return
+        total = first_page.get("total")
+        if total is None:
+            # no total, so the number of pages is unknown
+            yield from self._get_paginated_from(
+                api_path, params, page_size, 2, max_pages, new_items
+            )
+            return
+
+        last_page = math.ceil(total / page_size)
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrent_pages)
+        try:
+            futures = {
+                executor.submit(self.get, api_path, {**params, "page": str(page)}): page
+                for page in range(2, last_page + 1)
+            }
+            last_page_full = False
+            for future in as_completed(futures):
+                page = future.result()
+                yield from new_items(page)
+                if futures[future] == last_page:
+                    last_page_full = page.get("size", 0) >= page_size
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if last_page_full and (max_pages is None or last_page < max_pages):
+            # items were added since the first page was fetched
+            yield from self._get_paginated_from(
+                api_path, params, page_size, last_page + 1, max_pages, new_items
+            )
+
+    def _get_paginated_from(
+        self,
+        api_path: str,
+        params: dict[str, Any],
+        page_size: int,
+        page: int,
+        max_pages: int | None,
+        new_items: Callable[[Mapping[str, Any]], Iterable[dict[str, Any]]],
+    ) -> Generator[dict[str, Any]]:
+        while max_pages is None or page <= max_pages:
+            rs = self.get(api_path, params={**params, "page": str(page)})
+            yield from new_items(rs)
+            if rs.get("size", len(rs.get("items", []))) < page_size:
+                return
+            page += 1
+
     def post(
         self,
         api_path: str,
@@ -123,6 +266,7 @@ class OCMBaseClient:
             params=params,
             timeout=REQUEST_TIMEOUT_SEC,
         )
+        self._invalidate_fleet_snapshot()
         try:
             r.raise_for_status()
         except Exception:
@@ -145,6 +289,7 @@ class OCMBaseClient:
             params=params,
             timeout=REQUEST_TIMEOUT_SEC,
         )
+        self._invalidate_fleet_snapshot()
         try:
             r.raise_for_status()
         except Exception:
@@ -154,6 +299,7 @@ class OCMBaseClient:
     def delete(self, api_path: str) -> None:
         ocm_request.labels(verb="DELETE", client_id=self._access_token_client_id).inc()
         r = self._session.delete(f"{self._url}{api_path}", timeout=REQUEST_TIMEOUT_SEC)
+        self._invalidate_fleet_snapshot()
         try:
             r.raise_for_status()
         except Exception:
@@ -227,4 +373,5 @@ def init_ocm_base_client(
         access_token_url=cfg.access_token_url,
         access_token_client_id=cfg.access_token_client_id,
         session=session,
+        fleet_snapshot=fleet_snapshot_from_env(),
     )
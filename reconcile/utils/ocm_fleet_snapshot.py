@@ -0,0 +1,149 @@
+"""Shared snapshot of OCM fleet discovery results.
+
+Integrations like ocm-labels, aus, ocm-clusters or fleet-labeler discover
+the same subscriptions, organizations, labels and clusters with identical
+searches every few minutes. With OCM_FLEET_SNAPSHOT_PATH set, the results of
+these searches are stored in a sqlite database for OCM_FLEET_SNAPSHOT_TTL
+seconds and shared by all integrations running on the same node. Each
+process keeps the decoded results in memory and only reloads them once
+another process refreshed the snapshot.
+
+Snapshots are keyed by OCM environment, client id and the rendered search,
+so results are never shared between credentials. Any write through an
+OCMBaseClient drops the snapshots of its OCM environment.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from reconcile.utils.json import json_dumps
+from reconcile.utils.sqlite_cache import SqliteStore
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable, Mapping
+
+DEFAULT_TTL = 300
+
+
+class FleetSnapshot:
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL) -> None:
+        self.path = path
+        self.ttl = ttl
+        # key -> (written timestamp of the sqlite row, items), only accessed
+        # while holding the store's lock
+        self._memory: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._store = SqliteStore(
+            path,
+            "OCM fleet snapshot",
+            [
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "key TEXT PRIMARY KEY, ocm_url TEXT NOT NULL, items TEXT NOT NULL, "
+                "written REAL NOT NULL, expires REAL NOT NULL)"
+            ],
+        )
+
+    @staticmethod
+    def key(
+        ocm_url: str,
+        client_id: str,
+        api_path: str,
+        params: Mapping[str, Any] | None,
+    ) -> str:
+        query = json_dumps(
+            {"client_id": client_id, "api_path": api_path, "params": params or {}},
+            compact=True,
+        )
+        return f"{ocm_url}:{hashlib.sha256(query.encode('utf-8')).hexdigest()}"
+
+    def _lookup(
+        self, conn: sqlite3.Connection, key: str
+    ) -> list[dict[str, Any]] | None:
+        row = conn.execute(
+            "SELECT written, expires FROM snapshots WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        written = row[0]
+        if (cached := self._memory.get(key)) and cached[0] == written:
+            return cached[1]
+        row = conn.execute(
+            "SELECT items FROM snapshots WHERE key = ? AND written = ?",
+            (key, written),
+        ).fetchone()
+        if row is None:
+            return None
+        items = json.loads(row[0])
+        self._memory[key] = (written, items)
+        return items
+
+    def _write(
+        self,
+        conn: sqlite3.Connection,
+        key: str,
+        ocm_url: str,
+        items: list[dict[str, Any]],
+    ) -> None:
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots "
+            "(key, ocm_url, items, written, expires) VALUES (?, ?, ?, ?, ?)",
+            (key, ocm_url, json_dumps(items, compact=True), now, now + self.ttl),
+        )
+        self._memory[key] = (now, items)
+
+    def items(
+        self,
+        key: str,
+        ocm_url: str,
+        fetch: Callable[[], list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """
+        Return the snapshot for key, calling fetch if there is no
+        current one. The returned items are shared, don't modify them.
+        """
+        items = self._store.run("lookup", lambda conn: self._lookup(conn, key), None)
+        if items is not None:
+            return items
+
+        items = fetch()
+        self._store.run(
+            "store", lambda conn: self._write(conn, key, ocm_url, items), None
+        )
+        return items
+
+    def invalidate(self, ocm_url: str) -> None:
+        """Drop all snapshots of an OCM environment."""
+
+        def invalidate(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM snapshots WHERE ocm_url = ?", (ocm_url,))
+            self._memory = {
+                k: v for k, v in self._memory.items() if not k.startswith(f"{ocm_url}:")
+            }
+
+        self._store.run("invalidation", invalidate, None)
+
+
+_snapshots: dict[str, FleetSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def fleet_snapshot_from_env() -> FleetSnapshot | None:
+    """
+    The process wide snapshot configured via OCM_FLEET_SNAPSHOT_PATH and
+    OCM_FLEET_SNAPSHOT_TTL, or None if snapshots are disabled.
+    """
+    path = os.environ.get("OCM_FLEET_SNAPSHOT_PATH")
+    if not path:
+        return None
+    with _snapshots_lock:
+        if path not in _snapshots:
+            ttl = float(os.environ.get("OCM_FLEET_SNAPSHOT_TTL", DEFAULT_TTL))
+            _snapshots[path] = FleetSnapshot(path, ttl=ttl)
+        return _snapshots[path]
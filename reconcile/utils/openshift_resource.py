@@ -77,6 +77,15 @@ QONTRACT_ANNOTATIONS = {
 
 
 class OpenshiftResource:
+    __slots__ = (
+        "_body",
+        "_sha256sum",
+        "caller_name",
+        "error_details",
+        "integration",
+        "integration_version",
+    )
+
     def __init__(
         self,
         body: dict[str, Any],
@@ -94,6 +103,38 @@ class OpenshiftResource:
         if validate_k8s_object:
             self.verify_valid_k8s_object()
 
+    @property
+    def body(self) -> dict[str, Any]:
+        return self._body
+
+    @body.setter
+    def body(self, body: dict[str, Any]) -> None:
+        self._body = body
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """
+        Drops the memoized sha256sum. Replacing the body does this
+        automatically, in-place modifications of the body after the
+        sha256sum has been calculated must call this explicitly.
+        """
+        self._sha256sum: str | None = None
+
+    def compact(self) -> None:
+        """
+        Drops metadata.managedFields, which is never compared against the
+        desired state, to reduce the memory footprint of current state
+        resources. status is kept: desired resources may define it and both
+        comparators expect it on the current resource. The body is replaced by
+        a shallow copy, the dict passed in by the caller is left untouched.
+        """
+        metadata = self.body.get("metadata")
+        if metadata and "managedFields" in metadata:
+            self.body = {
+                **self.body,
+                "metadata": {k: v for k, v in metadata.items() if k != "managedFields"},
+            }
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, OpenshiftResource):
             return False
@@ -351,9 +392,10 @@ class OpenshiftResource:
             openshift_resource: new OpenshiftResource object with
                 annotations.
         """
-        body = self.canonicalize(self.body) if canonicalize else self.body
-
-        sha256sum = self.calculate_sha256sum(self.serialize(body))
+        if canonicalize:
+            sha256sum = self.sha256sum()
+        else:
+            sha256sum = self.calculate_sha256sum(self.serialize(self.body))
 
         # create new body object
         body = copy.deepcopy(self.body)
@@ -374,13 +416,19 @@ class OpenshiftResource:
         if self.caller_name:
             annotations[QONTRACT_ANNOTATION_CALLER_NAME] = self.caller_name
 
-        return OpenshiftResource(body, self.integration, self.integration_version)
+        annotated = OpenshiftResource(body, self.integration, self.integration_version)
+        if canonicalize:
+            # canonicalize drops the qontract annotations, so the annotated
+            # resource has the same canonical form
+            annotated._sha256sum = sha256sum
+        return annotated
 
     def sha256sum(self) -> str:
-        body = self.annotate().body
-
-        annotations = body["metadata"]["annotations"]
-        return annotations["qontract.sha256sum"]
+        if self._sha256sum is None:
+            self._sha256sum = self.calculate_sha256sum(
+                self.serialize(self.canonicalize(self.body))
+            )
+        return self._sha256sum
 
     def to_json(self) -> str:
         return self.serialize(self.body)
@@ -683,6 +731,7 @@ class ResourceInventory:
         name: str,
         value: OpenshiftResource,
     ) -> None:
+        value.compact()
         with self._lock:
             current = self._clusters[cluster][namespace][resource_type]["current"]
             current[name] = value
@@ -1,16 +1,17 @@
 import logging
-import multiprocessing
-from collections.abc import Callable, Iterable, Mapping
+import time
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
+from functools import reduce
 from typing import Any
 
-from deepdiff import DeepHash
+import jsonpath_ng
 from jsonpath_ng.ext.parser import parse
 
 from reconcile.change_owners.diff import (
-    Diff,
     DiffType,
-    extract_diffs,
+    StructuralHasher,
+    extract_identifier_from_object,
 )
 from reconcile.utils.jsonpath import apply_constraint_to_path
 from reconcile.utils.runtime.integration import (
@@ -18,6 +19,8 @@ from reconcile.utils.runtime.integration import (
     ShardedRunProposal,
 )
 
+StatePath = tuple[str | int, ...]
+
 
 @dataclass
 class DesiredStateDiff:
@@ -47,54 +50,19 @@ class DesiredStateDiff:
         return not self.diff_found
 
 
-def find_changed_shards(
-    diffs: Iterable[Diff],
-    previous_desired_state: Mapping[str, Any],
-    current_desired_state: Mapping[str, Any],
-    sharding_config: DesiredStateShardConfig,
-) -> set[str]:
-    """
-    Finds the affected desired state shards introduced by a set of diffs. The
-    affected shards are determined by the shard path selectors from the
-    provided `DesiredStateShardConfig`.
+@dataclass(frozen=True)
+class StateDiff:
     """
-    affected_shards = set()
-    for d in diffs:
-        for shard_path_spec in sharding_config.shard_path_selectors:
-            shard_path = apply_constraint_to_path(parse(shard_path_spec), d.path)
-            if shard_path:
-                if d.diff_type in {DiffType.CHANGED, d.diff_type.REMOVED}:
-                    affected_shards.update({
-                        shard.value for shard in shard_path.find(previous_desired_state)
-                    })
-                if d.diff_type in {DiffType.CHANGED, d.diff_type.ADDED}:
-                    affected_shards.update({
-                        shard.value for shard in shard_path.find(current_desired_state)
-                    })
-    return affected_shards
-
-
-EXTRACT_TASK_RESULT_KEY_DIFFS = "diffs"
-EXTRACT_TASK_RESULT_KEY_ERROR = "error"
+    A single difference between two desired states.
 
-
-def _extract_diffs_task(
-    extraction_function: Callable[
-        [Mapping[str, Any], Mapping[str, Any]], Iterable[Diff]
-    ],
-    previous_desired_state: Mapping[str, Any],
-    current_desired_state: Mapping[str, Any],
-    return_value: dict,
-) -> None:
-    """
-    A multiprocessing task that extracts diffs from two desired states
-    and stores them in a return value dictionary.
+    List items are matched regardless of their position, so a changed item can
+    live at different indices in both states. The location is therefore tracked
+    in both states, `None` meaning the value does not exist in that state.
     """
-    try:
-        diffs = extraction_function(previous_desired_state, current_desired_state)
-        return_value[EXTRACT_TASK_RESULT_KEY_DIFFS] = diffs
-    except BaseException as e:
-        return_value[EXTRACT_TASK_RESULT_KEY_ERROR] = e
+
+    diff_type: DiffType
+    previous_path: StatePath | None
+    current_path: StatePath | None
 
 
 class DiffDetectionTimeoutError(Exception):
@@ -109,66 +77,198 @@ class DiffDetectionFailureError(Exception):
     """
 
 
-def extract_diffs_with_timeout(
-    extraction_function: Callable[
-        [Mapping[str, Any], Mapping[str, Any]], Iterable[Diff]
-    ],
+class _StateWalker:
+    def __init__(self, hasher: StructuralHasher, deadline: float | None) -> None:
+        self.hasher = hasher
+        self.deadline = deadline
+
+    def walk(
+        self,
+        previous: Any,
+        current: Any,
+        previous_path: StatePath,
+        current_path: StatePath,
+    ) -> Iterator[StateDiff]:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise DiffDetectionTimeoutError()
+        if self.hasher.hash(previous) == self.hasher.hash(current):
+            # equal subtrees, nothing to look at
+            return
+        if isinstance(previous, dict) and isinstance(current, dict):
+            yield from self._walk_mappings(
+                previous, current, previous_path, current_path
+            )
+        elif isinstance(previous, list | tuple) and isinstance(current, list | tuple):
+            yield from self._walk_lists(previous, current, previous_path, current_path)
+        else:
+            yield StateDiff(DiffType.CHANGED, previous_path, current_path)
+
+    def _walk_mappings(
+        self,
+        previous: dict[Any, Any],
+        current: dict[Any, Any],
+        previous_path: StatePath,
+        current_path: StatePath,
+    ) -> Iterator[StateDiff]:
+        for key, value in previous.items():
+            if key in current:
+                yield from self.walk(
+                    value, current[key], (*previous_path, key), (*current_path, key)
+                )
+            else:
+                yield StateDiff(DiffType.REMOVED, (*previous_path, key), None)
+        for key in current:
+            if key not in previous:
+                yield StateDiff(DiffType.ADDED, None, (*current_path, key))
+
+    def _walk_lists(
+        self,
+        previous: list[Any] | tuple[Any, ...],
+        current: list[Any] | tuple[Any, ...],
+        previous_path: StatePath,
+        current_path: StatePath,
+    ) -> Iterator[StateDiff]:
+        """
+        Matches list items regardless of their position. Items with an
+        identifier are only matched by it (see compare_object_ctx_identifier),
+        the remaining items are matched by their structural hash. Unmatched
+        containers are paired up in order and compared, unmatched scalars
+        are reported as removed or added.
+        """
+        current_by_id: dict[Any, list[int]] = {}
+        current_by_hash: dict[bytes, list[int]] = {}
+        for index, item in enumerate(current):
+            if (identifier := extract_identifier_from_object(item)) is not None:
+                current_by_id.setdefault(identifier, []).append(index)
+            else:
+                current_by_hash.setdefault(self.hasher.hash(item), []).append(index)
+
+        matched: set[int] = set()
+        unmatched_previous: list[int] = []
+        for index, item in enumerate(previous):
+            if (identifier := extract_identifier_from_object(item)) is not None:
+                if candidates := current_by_id.get(identifier):
+                    current_index = candidates.pop(0)
+                    matched.add(current_index)
+                    yield from self.walk(
+                        item,
+                        current[current_index],
+                        (*previous_path, index),
+                        (*current_path, current_index),
+                    )
+                else:
+                    yield StateDiff(DiffType.REMOVED, (*previous_path, index), None)
+            elif candidates := current_by_hash.get(self.hasher.hash(item)):
+                matched.add(candidates.pop(0))
+            else:
+                unmatched_previous.append(index)
+
+        unmatched_current = [
+            index
+            for indices in current_by_hash.values()
+            for index in indices
+            if _is_container(current[index])
+        ]
+        unmatched_current.sort()
+        paired: set[int] = set()
+        for previous_index, current_index in zip(
+            (i for i in unmatched_previous if _is_container(previous[i])),
+            unmatched_current,
+            strict=False,
+        ):
+            paired.add(previous_index)
+            matched.add(current_index)
+            yield from self.walk(
+                previous[previous_index],
+                current[current_index],
+                (*previous_path, previous_index),
+                (*current_path, current_index),
+            )
+        for index in unmatched_previous:
+            if index not in paired:
+                yield StateDiff(DiffType.REMOVED, (*previous_path, index), None)
+        for index in range(len(current)):
+            if index not in matched:
+                yield StateDiff(DiffType.ADDED, None, (*current_path, index))
+
+
+def _is_container(value: Any) -> bool:
+    return isinstance(value, dict | list | tuple)
+
+
+def iter_state_diffs(
+    previous_desired_state: Any,
+    current_desired_state: Any,
+    deadline: float | None = None,
+    hasher: StructuralHasher | None = None,
+) -> Iterator[StateDiff]:
+    """
+    Lazily yields the differences between two desired states.
+
+    Both states are walked in lockstep and subtrees with equal structural
+    hashes are skipped, so the cost is proportional to the size of the change
+    rather than the size of the states. If `deadline` (a `time.monotonic()`
+    value) is reached before the walk finishes, `DiffDetectionTimeoutError` is
+    raised. Consumers can stop iterating as soon as they have seen enough.
+    """
+    walker = _StateWalker(hasher or StructuralHasher(), deadline)
+    try:
+        yield from walker.walk(previous_desired_state, current_desired_state, (), ())
+    except RecursionError as e:
+        raise DiffDetectionFailureError("desired state is nested too deeply") from e
+
+
+def _to_jsonpath(path: StatePath) -> jsonpath_ng.JSONPath:
+    parts = [
+        jsonpath_ng.Index(p) if isinstance(p, int) else jsonpath_ng.Fields(p)
+        for p in path
+    ]
+    if parts:
+        return reduce(lambda a, b: a.child(b), parts)
+    return jsonpath_ng.Root()
+
+
+def find_changed_shards(
+    diffs: Iterable[StateDiff],
     previous_desired_state: Mapping[str, Any],
     current_desired_state: Mapping[str, Any],
-    timeout_seconds: int,
-) -> list[Diff]:
-    """
-    Extracts diffs from two desired states using a dedicated extraction function.
-    If the timeout is reached, a `DiffDetectionTimeout` exception is raised.
-
-    The diff extraction is performed in a separate process for the sole purpose
-    to be able to enforce a timeout. This is necessary because the diff extraction
-    can take a long time for large desired states. Stoping the process is reasonable
-    for multiple reasons:
-        * the process can potentially take minutes to complete. that would deminish
-          the value derived from the detected diffs (e.g. sharded runs)
-        * the process can potentially take a lot of memory the longer it runs,
-          which would put more pressure on the system executing the process, e.g.
-          Jenkins
-        * experience has shown that the diff extraction process yields the most
-          valueable results when it is fast. if it takes too long, the results
-          yield contain too many diffs to be meaningful for followup processing
-    """
-    m = multiprocessing.Manager()
-    result_value = m.dict()
-
-    process = multiprocessing.Process(
-        target=_extract_diffs_task,
-        args=(
-            extraction_function,
-            previous_desired_state,
-            current_desired_state,
-            result_value,
-        ),
-    )
-    process.start()
-    process.join(timeout_seconds)
-    if process.is_alive():
-        logging.info(
-            f"timeout {timeout_seconds}s reached to find fine grained diffs. "
-            "no shard detection or sharded runs will be performed."
-        )
-        process.terminate()
-        process.join()
-        raise DiffDetectionTimeoutError()
+    sharding_config: DesiredStateShardConfig,
+) -> set[str]:
+    """
+    Finds the affected desired state shards introduced by a set of diffs. The
+    affected shards are determined by the shard path selectors from the
+    provided `DesiredStateShardConfig`.
 
-    if EXTRACT_TASK_RESULT_KEY_DIFFS in result_value:
-        return result_value[EXTRACT_TASK_RESULT_KEY_DIFFS]
+    Stops consuming `diffs` as soon as every shard is affected, since further
+    diffs can't change the result anymore.
+    """
+    shard_paths = [parse(spec) for spec in sharding_config.shard_path_selectors]
+    all_shards = {
+        shard.value
+        for shard_path in shard_paths
+        for state in (previous_desired_state, current_desired_state)
+        for shard in shard_path.find(state)
+    }
+    affected_shards: set[str] = set()
+    for d in diffs:
+        for state, path in (
+            (previous_desired_state, d.previous_path),
+            (current_desired_state, d.current_path),
+        ):
+            if path is None:
+                continue
+            jsonpath = _to_jsonpath(path)
+            for shard_path in shard_paths:
+                if constrained := apply_constraint_to_path(shard_path, jsonpath):
+                    affected_shards.update(
+                        shard.value for shard in constrained.find(state)
+                    )
+        if affected_shards >= all_shards:
+            break
+    return affected_shards
 
-    original_error = result_value.get(EXTRACT_TASK_RESULT_KEY_ERROR)
-    if original_error:
-        raise DiffDetectionFailureError() from original_error
 
-    # not every error situation of the diff extraction process
-    # will result in an exception. the lack of a result is an error
-    # indicator as well. in those cases, we raise at least
-    # a generic exception to indicate that something went wrong
-    raise DiffDetectionFailureError("unknown error during fine grained diff detection")
+EXTRACT_DIFFS_TIMEOUT_SECONDS = 10
 
 
 def build_desired_state_diff(
@@ -182,22 +282,20 @@ def build_desired_state_diff(
     shards introduced by the change between the two desired states.
     """
     # is there even a difference?
-    previous_hash = DeepHash(previous_desired_state)
-    current_hash = DeepHash(current_desired_state)
-    desired_state_diff_found = previous_hash.get(
-        previous_desired_state
-    ) != current_hash.get(current_desired_state)
+    hasher = StructuralHasher()
+    desired_state_diff_found = hasher.hash(previous_desired_state) != hasher.hash(
+        current_desired_state
+    )
 
     shards = set()
-    exract_diff_timeout_seconds = 10
     try:
         if desired_state_diff_found and sharding_config:
             # detect shards based on fine grained diffs
-            diffs = extract_diffs_with_timeout(
-                extraction_function=extract_diffs,
-                previous_desired_state=previous_desired_state,
-                current_desired_state=current_desired_state,
-                timeout_seconds=exract_diff_timeout_seconds,
+            diffs = iter_state_diffs(
+                previous_desired_state,
+                current_desired_state,
+                deadline=time.monotonic() + EXTRACT_DIFFS_TIMEOUT_SECONDS,
+                hasher=hasher,
             )
             changed_shards = find_changed_shards(
                 diffs=diffs,
@@ -214,7 +312,7 @@ def build_desired_state_diff(
     except DiffDetectionTimeoutError:
         logging.warning(
             f"unable to extract fine grained diffs for shard extraction "
-            f"within {exract_diff_timeout_seconds} seconds. continue without sharding"
+            f"within {EXTRACT_DIFFS_TIMEOUT_SECONDS} seconds. continue without sharding"
         )
     except DiffDetectionFailureError as e:
         logging.warning(
@@ -0,0 +1,253 @@
+"""Content addressed cache of files fetched from GitHub and GitLab.
+
+Resource templates are fetched by resolved commit sha and the content at a
+sha never changes, so it can be cached forever. Many saas targets share the
+same (url, path, sha), which is fetched only once per process: concurrent
+requests from threaded.run workers for the same key wait for the first one.
+If a cache directory is configured, contents are additionally kept on disk
+and shared across runs.
+
+RepoArchiveCache serves many files of one (url, sha) from a single archive
+download, which is extracted into a local directory. Extracted archives that
+were not used for ARCHIVE_MAX_AGE are removed when the cache is created.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# kind ("file" or "directory"), url, path, commit sha
+ContentKey = tuple[str, str, str, str]
+
+# seconds an extracted archive is kept on disk after its last use
+ARCHIVE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+class ArchiveMissError(Exception):
+    """The path is not available in the extracted archive."""
+
+
+class RepoContentCache:
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory
+        self._contents: dict[ContentKey, list[bytes]] = {}
+        self._locks: dict[ContentKey, threading.Lock] = {}
+        self._meta_lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _lock_for(self, key: ContentKey) -> threading.Lock:
+        with self._meta_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key: ContentKey, fetch: Callable[[], list[bytes]]) -> list[bytes]:
+        """Return the contents of key, calling fetch if they are not cached."""
+        with self._lock_for(key):
+            if key not in self._contents:
+                contents = self._read(key)
+                if contents is None:
+                    contents = fetch()
+                    self._write(key, contents)
+                self._contents[key] = contents
+            return self._contents[key]
+
+    def _path(self, key: ContentKey) -> str | None:
+        if not self.directory:
+            return None
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def _read(self, key: ContentKey) -> list[bytes] | None:
+        if not (path := self._path(key)):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return [base64.b64decode(c) for c in json.load(f)]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            # a damaged cache file is fetched again
+            logging.debug(f"unable to read cached contents of {key}: {e}")
+            return None
+
+    def _write(self, key: ContentKey, contents: list[bytes]) -> None:
+        if not (path := self._path(key)) or not self.directory:
+            return
+        try:
+            # write to a temporary file first, readers never see partial files
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.directory, delete=False
+            ) as f:
+                json.dump([base64.b64encode(c).decode() for c in contents], f)
+            os.replace(f.name, path)
+        except OSError as e:
+            logging.debug(f"unable to cache contents of {key}: {e}")
+
+
+class RepoArchiveCache:
+    """Extracted repository archives per (url, commit sha).
+
+    Every archive is downloaded once, later lookups of files and directories
+    are served from the extracted copy. A failed download is remembered as
+    well, so callers fall back to fetching single files without retrying the
+    download for every file.
+    """
+
+    def __init__(self, directory: str, max_age: int = ARCHIVE_MAX_AGE) -> None:
+        self.directory = directory
+        self._roots: dict[tuple[str, str], str | None] = {}
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._meta_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._prune(max_age)
+
+    def _prune(self, max_age: int) -> None:
+        """Remove extracted archives and leftover temporary directories that
+        were not used for max_age seconds."""
+        expiry = time.time() - max_age
+        for entry in os.scandir(self.directory):
+            try:
+                if (
+                    entry.is_dir(follow_symlinks=False)
+                    and entry.stat().st_mtime < expiry
+                ):
+                    shutil.rmtree(entry.path)
+            except OSError as e:
+                logging.debug(f"unable to prune archive {entry.path}: {e}")
+
+    def _lock_for(self, key: tuple[str, str]) -> threading.Lock:
+        with self._meta_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(
+        self, url: str, commit_sha: str, download: Callable[[IO[bytes]], None]
+    ) -> str | None:
+        """Return the directory of the extracted archive or None if the
+        archive is not available. download writes the tar.gz archive to the
+        given file."""
+        key = (url, commit_sha)
+        with self._lock_for(key):
+            if key not in self._roots:
+                self._roots[key] = self._extract(key, download)
+            return self._roots[key]
+
+    def _extract(
+        self, key: tuple[str, str], download: Callable[[IO[bytes]], None]
+    ) -> str | None:
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        root = os.path.join(self.directory, digest)
+        if os.path.isdir(root):
+            # mark as used, see _prune
+            os.utime(root)
+            return root
+        tmp_root = tempfile.mkdtemp(dir=self.directory)
+        try:
+            links: dict[str, str] = {}
+            with tempfile.TemporaryFile() as archive:
+                download(archive)
+                archive.seek(0)
+                with tarfile.open(fileobj=archive, mode="r|gz") as tar:
+                    for member in tar:
+                        self._extract_member(tar, member, tmp_root, links)
+            self._copy_links(links)
+            os.rename(tmp_root, root)
+        except Exception as e:
+            shutil.rmtree(tmp_root, ignore_errors=True)
+            if os.path.isdir(root):
+                # extracted concurrently by another process
+                return root
+            logging.info(f"unable to fetch archive of {key}: {e}")
+            return None
+        return root
+
+    @staticmethod
+    def _extract_member(
+        tar: tarfile.TarFile,
+        member: tarfile.TarInfo,
+        root: str,
+        links: dict[str, str],
+    ) -> None:
+        """Extract a regular file. Symbolic links are added to links as
+        path -> target instead, if they point inside the archive."""
+        # archives contain a single top level directory named after repo and sha
+        _, _, name = member.name.partition("/")
+        if not name or not (member.isfile() or member.issym()):
+            return
+        path = os.path.normpath(os.path.join(root, name))
+        if not path.startswith(root + os.sep):
+            raise tarfile.TarError(f"unsafe path in archive: {member.name}")
+        if member.issym():
+            target = os.path.normpath(
+                os.path.join(os.path.dirname(path), member.linkname)
+            )
+            if target.startswith(root + os.sep):
+                links[path] = target
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if (f := tar.extractfile(member)) is None:
+            return
+        with f, open(path, "wb") as out:
+            shutil.copyfileobj(f, out)
+
+    @staticmethod
+    def _copy_links(links: dict[str, str]) -> None:
+        """Replace symbolic links by copies of their targets. Links to other
+        links are resolved once their target has been copied, links whose
+        target is missing or that form a cycle are left out."""
+        while ready := {p: t for p, t in links.items() if os.path.exists(t)}:
+            for path, target in ready.items():
+                if os.path.isdir(target):
+                    shutil.copytree(target, path)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    shutil.copyfile(target, path)
+                del links[path]
+
+    @staticmethod
+    def _path(root: str, path: str) -> str:
+        full_path = os.path.normpath(os.path.join(root, path.lstrip("/")))
+        if full_path != root and not full_path.startswith(root + os.sep):
+            raise ValueError(f"path {path} is outside of the repository")
+        return full_path
+
+    def read_file(self, root: str, path: str) -> bytes:
+        try:
+            with open(self._path(root, path), "rb") as f:
+                return f.read()
+        except OSError as e:
+            raise ArchiveMissError(f"unable to read {path} from archive: {e}") from e
+
+    def read_directory(self, root: str, path: str, recursive: bool) -> list[bytes]:
+        directory = self._path(root, path)
+        if not os.path.isdir(directory):
+            raise ArchiveMissError(f"{path} is not a directory in archive")
+        if recursive:
+            files = sorted(
+                os.path.join(dirpath, name)
+                for dirpath, _, names in os.walk(directory)
+                for name in names
+            )
+        else:
+            files = []
+            for name in sorted(os.listdir(directory)):
+                if os.path.isdir(file_path := os.path.join(directory, name)):
+                    raise IsADirectoryError(f"{path}/{name} is a directory!")
+                files.append(file_path)
+        contents = []
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                contents.append(f.read())
+        return contents
@@ -0,0 +1,199 @@
+"""Cache of resolved container image digests.
+
+SaasHerder checks every image of every target against its registry and
+resolves REPO_DIGEST/IMAGE_DIGEST parameters. Most targets refer to the same
+few images, so the results are cached process wide and concurrent lookups of
+the same image are coalesced into a single registry request. Digest-pinned
+references never change and are kept until they are evicted from the LRU,
+tags only for a short TTL. Images that don't exist (yet) are not cached,
+triggers wait for them to show up. With SAASHERDER_IMAGE_CACHE_PATH set, entries are persisted in a sqlite
+database and shared across runs.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from reconcile.utils.sqlite_cache import SqliteStore
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable, Iterator
+
+DEFAULT_TAG_TTL = 300
+DEFAULT_MAX_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class ResolvedImage:
+    """An image which exists in its registry."""
+
+    url: str
+    registry_path: str
+    digest: str | None
+
+    @property
+    def url_digest(self) -> str:
+        if self.digest is None:
+            raise ValueError(f"Docker-Content-Digest header not found for {self.url}")
+        return f"{self.registry_path}@{self.digest}"
+
+
+def is_digest_pinned(image: str) -> bool:
+    return "@sha256:" in image
+
+
+class ImageDigestCache:
+    def __init__(
+        self,
+        path: str | None = None,
+        tag_ttl: float = DEFAULT_TAG_TTL,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        self.path = path
+        self.tag_ttl = tag_ttl
+        self.max_size = max_size
+        # LRU of (image, user) -> (resolved image, expiry)
+        self._images: OrderedDict[tuple[str, str], tuple[ResolvedImage, float]] = (
+            OrderedDict()
+        )
+        # locks of lookups in progress and the number of their users
+        self._locks: dict[tuple[str, str], tuple[threading.Lock, int]] = {}
+        self._meta_lock = threading.Lock()
+        self._store = (
+            SqliteStore(
+                path,
+                "image digest cache",
+                [
+                    "CREATE TABLE IF NOT EXISTS images ("
+                    "image TEXT NOT NULL, user TEXT NOT NULL, "
+                    "registry_path TEXT NOT NULL, digest TEXT NOT NULL, "
+                    "expires REAL NOT NULL, PRIMARY KEY (image, user))"
+                ],
+            )
+            if path
+            else None
+        )
+
+    @contextmanager
+    def _locked(self, key: tuple[str, str]) -> Iterator[None]:
+        """Serialize lookups of key. The lock is dropped once no lookup of
+        key is in progress anymore."""
+        with self._meta_lock:
+            lock, users = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._meta_lock:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+    def _get_cached(self, key: tuple[str, str]) -> ResolvedImage | None:
+        with self._meta_lock:
+            cached = self._images.get(key)
+            if cached is None:
+                return None
+            if cached[1] < time.time():
+                del self._images[key]
+                return None
+            self._images.move_to_end(key)
+            return cached[0]
+
+    def _set_cached(
+        self, key: tuple[str, str], image: ResolvedImage, expires: float
+    ) -> None:
+        with self._meta_lock:
+            self._images[key] = (image, expires)
+            self._images.move_to_end(key)
+            if len(self._images) > self.max_size:
+                self._images.popitem(last=False)
+
+    def _expires(self, image: str) -> float:
+        return float("inf") if is_digest_pinned(image) else time.time() + self.tag_ttl
+
+    def get(
+        self,
+        image: str,
+        user: str,
+        resolve: Callable[[], ResolvedImage | None],
+    ) -> ResolvedImage | None:
+        """Return the resolved image, calling resolve on a cache miss.
+
+        `user` identifies the credentials used to access the registry, a
+        private image is only known to exist for the same credentials.
+        """
+        key = (image, user)
+        with self._locked(key):
+            if cached := self._get_cached(key):
+                return cached
+            if (stored := self._read(key)) and stored[1] >= time.time():
+                self._set_cached(key, *stored)
+                return stored[0]
+            resolved = resolve()
+            if resolved is not None and resolved.digest is not None:
+                expires = self._expires(image)
+                self._set_cached(key, resolved, expires)
+                self._write(key, resolved, expires)
+            return resolved
+
+    def _read(self, key: tuple[str, str]) -> tuple[ResolvedImage, float] | None:
+        if not self._store:
+            return None
+
+        def lookup(conn: sqlite3.Connection) -> tuple[str, str, float] | None:
+            return conn.execute(
+                "SELECT registry_path, digest, expires FROM images "
+                "WHERE image = ? AND user = ?",
+                key,
+            ).fetchone()
+
+        row = self._store.run("lookup", lookup, None)
+        if not row:
+            return None
+        return ResolvedImage(url=key[0], registry_path=row[0], digest=row[1]), row[2]
+
+    def _write(
+        self, key: tuple[str, str], image: ResolvedImage, expires: float
+    ) -> None:
+        if not self._store:
+            return
+        self._store.run(
+            "update",
+            lambda conn: conn.execute(
+                "INSERT OR REPLACE INTO images "
+                "(image, user, registry_path, digest, expires) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (*key, image.registry_path, image.digest, expires),
+            ),
+            None,
+        )
+
+
+_image_digest_cache: ImageDigestCache | None = None
+_image_digest_cache_lock = threading.Lock()
+
+
+def get_image_digest_cache() -> ImageDigestCache:
+    """The process wide cache, configured via SAASHERDER_IMAGE_CACHE_PATH and
+    SAASHERDER_IMAGE_CACHE_TAG_TTL."""
+    global _image_digest_cache  # noqa: PLW0603
+    with _image_digest_cache_lock:
+        if _image_digest_cache is None:
+            _image_digest_cache = ImageDigestCache(
+                path=os.environ.get("SAASHERDER_IMAGE_CACHE_PATH"),
+                tag_ttl=float(
+                    os.environ.get("SAASHERDER_IMAGE_CACHE_TAG_TTL", DEFAULT_TAG_TTL)
+                ),
+            )
+        return _image_digest_cache
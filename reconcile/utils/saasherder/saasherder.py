@@ -7,13 +7,16 @@ import json
 import logging
 import os
 import re
+import shutil
+import tempfile
 from collections import (
     defaultdict,
 )
 from contextlib import suppress
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Self
+from typing import IO, TYPE_CHECKING, Any, Self
 
+import requests
 import yaml
 from github import (
     Github,
@@ -49,6 +52,15 @@ from reconcile.utils.promotion_state import (
     PromotionData,
     PromotionState,
 )
+from reconcile.utils.saasherder.content_cache import (
+    ArchiveMissError,
+    RepoArchiveCache,
+    RepoContentCache,
+)
+from reconcile.utils.saasherder.image_cache import (
+    ResolvedImage,
+    get_image_digest_cache,
+)
 from reconcile.utils.saasherder.interfaces import (
     SaasFile,
     SaasParentSaasPromotion,
@@ -140,6 +152,19 @@ class SaasHerder:
     ) -> None:
         self.error_registered = False
         self.saas_files = saas_files
+        content_cache_dir = os.environ.get("SAASHERDER_CONTENT_CACHE_DIR")
+        self.content_cache = RepoContentCache(content_cache_dir)
+        # download one archive per (repo, sha) instead of single files
+        self.archive_cache: RepoArchiveCache | None = None
+        self._archive_tmp_dir: str | None = None
+        if os.environ.get("SAASHERDER_ARCHIVE_FETCH", "").lower() in {"true", "yes"}:
+            if content_cache_dir:
+                archive_dir = os.path.join(content_cache_dir, "archives")
+            else:
+                archive_dir = self._archive_tmp_dir = tempfile.mkdtemp(
+                    prefix="saasherder-archives-"
+                )
+            self.archive_cache = RepoArchiveCache(archive_dir)
         self.repo_urls = self._collect_repo_urls()
         self.image_patterns = self._collect_image_patterns()
         self.resolve_templated_parameters(self.saas_files)
@@ -199,6 +224,8 @@ class SaasHerder:
             self.state.cleanup()
         if hasattr(self, "gitlab") and self.gitlab is not None:
             self.gitlab.cleanup()
+        if archive_tmp_dir := getattr(self, "_archive_tmp_dir", None):
+            shutil.rmtree(archive_tmp_dir, ignore_errors=True)
 
     def _register_error(self) -> None:
         self.error_registered = True
@@ -758,28 +785,38 @@ class SaasHerder:
     ) -> tuple[Any, str]:
         commit_sha = self._get_commit_sha(url, ref, github)
 
-        repo_info = VCS.parse_repo_url(url)
-        match repo_info.platform:
-            case "github":
-                repo = github.get_repo(repo_info.name)
-                content = GithubRepositoryApi.get_raw_file(
-                    repo=repo,
-                    path=path,
-                    ref=commit_sha,
-                )
-            case "gitlab":
-                if not self.gitlab:
-                    raise Exception("gitlab is not initialized")
-                if not (project := self.gitlab.get_project(url)):
-                    raise Exception(f"Could not find gitlab project for {url}")
-                content = self.gitlab.get_raw_file(
-                    project=project,
-                    path=path,
-                    ref=commit_sha,
-                )
-            case _:
-                raise Exception(f"Only GitHub and GitLab are supported: {url}")
+        def _fetch() -> list[bytes]:
+            if self.archive_cache and (
+                root := self._get_archive_root(url, commit_sha, github)
+            ):
+                try:
+                    return [self.archive_cache.read_file(root, path)]
+                except ArchiveMissError as e:
+                    logging.debug(f"{e}, fetching {url} {path} from the API")
+            repo_info = VCS.parse_repo_url(url)
+            match repo_info.platform:
+                case "github":
+                    repo = github.get_repo(repo_info.name)
+                    content = GithubRepositoryApi.get_raw_file(
+                        repo=repo,
+                        path=path,
+                        ref=commit_sha,
+                    )
+                case "gitlab":
+                    if not self.gitlab:
+                        raise Exception("gitlab is not initialized")
+                    if not (project := self.gitlab.get_project(url)):
+                        raise Exception(f"Could not find gitlab project for {url}")
+                    content = self.gitlab.get_raw_file(
+                        project=project,
+                        path=path,
+                        ref=commit_sha,
+                    )
+                case _:
+                    raise Exception(f"Only GitHub and GitLab are supported: {url}")
+            return [content]
 
+        [content] = self.content_cache.get(("file", url, path, commit_sha), _fetch)
         return yaml.safe_load(content), commit_sha
 
     @retry()
@@ -787,41 +824,91 @@ class SaasHerder:
         self, url: str, path: str, ref: str, github: Github
     ) -> tuple[list[Any], str]:
         commit_sha = self._get_commit_sha(url, ref, github)
-        resources: list[Any] = []
-        repo_info = VCS.parse_repo_url(url)
-        match repo_info.platform:
-            case "github":
-                repo = github.get_repo(repo_info.name)
-                directory = repo.get_contents(path, commit_sha)
-                if isinstance(directory, ContentFile):
-                    raise TypeError(f"Path {path} and sha {commit_sha} is a file!")
-                for f in directory:
-                    file_path = os.path.join(path, f.name)
-                    raw_file = GithubRepositoryApi.get_raw_file(
-                        repo=repo,
-                        path=file_path,
+
+        def _fetch() -> list[bytes]:
+            repo_info = VCS.parse_repo_url(url)
+            if self.archive_cache and (
+                root := self._get_archive_root(url, commit_sha, github)
+            ):
+                try:
+                    # the GitLab API returns nested files, GitHub does not
+                    return self.archive_cache.read_directory(
+                        root, path, recursive=repo_info.platform == "gitlab"
+                    )
+                except ArchiveMissError as e:
+                    logging.debug(f"{e}, fetching {url} {path} from the API")
+            match repo_info.platform:
+                case "github":
+                    repo = github.get_repo(repo_info.name)
+                    directory = repo.get_contents(path, commit_sha)
+                    if isinstance(directory, ContentFile):
+                        raise TypeError(f"Path {path} and sha {commit_sha} is a file!")
+                    return [
+                        GithubRepositoryApi.get_raw_file(
+                            repo=repo,
+                            path=os.path.join(path, f.name),
+                            ref=commit_sha,
+                        )
+                        for f in directory
+                    ]
+                case "gitlab":
+                    if not self.gitlab:
+                        raise Exception("gitlab is not initialized")
+                    if not (project := self.gitlab.get_project(url)):
+                        raise Exception(f"Could not find gitlab project for {url}")
+                    dir_contents = self.gitlab.get_directory_contents(
+                        project,
                         ref=commit_sha,
+                        path=path,
                     )
-                    result_resources = yaml.safe_load_all(raw_file)
-                    resources.extend(result_resources)
-            case "gitlab":
-                if not self.gitlab:
-                    raise Exception("gitlab is not initialized")
-                if not (project := self.gitlab.get_project(url)):
-                    raise Exception(f"Could not find gitlab project for {url}")
-                dir_contents = self.gitlab.get_directory_contents(
-                    project,
-                    ref=commit_sha,
-                    path=path,
-                )
-                for content in dir_contents.values():
-                    result_resources = yaml.safe_load_all(content)
-                    resources.extend(result_resources)
-            case _:
-                raise Exception(f"Only GitHub and GitLab are supported: {url}")
+                    return list(dir_contents.values())
+                case _:
+                    raise Exception(f"Only GitHub and GitLab are supported: {url}")
 
+        resources: list[Any] = []
+        for content in self.content_cache.get(
+            ("directory", url, path, commit_sha), _fetch
+        ):
+            resources.extend(yaml.safe_load_all(content))
         return resources, commit_sha
 
+    def _get_archive_root(
+        self, url: str, commit_sha: str, github: Github
+    ) -> str | None:
+        """The extracted archive of url at commit_sha, if archive fetching is
+        enabled and the archive is available."""
+        if not self.archive_cache:
+            return None
+
+        def _download(f: IO[bytes]) -> None:
+            repo_info = VCS.parse_repo_url(url)
+            match repo_info.platform:
+                case "github":
+                    repo = github.get_repo(repo_info.name)
+                    archive_url = repo.get_archive_link("tarball", ref=commit_sha)
+                    with requests.get(
+                        archive_url, stream=True, timeout=REQUEST_TIMEOUT
+                    ) as r:
+                        r.raise_for_status()
+                        for chunk in r.iter_content(chunk_size=1024 * 1024):
+                            f.write(chunk)
+                case "gitlab":
+                    if not self.gitlab:
+                        raise Exception("gitlab is not initialized")
+                    if not (project := self.gitlab.get_project(url)):
+                        raise Exception(f"Could not find gitlab project for {url}")
+                    project.repository_archive(
+                        sha=commit_sha,
+                        format="tar.gz",
+                        streamed=True,
+                        action=f.write,
+                        chunk_size=1024 * 1024,
+                    )
+                case _:
+                    raise Exception(f"Only GitHub and GitLab are supported: {url}")
+
+        return self.archive_cache.get(url, commit_sha, _download)
+
     @retry()
     def _get_commit_sha(self, url: str, ref: str, github: Github) -> str:
         repo_info = VCS.parse_repo_url(url)
@@ -1123,7 +1210,7 @@ class SaasHerder:
         image_patterns: Iterable[str],
         image_auth: ImageAuth,
         error_prefix: str,
-    ) -> Image | None:
+    ) -> ResolvedImage | None:
         if not image_patterns:
             logging.error(
                 f"{error_prefix} imagePatterns is empty (does not contain {image})"
@@ -1133,6 +1220,7 @@ class SaasHerder:
             logging.error(f"{error_prefix} Image is not in imagePatterns: {image}")
             return None
 
+        username, password = image_auth.username, image_auth.password
         # .dockerconfigjson
         if image_auth.docker_config:
             # we rely on the secret in vault being ordered
@@ -1143,25 +1231,30 @@ class SaasHerder:
                 username, password = (
                     base64.b64decode(auth["auth"]).decode("utf-8").split(":")
                 )
+                break
+        # else basic auth fallback for backwards compatibility
 
-                return SaasHerder._get_and_validate_image(
-                    full_image_path=image,
-                    username=username,
-                    password=password,
-                    auth_server=image_auth.auth_server,
-                    timeout=REQUEST_TIMEOUT,
-                    error_prefix=error_prefix,
-                )
+        def _resolve() -> ResolvedImage | None:
+            img = SaasHerder._get_and_validate_image(
+                full_image_path=image,
+                username=username,
+                password=password,
+                auth_server=image_auth.auth_server,
+                timeout=REQUEST_TIMEOUT,
+                error_prefix=error_prefix,
+            )
+            if img is None:
+                return None
+            registry_path = "/".join(
+                p for p in (img.registry, img.repository, img.image) if p
+            )
+            try:
+                digest = img.digest
+            except rqexc.HTTPError:
+                digest = None
+            return ResolvedImage(url=image, registry_path=registry_path, digest=digest)
 
-        # basic auth fallback for backwards compatibility
-        return SaasHerder._get_and_validate_image(
-            full_image_path=image,
-            username=image_auth.username,
-            password=image_auth.password,
-            auth_server=image_auth.auth_server,
-            timeout=REQUEST_TIMEOUT,
-            error_prefix=error_prefix,
-        )
+        return get_image_digest_cache().get(image, username or "", _resolve)
 
     @staticmethod
     def _get_and_validate_image(
@@ -1,23 +1,41 @@
 import hashlib
 import logging
 import os
+from collections.abc import Mapping
 
 LOG = logging.getLogger(__name__)
 
 SHARDS = int(os.environ.get("SHARDS", "1"))
 SHARD_ID = int(os.environ.get("SHARD_ID", "0"))
+# modulo: md5(value) % SHARDS, changing SHARDS moves almost every value
+# rendezvous: highest random weight hashing, changing SHARDS moves ~1/SHARDS
+SHARDING_MODE = os.environ.get("SHARDING_MODE", "modulo")
+# max load of a shard relative to the average in shard_assignment
+SHARDING_LOAD_FACTOR = float(os.environ.get("SHARDING_LOAD_FACTOR", "1.25"))
+
+
+def _hash(value: str) -> int:
+    h = hashlib.new("md5", usedforsecurity=False)
+    h.update(value.encode())
+    return int(h.hexdigest(), base=16)
+
+
+def _rendezvous_ranking(value: str, shards: int) -> list[int]:
+    """Shards ordered by their rendezvous score for value, best first."""
+    return sorted(range(shards), key=lambda s: (_hash(f"{s}:{value}"), s), reverse=True)
+
+
+def shard_of(value: str, shards: int = SHARDS, mode: str = SHARDING_MODE) -> int:
+    if mode == "rendezvous":
+        return _rendezvous_ranking(value, shards)[0]
+    return _hash(value) % shards
 
 
 def is_in_shard(value: str) -> bool:
     if SHARDS == 1:
         return True
 
-    h = hashlib.new("md5", usedforsecurity=False)
-    h.update(value.encode())
-    value_hex = h.hexdigest()
-    value_int = int(value_hex, base=16)
-
-    in_shard = value_int % SHARDS == SHARD_ID
+    in_shard = shard_of(value) == SHARD_ID
 
     if in_shard:
         LOG.debug("IN_SHARD TRUE: %s", value)
@@ -25,3 +43,44 @@ def is_in_shard(value: str) -> bool:
         LOG.debug("IN_SHARD FALSE: %s", value)
 
     return in_shard
+
+
+def shard_assignment(
+    weights: Mapping[str, float],
+    shards: int = SHARDS,
+    load_factor: float = SHARDING_LOAD_FACTOR,
+) -> dict[str, int]:
+    """
+    Assign weighted values to shards with rendezvous hashing and bounded loads.
+
+    Every value goes to the best ranked shard that stays below
+    load_factor * total weight / shards, so shards are balanced by weight (e.g.
+    the number of objects in a namespace) instead of by number of values.
+    Values are placed heaviest first, ties broken by name, so every shard
+    computes the same assignment from the same weights. As with plain
+    rendezvous hashing, only few values move if shards or weights change.
+    """
+    if shards == 1:
+        return dict.fromkeys(weights, 0)
+
+    total = sum(weights.values())
+    # a single value heavier than the capacity must still fit somewhere
+    capacity = max(load_factor * total / shards, max(weights.values(), default=0))
+    loads = [0.0] * shards
+    assignment: dict[str, int] = {}
+    for value, weight in sorted(weights.items(), key=lambda i: (-i[1], i[0])):
+        ranking = _rendezvous_ranking(value, shards)
+        shard = next(
+            (s for s in ranking if loads[s] + weight <= capacity),
+            min(ranking, key=lambda s: loads[s]),
+        )
+        loads[shard] += weight
+        assignment[value] = shard
+    return assignment
+
+
+def values_in_shard(weights: Mapping[str, float]) -> set[str]:
+    """The values of weights which belong to this shard, see shard_assignment."""
+    return {
+        value for value, shard in shard_assignment(weights).items() if shard == SHARD_ID
+    }
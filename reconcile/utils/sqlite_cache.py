@@ -0,0 +1,75 @@
+"""sqlite databases backing the on-disk caches.
+
+Several caches (GraphQL results, Jinja2 template lookups, image digests, OCM
+fleet snapshots) keep their entries in a sqlite database, which is shared by
+all processes running on the same node. These caches are best effort: if the
+database can't be opened or accessed, the failure is logged and callers act as
+if nothing was cached and fetch the data from its source.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# seconds to wait for a lock held by another process
+SQLITE_TIMEOUT = 30
+
+
+class SqliteStore:
+    def __init__(self, path: str, name: str, schema: Iterable[str]) -> None:
+        """
+        Open the database at path and create the tables of schema, given as
+        CREATE TABLE IF NOT EXISTS statements. `name` describes the cache in
+        log messages.
+        """
+        self.path = path
+        self.name = name
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        try:
+            conn = sqlite3.connect(
+                path,
+                timeout=SQLITE_TIMEOUT,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in schema:
+                conn.execute(statement)
+        except sqlite3.Error as e:
+            logging.warning(f"unable to open {name} {path}: {e}")
+            return
+        self._conn = conn
+
+    @property
+    def available(self) -> bool:
+        return self._conn is not None
+
+    def run[T](
+        self, action: str, fn: Callable[[sqlite3.Connection], T], default: T
+    ) -> T:
+        """
+        Call fn with the connection, serialized with other threads of this
+        process. Returns default if the database is not available or fn
+        fails with a sqlite error.
+        """
+        if self._conn is None:
+            return default
+        try:
+            with self._lock:
+                return fn(self._conn)
+        except sqlite3.Error as e:
+            logging.debug(f"{self.name} {action} failed: {e}")
+            return default
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -4,7 +4,9 @@ import contextlib
 import json
 import logging
 import os
+import threading
 from abc import abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import (
     TYPE_CHECKING,
@@ -13,8 +15,10 @@ from typing import (
 )
 
 import boto3
+from botocore.config import Config
 from botocore.errorfactory import ClientError
 from pydantic import BaseModel
+from sretoolbox.utils import threaded
 
 from reconcile.gql_definitions.common.app_interface_state_settings import (
     AppInterfaceStateConfigurationS3V1,
@@ -35,9 +39,17 @@ from reconcile.utils.secret_reader import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator, Mapping
+    from collections.abc import Callable, Generator, Iterable, Mapping
 
     from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import ObjectTypeDef
+
+# bulk operations run this many requests concurrently, the botocore connection
+# pool is sized to match so connections are reused instead of discarded
+STATE_THREAD_POOL_SIZE = int(
+    os.environ.get("APP_INTERFACE_STATE_THREAD_POOL_SIZE", "10")
+)
+STATE_MAX_POOL_CONNECTIONS = max(STATE_THREAD_POOL_SIZE, 10)
 
 
 class StateInaccessibleError(Exception):
@@ -80,7 +92,7 @@ class S3CredsBasedStateConfiguration(S3StateConfiguration):
             aws_secret_access_key=self.secret_access_key,
             region_name=self.region,
         )
-        return session.client("s3")
+        return session.client("s3", config=state_client_config())
 
 
 class S3ProfileBasedStateConfiguration(S3StateConfiguration):
@@ -88,7 +100,11 @@ class S3ProfileBasedStateConfiguration(S3StateConfiguration):
 
     def build_client(self) -> S3Client:
         session = boto3.Session(profile_name=self.profile, region_name=self.region)
-        return session.client("s3")
+        return session.client("s3", config=state_client_config())
+
+
+def state_client_config() -> Config:
+    return Config(max_pool_connections=STATE_MAX_POOL_CONNECTIONS)
 
 
 def acquire_state_settings(
@@ -223,6 +239,36 @@ class AbortStateTransactionError(Exception):
     """Raise to abort a state transaction."""
 
 
+class _MetadataCache:
+    """
+    Process wide LRU of object metadata keyed by (bucket, key, etag).
+
+    S3 ETags change with every write, so an entry never goes stale.
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._data: OrderedDict[tuple[str, str, str], dict[str, str]] = OrderedDict()
+
+    def get(self, key: tuple[str, str, str]) -> dict[str, str] | None:
+        with self._lock:
+            if (metadata := self._data.get(key)) is not None:
+                self._data.move_to_end(key)
+            return metadata
+
+    def set(self, key: tuple[str, str, str], metadata: dict[str, str]) -> None:
+        with self._lock:
+            self._data[key] = metadata
+            self._data.move_to_end(key)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+
+_metadata_cache = _MetadataCache()
+_MISSING = object()
+
+
 class State:
     """
     A state object to be used by stateful integrations.
@@ -245,6 +291,8 @@ class State:
         self.state_path = f"state/{integration}" if integration else "state"
         self.bucket = bucket
         self.client = client
+        # key path -> etag, see load_manifest
+        self._manifest: dict[str, str] | None = None
 
         # check if the bucket exists
         try:
@@ -277,6 +325,8 @@ class State:
         :raises StateInaccessibleException: if the bucket is missing or
         permissions are insufficient or a general AWS error occurred
         """
+        if self._manifest is not None:
+            return f"{self.state_path}/{key}" in self._manifest
         exists, _ = self.head(key)
         return exists
 
@@ -292,8 +342,18 @@ class State:
         permissions are insufficient or a general AWS error occurred
         """
         key_path = f"{self.state_path}/{key}"
+        if self._manifest is not None:
+            if (etag := self._manifest.get(key_path)) is None:
+                return False, {}
+            if (
+                metadata := _metadata_cache.get((self.bucket, key_path, etag))
+            ) is not None:
+                return True, dict(metadata)
         try:
             response = self.client.head_object(Bucket=self.bucket, Key=key_path)
+            _metadata_cache.set(
+                (self.bucket, key_path, response["ETag"]), response["Metadata"]
+            )
             return True, response["Metadata"]
         except ClientError as details:
             error_code = details.response.get("Error", {}).get("Code", None)
@@ -305,10 +365,7 @@ class State:
                 f"in bucket {self.bucket} - {details!s}"
             ) from None
 
-    def ls(self) -> list[str]:
-        """
-        Returns a list of keys in the state
-        """
+    def _list_objects(self) -> list[ObjectTypeDef]:
         objects = self.client.list_objects_v2(
             Bucket=self.bucket, Prefix=f"{self.state_path}/"
         )
@@ -327,7 +384,25 @@ class State:
 
             contents += objects["Contents"]
 
-        return [c["Key"].replace(self.state_path, "") for c in contents]
+        return contents
+
+    def ls(self) -> list[str]:
+        """
+        Returns a list of keys in the state
+        """
+        return [c["Key"].replace(self.state_path, "") for c in self._list_objects()]
+
+    def load_manifest(self) -> None:
+        """
+        Lists all keys of the state once and remembers their ETags.
+
+        Afterwards exists/head answer for missing keys without an API call and
+        head reuses the metadata of keys, whose ETag did not change since this
+        process has seen them. Writes of this State object keep the manifest up
+        to date, writes of other processes are only picked up by calling
+        load_manifest again.
+        """
+        self._manifest = {c["Key"]: c["ETag"] for c in self._list_objects()}
 
     def add(
         self,
@@ -353,12 +428,18 @@ class State:
     def _set(
         self, key: str, value: Any, metadata: Mapping[str, str] | None = None
     ) -> None:
-        self.client.put_object(
+        key_path = f"{self.state_path}/{key}"
+        response = self.client.put_object(
             Bucket=self.bucket,
-            Key=f"{self.state_path}/{key}",
+            Key=key_path,
             Body=json_dumps(value),
             Metadata=metadata or {},
         )
+        if self._manifest is not None:
+            self._manifest[key_path] = response["ETag"]
+            _metadata_cache.set(
+                (self.bucket, key_path, response["ETag"]), dict(metadata or {})
+            )
 
     def rm(self, key: str) -> None:
         """
@@ -371,6 +452,8 @@ class State:
         if not self.exists(key):
             raise KeyError(f"[state] key {key} does not exists in {self.state_path}")
         self.client.delete_object(Bucket=self.bucket, Key=f"{self.state_path}/{key}")
+        if self._manifest is not None:
+            self._manifest.pop(f"{self.state_path}/{key}", None)
 
     def get(self, key: str, *args: Any) -> Any:
         """
@@ -390,14 +473,27 @@ class State:
                 return args[0]
             raise
 
+    def get_many(
+        self, keys: Iterable[str], thread_pool_size: int = STATE_THREAD_POOL_SIZE
+    ) -> dict[str, Any]:
+        """
+        Gets the values of all keys concurrently. Missing keys are omitted
+        from the result.
+        """
+        keys = list(keys)
+        values = threaded.run(lambda k: self.get(k, _MISSING), keys, thread_pool_size)
+        return {k: v for k, v in zip(keys, values, strict=True) if v is not _MISSING}
+
     def get_all(self, path: str) -> dict[str, Any]:
         """
         Gets all keys and values from the state in the specified path.
+        Raises KeyError if a key is removed while the values are fetched.
         """
+        keys = [k.lstrip("/") for k in self.ls() if k.startswith(f"/{path}")]
+        values = threaded.run(self.get, keys, STATE_THREAD_POOL_SIZE)
         return {
-            k.replace(f"{path}/", "").strip("/"): self.get(k.lstrip("/"))
-            for k in self.ls()
-            if k.startswith(f"/{path}")
+            k.replace(f"{path}/", "").strip("/"): v
+            for k, v in zip(keys, values, strict=True)
         }
 
     def __getitem__(self, item: str) -> Any:
@@ -0,0 +1,163 @@
+"""Shared provider plugin cache for terraform init.
+
+Every account gets its own working directory, so `terraform init` downloads
+the same providers over and over again. With TERRAFORM_PLUGIN_CACHE_DIR set,
+all working directories share terraform's plugin cache, which stores each
+provider package once by address, version and platform.
+
+Terraform doesn't guarantee that the plugin cache is safe for concurrent
+installs. The first init of each set of required providers therefore runs
+alone, guarded by a thread lock and a file lock for other processes on the
+node. Its dependency lock file is kept next to the cache and copied into the
+working directories of later inits with the same requirements, which then
+only link the cached packages and can run in parallel.
+
+TERRAFORM_PROVIDER_MIRROR_DIR optionally points to a local filesystem mirror
+that is preferred over the public registry.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from reconcile.utils.json import json_dumps
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+TERRAFORM_CONFIG_FILE = "config.tf.json"
+DEPENDENCY_LOCK_FILE = ".terraform.lock.hcl"
+
+
+class TerraformPluginCache:
+    def __init__(self, directory: str, mirror: str | None = None) -> None:
+        self.directory = directory
+        self.mirror = mirror
+        self._lock_files_dir = os.path.join(directory, ".lock-files")
+        os.makedirs(self._lock_files_dir, exist_ok=True)
+        self._warm: set[str] = set()
+        self._locks: dict[str, threading.Lock] = {}
+        self._meta_lock = threading.Lock()
+        self.env = {"TF_PLUGIN_CACHE_DIR": directory}
+        if mirror:
+            self.env["TF_CLI_CONFIG_FILE"] = self._write_cli_config(mirror)
+
+    def _write_cli_config(self, mirror: str) -> str:
+        path = os.path.join(self._lock_files_dir, "terraformrc")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                "provider_installation {\n"
+                "  filesystem_mirror {\n"
+                f"    path = {json.dumps(mirror)}\n"
+                "  }\n"
+                "  direct {}\n"
+                "}\n"
+            )
+        return path
+
+    @staticmethod
+    def providers_key(working_dir: str) -> str:
+        """
+        Digest of the required providers of the configuration in working_dir.
+        """
+        try:
+            with open(
+                os.path.join(working_dir, TERRAFORM_CONFIG_FILE), encoding="utf-8"
+            ) as f:
+                config: dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            config = {}
+        terraform = config.get("terraform")
+        # terrascript renders the terraform block as a list of blocks
+        blocks = terraform if isinstance(terraform, list) else [terraform or {}]
+        required_providers = [b.get("required_providers") for b in blocks]
+        return hashlib.sha256(
+            json_dumps(required_providers, compact=True).encode("utf-8")
+        ).hexdigest()
+
+    def _lock_file(self, key: str) -> str:
+        return os.path.join(self._lock_files_dir, f"{key}.hcl")
+
+    def _thread_lock(self, key: str) -> threading.Lock:
+        with self._meta_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def _exclusive(self, key: str) -> Iterator[None]:
+        with (
+            self._thread_lock(key),
+            open(
+                os.path.join(self._lock_files_dir, f"{key}.lock"), "w", encoding="utf-8"
+            ) as f,
+        ):
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _seed(self, key: str, working_dir: str) -> bool:
+        target = os.path.join(working_dir, DEPENDENCY_LOCK_FILE)
+        if os.path.exists(target):
+            return True
+        try:
+            shutil.copyfile(self._lock_file(key), target)
+        except OSError:
+            return False
+        return True
+
+    def _remember(self, key: str, working_dir: str) -> None:
+        lock_file = os.path.join(working_dir, DEPENDENCY_LOCK_FILE)
+        if os.path.exists(lock_file):
+            tmp = f"{self._lock_file(key)}.{os.getpid()}.{threading.get_ident()}"
+            shutil.copyfile(lock_file, tmp)
+            os.replace(tmp, self._lock_file(key))
+        self._warm.add(key)
+
+    def init(
+        self,
+        working_dir: str,
+        run_init: Callable[[dict[str, str]], tuple[int, str, str]],
+    ) -> tuple[int, str, str]:
+        """
+        Run terraform init in working_dir via run_init, which is called with
+        the environment variables that enable the cache.
+        """
+        key = self.providers_key(working_dir)
+        if key in self._warm and self._seed(key, working_dir):
+            return run_init(self.env)
+
+        with self._exclusive(key):
+            # another thread or process might have warmed the cache meanwhile
+            self._seed(key, working_dir)
+            result = run_init(self.env)
+            if result[0] == 0:
+                self._remember(key, working_dir)
+        return result
+
+
+_caches: dict[str, TerraformPluginCache] = {}
+_caches_lock = threading.Lock()
+
+
+def plugin_cache_from_env() -> TerraformPluginCache | None:
+    """
+    The process wide plugin cache configured via TERRAFORM_PLUGIN_CACHE_DIR
+    and TERRAFORM_PROVIDER_MIRROR_DIR, or None if it is disabled.
+    """
+    directory = os.environ.get("TERRAFORM_PLUGIN_CACHE_DIR")
+    if not directory:
+        return None
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = TerraformPluginCache(
+                directory, mirror=os.environ.get("TERRAFORM_PROVIDER_MIRROR_DIR")
+            )
+        return _caches[directory]
@@ -1,5 +1,7 @@
+import hashlib
 import json
 import logging
+import os
 import re
 import shutil
 import tempfile
@@ -41,8 +43,20 @@ from reconcile.utils.external_resource_spec import (
     ExternalResourceSpec,
     ExternalResourceSpecInventory,
 )
+from reconcile.utils.json_stream import JSONStreamReader
+from reconcile.utils.state import State
+from reconcile.utils.terraform.plugin_cache import (
+    TerraformPluginCache,
+    plugin_cache_from_env,
+)
 
 ALLOWED_TF_SHOW_FORMAT_VERSION = "1.2"
+ALWAYS_ENABLED_DELETIONS = {
+    "random_id",
+    "aws_lb_target_group_attachment",
+    "aws_iam_user_policy",
+    "cloudflare_record",  # This is because a zone can contain up to one thousand records and it's not practical to require adding each record to deletionApprovals
+}
 DATE_FORMAT = "%Y-%m-%d"
 PROVIDER_LOG_REGEX = (
     r""".*\s(?:\[INFO]|\[WARN]|\[ERROR])\s.+\s(?:\[WARN]|\[ERROR])\s.*"""
@@ -51,6 +65,9 @@ PROVIDER_LOG_IGNORE_REGEX = (
     r""".*(?:ObjectLockConfigurationNotFoundError|WaitForState).*"""
 )
 TERRAFORM_LOG_LEVEL = "TRACE"  # can change to INFO after tf 0.15
+TERRAFORM_CONFIG_FILE = "config.tf.json"
+PLAN_SKIP_STATE_PREFIX = "plan-skip"
+DEFAULT_PLAN_SKIP_MAX_AGE = timedelta(hours=6)
 
 
 @dataclass
@@ -65,6 +82,18 @@ class TerraformSpec:
     working_dir: str
 
 
+@dataclass(frozen=True)
+class PlanFingerprint:
+    """
+    Identifies the inputs of a terraform plan: the generated configuration
+    and the version of the remote state it is planned against.
+    """
+
+    config_digest: str
+    state_lineage: str
+    state_serial: int
+
+
 class TerraformCommandError(CalledProcessError):
     pass
 
@@ -88,6 +117,10 @@ class TerraformClient:
         thread_pool_size: int,
         aws_api: AWSApi | None = None,
         init_users: bool = False,
+        plan_skip_state: State | None = None,
+        plan_skip_max_age: timedelta = DEFAULT_PLAN_SKIP_MAX_AGE,
+        plan_skip_read_only: bool = False,
+        plugin_cache: TerraformPluginCache | None = None,
     ) -> None:
         self.integration = integration
         self.integration_version = integration_version
@@ -99,6 +132,15 @@ class TerraformClient:
         self._aws_api = aws_api
         self._log_lock = Lock()
         self.apply_count = 0
+        # accounts with an unchanged plan are remembered in plan_skip_state
+        # and not planned again until their config or state changes, dry-runs
+        # only read the records
+        self._plan_skip_state = plan_skip_state
+        self._plan_skip_max_age = plan_skip_max_age
+        self._plan_skip_read_only = plan_skip_read_only
+        self._changed_specs: set[str] = set()
+        self.skipped_plans: set[str] = set()
+        self._plugin_cache = plugin_cache or plugin_cache_from_env()
 
         self.specs: list[TerraformSpec] = []
         self.init_specs()
@@ -122,6 +164,10 @@ class TerraformClient:
     def increment_apply_count(self) -> None:
         self.apply_count += 1
 
+    def _count_change(self, name: str) -> None:
+        self._changed_specs.add(name)
+        self.increment_apply_count()
+
     def should_apply(self) -> bool:
         return self.apply_count > 0
 
@@ -147,8 +193,12 @@ class TerraformClient:
             TerraformSpec(name=name, working_dir=wd)
             for name, wd in self.working_dirs.items()
         ]
-        for spec in self.specs:
-            self.terraform_init(spec)
+        if self._plugin_cache:
+            # concurrent inits share the provider downloads of the cache
+            threaded.run(self.terraform_init, self.specs, self.thread_pool_size)
+        else:
+            for spec in self.specs:
+                self.terraform_init(spec)
 
     @contextmanager
     def _terraform_log_file(
@@ -164,7 +214,15 @@ class TerraformClient:
     @retry(exceptions=TerraformCommandError)
     def terraform_init(self, spec: TerraformSpec) -> None:
         with self._terraform_log_file(spec.working_dir) as (f, env):
-            return_code, stdout, stderr = lean_tf.init(spec.working_dir, env=env)
+            if self._plugin_cache:
+                return_code, stdout, stderr = self._plugin_cache.init(
+                    spec.working_dir,
+                    lambda cache_env: lean_tf.init(
+                        spec.working_dir, env={**env, **cache_env}
+                    ),
+                )
+            else:
+                return_code, stdout, stderr = lean_tf.init(spec.working_dir, env=env)
             log = f.read().decode("utf-8")
         error = self.check_output(spec.name, "init", return_code, stdout, stderr, log)
         if error:
@@ -227,6 +285,13 @@ class TerraformClient:
     def terraform_plan(
         self, spec: TerraformSpec, enable_deletion: bool
     ) -> tuple[bool, list[AccountUser], bool]:
+        fingerprint = self.plan_fingerprint(spec) if self._plan_skip_state else None
+        if fingerprint and self._plan_unchanged(spec, fingerprint):
+            logging.info(["skip plan", spec.name, "config and state unchanged"])
+            with self._log_lock:
+                self.skipped_plans.add(spec.name)
+            return False, [], False
+
         with self._terraform_log_file(spec.working_dir) as (f, env):
             return_code, stdout, stderr = lean_tf.plan(
                 spec.working_dir,
@@ -240,8 +305,82 @@ class TerraformClient:
         disabled_deletion_detected, created_users = self.log_plan_diff(
             spec, enable_deletion
         )
+        if (
+            fingerprint
+            and not self._plan_skip_read_only
+            and spec.name not in self._changed_specs
+        ):
+            self._remember_unchanged_plan(spec, fingerprint)
         return disabled_deletion_detected, created_users, error
 
+    def plan_fingerprint(self, spec: TerraformSpec) -> PlanFingerprint | None:
+        """
+        The fingerprint of the next plan of spec, or None if it can't be
+        determined, e.g. because there is no remote state yet.
+        """
+        try:
+            with open(os.path.join(spec.working_dir, TERRAFORM_CONFIG_FILE), "rb") as f:
+                config_digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        return_code, stdout, _ = lean_tf.state_pull(spec.working_dir)
+        if return_code != 0 or not stdout.strip():
+            return None
+        try:
+            state = json.loads(stdout)
+            return PlanFingerprint(
+                config_digest=config_digest,
+                state_lineage=state["lineage"],
+                state_serial=int(state["serial"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _plan_skip_key(self, spec: TerraformSpec) -> str:
+        return f"{PLAN_SKIP_STATE_PREFIX}/{spec.name}"
+
+    def _plan_unchanged(
+        self, spec: TerraformSpec, fingerprint: PlanFingerprint
+    ) -> bool:
+        assert self._plan_skip_state
+        try:
+            record = self._plan_skip_state.get(self._plan_skip_key(spec), None)
+        except Exception as e:
+            logging.debug(f"unable to read plan skip state of {spec.name}: {e}")
+            return False
+        if not record:
+            return False
+        try:
+            planned_at = datetime.fromisoformat(record["planned_at"])
+            recorded_fingerprint = record["fingerprint"]
+            # plan regularly to detect drift of the real infrastructure
+            expired = utc_now() - planned_at > self._plan_skip_max_age
+        except (KeyError, TypeError, ValueError) as e:
+            logging.debug(f"invalid plan skip state of {spec.name}: {e}")
+            return False
+        return not expired and recorded_fingerprint == {
+            "config_digest": fingerprint.config_digest,
+            "state_lineage": fingerprint.state_lineage,
+            "state_serial": fingerprint.state_serial,
+        }
+
+    def _remember_unchanged_plan(
+        self, spec: TerraformSpec, fingerprint: PlanFingerprint
+    ) -> None:
+        assert self._plan_skip_state
+        record = {
+            "fingerprint": {
+                "config_digest": fingerprint.config_digest,
+                "state_lineage": fingerprint.state_lineage,
+                "state_serial": fingerprint.state_serial,
+            },
+            "planned_at": utc_now().isoformat(),
+        }
+        try:
+            self._plan_skip_state.add(self._plan_skip_key(spec), record, force=True)
+        except Exception as e:
+            logging.debug(f"unable to write plan skip state of {spec.name}: {e}")
+
     @staticmethod
     def _resource_diff_changed_fields(
         action: str, change: Mapping[str, Any]
@@ -289,129 +428,164 @@ class TerraformClient:
         deletions_allowed = enable_deletion or account_enable_deletion
         created_users: list[AccountUser] = []
 
-        output = lean_tf.show_json(spec.working_dir, name)
-        format_version = output.get("format_version")
-        if format_version != ALLOWED_TF_SHOW_FORMAT_VERSION:
-            raise NotImplementedError("terraform show untested format version")
-
+        format_version = None
+        output_changes: dict[str, Any] = {}
+        prior_outputs: dict[str, Any] = {}
         # https://www.terraform.io/docs/internals/json-format.html
+        # the plan is read incrementally, resource changes are handled one
+        # at a time and the large planned values, prior state resources and
+        # configuration are skipped without decoding them
+        with lean_tf.show_json_stream(spec.working_dir, name) as plan:
+            for key in plan.object_items():
+                match key:
+                    case "format_version":
+                        format_version = plan.value()
+                        self._check_show_format_version(format_version)
+                    case "output_changes":
+                        output_changes = plan.value()
+                    case "prior_state":
+                        prior_outputs = self._prior_state_outputs(plan)
+                    case "resource_changes":
+                        self._check_show_format_version(format_version)
+                        for _ in plan.array_items():
+                            if self._log_resource_change(
+                                name, plan.value(), deletions_allowed, created_users
+                            ):
+                                disabled_deletion_detected = True
+        self._check_show_format_version(format_version)
+
         # Terraform is not yet fully able to
         # track changes to output values, so the actions indicated may not be
         # fully accurate, but the "after" value will always be correct.
         # to overcome the "before" value not being accurate,
         # we find it in the previously initiated outputs.
-        output_changes = output.get("output_changes", {})
         for output_name, output_change in output_changes.items():
             before = self.outputs[name].get(output_name, {}).get("value")
             after = output_change.get("after")
             if before != after:
                 logging.info(["update", name, "output", output_name])
-                self.increment_apply_count()
+                self._count_change(name)
 
         # A way to detect deleted outputs is by comparing
         # the prior state with the output changes.
         # the output changes do not contain deleted outputs
         # while the prior state does. for the outputs to
         # actually be deleted, we should apply.
-        prior_outputs = (
-            output.get("prior_state", {}).get("values", {}).get("outputs", {})
-        )
         deleted_outputs = [po for po in prior_outputs if po not in output_changes]
         for output_name in deleted_outputs:
             logging.info(["delete", name, "output", output_name])
-            self.increment_apply_count()
+            self._count_change(name)
 
-        resource_changes = output.get("resource_changes")
-        if resource_changes is None:
-            return disabled_deletion_detected, created_users
+        return disabled_deletion_detected, created_users
 
-        always_enabled_deletions = {
-            "random_id",
-            "aws_lb_target_group_attachment",
-            "aws_iam_user_policy",
-            "cloudflare_record",  # This is because a zone can contain up to one thousand records and it's not practical to require adding each record to deletionApprovals
-        }
+    @staticmethod
+    def _check_show_format_version(format_version: str | None) -> None:
+        if format_version != ALLOWED_TF_SHOW_FORMAT_VERSION:
+            raise NotImplementedError("terraform show untested format version")
 
-        # https://www.terraform.io/docs/internals/json-format.html
-        for resource_change in resource_changes:
-            resource_type = resource_change["type"]
-            resource_name = resource_change["name"]
-            resource_address = resource_change["address"]
-            resource_previous_address = resource_change.get("previous_address")
-            resource_change = resource_change["change"]
-            actions = resource_change["actions"]
-            for action in actions:
-                if resource_previous_address:
-                    # the resource is being moved/renamed in the TF state
-                    with self._log_lock:
-                        logging.info([
-                            "move/rename",
-                            name,
-                            resource_previous_address,
-                            resource_address,
-                        ])
-
-                if action == "no-op":
-                    logging.debug([action, name, resource_type, resource_name])
-                    if resource_previous_address:
-                        # apply resource renaming with no-op
-                        self.increment_apply_count()
-                    else:
-                        continue
-                if action == "update" and resource_type == "aws_db_instance":
-                    self.validate_db_upgrade(name, resource_name, resource_change)
-                    # Ignore RDS modifications that are going to occur during the next
-                    # maintenance window. This can be up to 7 days away and will cause
-                    # unnecessary Terraform state updates until they complete.
-                    if self._can_skip_rds_modifications(
-                        name, resource_name, resource_change
-                    ):
-                        logging.debug(
-                            f"Resource {resource_name} contains pending changes that "
-                            f"can be skipped, should_apply will not be set."
-                        )
-                        continue
+    @staticmethod
+    def _prior_state_outputs(plan: JSONStreamReader) -> dict[str, Any]:
+        """prior_state.values.outputs without decoding the whole prior state."""
+        outputs: dict[str, Any] = {}
+        for key in plan.object_items():
+            if key != "values":
+                continue
+            for values_key in plan.object_items():
+                if values_key == "outputs":
+                    outputs = plan.value()
+        return outputs
+
+    def _log_resource_change(
+        self,
+        name: str,
+        resource_change: Mapping[str, Any],
+        deletions_allowed: bool,
+        created_users: list[AccountUser],
+    ) -> bool:
+        """
+        Log and count a single resource change of the plan of account name.
+
+        :return: whether a disabled deletion was detected
+        """
+        disabled_deletion_detected = False
+        resource_type = resource_change["type"]
+        resource_name = resource_change["name"]
+        resource_address = resource_change["address"]
+        resource_previous_address = resource_change.get("previous_address")
+        resource_change = resource_change["change"]
+        actions = resource_change["actions"]
+        for action in actions:
+            if resource_previous_address:
+                # the resource is being moved/renamed in the TF state
                 with self._log_lock:
                     logging.info([
-                        action,
+                        "move/rename",
                         name,
-                        resource_type,
-                        resource_name,
-                        self._resource_diff_changed_fields(action, resource_change),
+                        resource_previous_address,
+                        resource_address,
                     ])
-                    self.increment_apply_count()
-                if action == "create":
-                    if resource_type == "aws_iam_user_login_profile":
-                        created_users.append(AccountUser(name, resource_name))
-                if action == "delete":
-                    if resource_type in always_enabled_deletions:
-                        continue
-
-                    if not deletions_allowed and not self.deletion_approved(
-                        name, resource_type, resource_name
-                    ):
-                        disabled_deletion_detected = True
-                        instructions = (
-                            get_app_interface_custom_message(
-                                "disabled-deletion-instructions"
-                            )
-                            or ""
+
+            if action == "no-op":
+                logging.debug([action, name, resource_type, resource_name])
+                if resource_previous_address:
+                    # apply resource renaming with no-op
+                    self._count_change(name)
+                else:
+                    continue
+            if action == "update" and resource_type == "aws_db_instance":
+                self.validate_db_upgrade(name, resource_name, resource_change)
+                # Ignore RDS modifications that are going to occur during the next
+                # maintenance window. This can be up to 7 days away and will cause
+                # unnecessary Terraform state updates until they complete.
+                if self._can_skip_rds_modifications(
+                    name, resource_name, resource_change
+                ):
+                    logging.debug(
+                        f"Resource {resource_name} contains pending changes that "
+                        f"can be skipped, should_apply will not be set."
+                    )
+                    continue
+            with self._log_lock:
+                logging.info([
+                    action,
+                    name,
+                    resource_type,
+                    resource_name,
+                    self._resource_diff_changed_fields(action, resource_change),
+                ])
+                self._count_change(name)
+            if action == "create":
+                if resource_type == "aws_iam_user_login_profile":
+                    created_users.append(AccountUser(name, resource_name))
+            if action == "delete":
+                if resource_type in ALWAYS_ENABLED_DELETIONS:
+                    continue
+
+                if not deletions_allowed and not self.deletion_approved(
+                    name, resource_type, resource_name
+                ):
+                    disabled_deletion_detected = True
+                    instructions = (
+                        get_app_interface_custom_message(
+                            "disabled-deletion-instructions"
                         )
-                        logging.error(f"'delete' action is not enabled. {instructions}")
-                    if resource_type == "aws_db_instance":
-                        deletion_protected = resource_change["before"].get(
-                            "deletion_protection"
+                        or ""
+                    )
+                    logging.error(f"'delete' action is not enabled. {instructions}")
+                if resource_type == "aws_db_instance":
+                    deletion_protected = resource_change["before"].get(
+                        "deletion_protection"
+                    )
+                    if deletion_protected:
+                        disabled_deletion_detected = True
+                        logging.error(
+                            "'delete' action is not enabled for "
+                            "deletion protected RDS instance: "
+                            f"{resource_name}. Please set "
+                            "deletion_protection to false in a new MR. "
+                            "The new MR must be merged first."
                         )
-                        if deletion_protected:
-                            disabled_deletion_detected = True
-                            logging.error(
-                                "'delete' action is not enabled for "
-                                "deletion protected RDS instance: "
-                                f"{resource_name}. Please set "
-                                "deletion_protection to false in a new MR. "
-                                "The new MR must be merged first."
-                            )
-        return disabled_deletion_detected, created_users
+        return disabled_deletion_detected
 
     def deletion_approved(
         self, account_name: str, resource_type: str, resource_name: str
@@ -447,6 +621,9 @@ class TerraformClient:
         return any(errors)
 
     def terraform_apply(self, spec: TerraformSpec) -> bool:
+        if spec.name in self.skipped_plans:
+            # nothing to apply, there is no plan file either
+            return False
         with self._terraform_log_file(spec.working_dir) as (f, env):
             return_code, stdout, stderr = lean_tf.apply(
                 spec.working_dir,
@@ -662,6 +839,8 @@ class TerraformClient:
     def cleanup(self) -> None:
         if self._aws_api is not None:
             self._aws_api.cleanup()
+        if self._plan_skip_state is not None:
+            self._plan_skip_state.cleanup()
         for wd in self.working_dirs.values():
             shutil.rmtree(wd)
 
@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import base64
+import copy
 import enum
 import json
 import logging
 import os
 import random
 import re
+import shutil
 import string
 import tempfile
 from collections import Counter
@@ -182,7 +184,7 @@ from reconcile.utils.jinja2.utils import (
     process_extracurlyjinja2_template,
     process_jinja2_template,
 )
-from reconcile.utils.json import json_dumps
+from reconcile.utils.json import json_dump, json_dumps
 from reconcile.utils.password_validator import (
     PasswordPolicy,
     PasswordValidator,
@@ -562,6 +564,9 @@ class TerrascriptClient:
         self.locks: dict[str, Lock] = locks
         """AWS account name to Lock mapping."""
 
+        self._config_digests: dict[str, str] = {}
+        """AWS account name to digest of the last dumped configuration."""
+
         for name in self.tss:
             self.add_resource(name, data.aws_canonical_user_id("current"))
 
@@ -589,6 +594,8 @@ class TerrascriptClient:
         self.jenkins_map: dict[str, JenkinsApi] = {}
         self.jenkins_lock = Lock()
         self._resource_cache: dict[str, dict[str, str]] = {}
+        self._values_cache: dict[str, dict[str, Any]] = {}
+        self._values_cache_lock = Lock()
         if prefetch_resources_by_schemas:
             for schema in prefetch_resources_by_schemas:
                 self._resource_cache.update(self.prefetch_resources(schema))
@@ -1077,6 +1084,7 @@ class TerrascriptClient:
             region = account["assume_region"]
             alias = self.get_provider_alias(account)
             ts = self.tss[infra_account_name]
+            self._config_digests.pop(infra_account_name, None)
             config = self.configs[account_name]
             existing_provider_aliases = {p.get("alias") for p in ts["provider"]["aws"]}
             if alias not in existing_provider_aliases:
@@ -1665,11 +1673,22 @@ class TerrascriptClient:
     def populate_resources(self, ocm_map: OCMMap | None = None) -> None:
         """
         Populates the terraform configuration from resource specs.
+        Accounts are populated in parallel, the specs of an account in order,
+        so the resulting configuration doesn't depend on thread scheduling.
         :param ocm_map:
         """
-        for specs in self.account_resource_specs.values():
-            for spec in specs:
-                self.populate_tf_resources(spec, ocm_map=ocm_map)
+        threaded.run(
+            self._populate_account_resources,
+            list(self.account_resource_specs.values()),
+            self.thread_pool_size,
+            ocm_map=ocm_map,
+        )
+
+    def _populate_account_resources(
+        self, specs: Iterable[ExternalResourceSpec], ocm_map: OCMMap | None = None
+    ) -> None:
+        for spec in specs:
+            self.populate_tf_resources(spec, ocm_map=ocm_map)
 
     def _is_provisioner_excluded(
         self,
@@ -4448,6 +4467,7 @@ class TerrascriptClient:
             return
         with self.locks[account]:
             self.tss[account].add(tf_resource)
+            self._config_digests.pop(account, None)
 
     def add_moved(self, account: str, moved: Moved) -> None:
         if account not in self.locks:
@@ -4461,6 +4481,7 @@ class TerrascriptClient:
                 "from": moved.fro,
                 "to": moved.to,
             })
+            self._config_digests.pop(account, None)
 
     def dump(
         self,
@@ -4469,6 +4490,8 @@ class TerrascriptClient:
     ) -> dict[str, str]:
         """
         Dump the Terraform configurations (in JSON format) to the working directories.
+        The configurations are streamed to disk with sorted keys, their digests
+        are remembered for terraform_configurations.
 
         :param print_to_file: an alternative path to write the file to in addition to
                               the standard location
@@ -4488,32 +4511,42 @@ class TerrascriptClient:
                 os.remove(print_to_file)
 
         for name, ts in self.tss.items():
-            content = str(ts)
-            if print_to_file:
-                with open(print_to_file, "a", encoding="locale") as f:
-                    f.write(f"##### {name} #####\n")
-                    f.write(content)
-                    f.write("\n")
             if existing_dirs is None:
                 wd = tempfile.mkdtemp(prefix=TMP_DIR_PREFIX)
             else:
                 wd = working_dirs[name]
-            with open(wd + "/config.tf.json", "w", encoding="locale") as f:
-                f.write(content)
+            config_file = wd + "/config.tf.json"
+            with open(config_file, "w", encoding="locale") as f:
+                self._config_digests[name] = json_dump(ts, f, indent=2)
+            if print_to_file:
+                with (
+                    open(print_to_file, "a", encoding="locale") as f,
+                    open(config_file, encoding="locale") as config,
+                ):
+                    f.write(f"##### {name} #####\n")
+                    shutil.copyfileobj(config, f)
+                    f.write("\n")
             working_dirs[name] = wd
 
         return working_dirs
 
     def terraform_configurations(self) -> dict[str, str]:
         """
-        Return the Terraform configurations (in JSON format) for each AWS account.
+        Return a digest of the Terraform configuration (in JSON format) for each
+        AWS account, e.g. as early exit cache source. The digests of configurations
+        that didn't change since they were dumped are reused.
         Terraform config content keys are sorted for consistent hash check.
-        The result is not used for final file dump.
         Doc: https://python-terrascript.readthedocs.io/en/stable/quickstart.html
 
-        :return: key is AWS account name and value is terraform configuration
+        :return: key is AWS account name and value is the sha256 digest of the
+                 terraform configuration
         """
-        return {name: json_dumps(ts, indent=2) for name, ts in self.tss.items()}
+        configurations = {}
+        for name, ts in self.tss.items():
+            if name not in self._config_digests:
+                self._config_digests[name] = json_dump(ts, indent=2)
+            configurations[name] = self._config_digests[name]
+        return configurations
 
     def init_values(
         self, spec: ExternalResourceSpec, init_tags: bool = True
@@ -4645,14 +4678,24 @@ class TerrascriptClient:
         return raw_values
 
     def get_values(self, path: str) -> dict[str, Any]:
-        raw_values = self.get_raw_values(path)
-        try:
-            values = anymarkup.parse(raw_values["content"], force_types=None)
-            values.pop("$schema", None)
-        except anymarkup.AnyMarkupError:
-            e_msg = "Could not parse data. Skipping resource: {}"
-            raise FetchResourceError(e_msg.format(path)) from None
-        return values
+        """
+        Parsed content of the resource file at path. Many specs share the same
+        defaults file, so it is fetched and parsed once per client. Callers get
+        their own copy and may modify it.
+        """
+        with self._values_cache_lock:
+            values = self._values_cache.get(path)
+        if values is None:
+            raw_values = self.get_raw_values(path)
+            try:
+                values = anymarkup.parse(raw_values["content"], force_types=None)
+                values.pop("$schema", None)
+            except anymarkup.AnyMarkupError:
+                e_msg = "Could not parse data. Skipping resource: {}"
+                raise FetchResourceError(e_msg.format(path)) from None
+            with self._values_cache_lock:
+                values = self._values_cache.setdefault(path, values)
+        return copy.deepcopy(values)
 
     @staticmethod
     def get_dependencies(tf_resources: Iterable[Resource]) -> list[str]:
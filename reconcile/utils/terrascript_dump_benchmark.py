@@ -0,0 +1,129 @@
+"""
+Compare the streaming `TerrascriptClient.dump` with rendering the whole
+configuration as a string, on a synthetic account with many resources.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from terrascript import (
+    Output,
+    Terraform,
+    Terrascript,
+    provider,
+)
+from terrascript.resource import aws_s3_bucket
+
+from reconcile.utils.json import json_dump, json_dumps
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass
+class DumpMeasurement:
+    seconds: float
+    peak_bytes: int
+
+
+@dataclass
+class DumpBenchmarkResult:
+    resources: int
+    config_bytes: int
+    string: DumpMeasurement
+    streaming: DumpMeasurement
+
+
+def synthetic_account(resources: int) -> Terrascript:
+    """A Terrascript of an account with S3 buckets and their outputs."""
+    ts = Terrascript()
+    ts += provider.aws(
+        access_key="access-key",
+        secret_key="secret-key",
+        region="us-east-1",
+        skip_region_validation=True,
+        default_tags={"tags": {"app": "app-sre-infra"}},
+    )
+    ts += Terraform(
+        required_providers={"aws": {"source": "hashicorp/aws", "version": "5.0.0"}}
+    )
+    for i in range(resources):
+        identifier = f"bucket-{i:05d}"
+        ts += aws_s3_bucket(
+            identifier,
+            bucket=identifier,
+            versioning={"enabled": True},
+            tags={
+                "managed_by_integration": "terraform-resources",
+                "cluster": "cluster",
+                "namespace": f"namespace-{i % 100}",
+                "environment": "production",
+                "app": f"app-{i % 50}",
+            },
+            lifecycle_rule=[
+                {
+                    "id": "expire_noncurrent_versions",
+                    "enabled": True,
+                    "noncurrent_version_expiration": {"days": 30},
+                }
+            ],
+        )
+        ts += Output(
+            f"{identifier}__terraform_resources_bucket",
+            value=f"${{aws_s3_bucket.{identifier}.bucket}}",
+        )
+    return ts
+
+
+def _dump_string(ts: Terrascript, path: str) -> str:
+    # the previous dump and terraform_configurations
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(str(ts))
+    return hashlib.sha256(json_dumps(ts, indent=2).encode("utf-8")).hexdigest()
+
+
+def _dump_streaming(ts: Terrascript, path: str) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        return json_dump(ts, f, indent=2)
+
+
+def _measure(
+    dump: Callable[[Terrascript, str], str], ts: Terrascript, path: str, repeat: int
+) -> DumpMeasurement:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        dump(ts, path)
+    seconds = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    try:
+        dump(ts, path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return DumpMeasurement(seconds=seconds, peak_bytes=peak)
+
+
+def benchmark_dump(resources: int = 10_000, repeat: int = 3) -> DumpBenchmarkResult:
+    """
+    Dump a synthetic account with both implementations and report their
+    runtime and peak memory allocated during the dump.
+    """
+    ts = synthetic_account(resources)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.tf.json")
+        string = _measure(_dump_string, ts, path, repeat)
+        streaming = _measure(_dump_streaming, ts, path, repeat)
+        config_bytes = os.path.getsize(path)
+    return DumpBenchmarkResult(
+        resources=resources,
+        config_bytes=config_bytes,
+        string=string,
+        streaming=streaming,
+    )
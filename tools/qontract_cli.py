@@ -4286,6 +4286,39 @@ def test_change_type(
     tester.test_change_type_in_context(change_type_name, role_name, app_interface_path)
 
 
+@root.command()
+@click.argument("diff_file")
+@click.option("--repeat", default=1, help="number of runs per file to average")
+def benchmark_change_owners_diff(diff_file: str, repeat: int) -> None:
+    """Compare change-owners diff detection with DeepDiff on a recorded
+    qontract-server /diff response."""
+    from reconcile.change_owners.diff_benchmark import (
+        benchmark_diffs,
+        load_recorded_diff,
+    )
+
+    result = benchmark_diffs(load_recorded_diff(diff_file), repeat=repeat)
+    print(f"files: {result.files}, diffs: {result.diffs}")
+    print(f"native: {result.native_seconds:.3f}s")
+    print(f"deepdiff: {result.deepdiff_seconds:.3f}s ({result.speedup:.1f}x)")
+    for path in result.mismatches:
+        print(f"different diffs: {path}")
+
+
+@root.command()
+@click.option("--resources", default=10_000, help="number of synthetic resources")
+@click.option("--repeat", default=3, help="number of runs to average")
+def benchmark_terrascript_dump(resources: int, repeat: int) -> None:
+    """Compare the streaming terraform config dump with rendering it as a
+    string on a synthetic account."""
+    from reconcile.utils.terrascript_dump_benchmark import benchmark_dump
+
+    result = benchmark_dump(resources=resources, repeat=repeat)
+    print(f"resources: {result.resources}, config: {result.config_bytes} bytes")
+    for name, m in [("string", result.string), ("streaming", result.streaming)]:
+        print(f"{name}: {m.seconds:.3f}s, peak {m.peak_bytes / 2**20:.1f} MiB")
+
+
 @root.group()
 @click.pass_context
 def sso_client(ctx: click.Context) -> None: